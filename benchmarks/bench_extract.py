@@ -0,0 +1,35 @@
+import json
+from timeit import repeat
+
+from hemera.dataclasses import HttpRequest
+from hemera.router import get_event_router
+from hemera.serialization import JSON_BACKEND
+from hemera.types import GithubHttpRequest, HemeraHttpRequest
+from tests.hemera.resources.http_request_data import BODY, HEADER
+
+RAW_BODY = json.dumps(BODY).encode("utf-8")
+NUMBER = 2000
+
+ROUTER = get_event_router()
+
+
+def stdlib_path() -> GithubHttpRequest:
+    """Decode the whole payload with the standard library."""
+    return HemeraHttpRequest(req=HttpRequest(header=HEADER, body=json.loads(RAW_BODY)))
+
+
+def extract_path() -> GithubHttpRequest:
+    """Decode the payload the way main does, through the event router."""
+    return ROUTER.extract(header=HEADER, body=RAW_BODY)
+
+
+def main() -> None:
+    """Compare router.extract with decoding the whole payload."""
+    print(f"Backend: {JSON_BACKEND}, payload: {len(RAW_BODY)} bytes")
+    for name, path in (("json", stdlib_path), ("extract", extract_path)):
+        seconds = min(repeat(path, number=NUMBER, repeat=5)) / NUMBER
+        print(f"{name:>7}: {seconds * 1000000:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
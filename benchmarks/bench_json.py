@@ -0,0 +1,46 @@
+import json
+from timeit import repeat
+
+from hemera.serialization import JSON_BACKEND, dumps, loads
+from tests.hemera.resources.http_request_data import BODY
+
+RAW_BODY = json.dumps(BODY).encode("utf-8")
+MESSAGE = {"message": "username reopened a pull_request\n" * 4}
+NUMBER = 2000
+
+
+def stdlib_loads() -> dict:
+    """Decode the captured payload with the standard library."""
+    return json.loads(RAW_BODY)
+
+
+def backend_loads() -> dict:
+    """Decode the captured payload with the selected backend."""
+    return loads(RAW_BODY)
+
+
+def stdlib_dumps() -> bytes:
+    """Encode a Home Automation request body with the standard library."""
+    return json.dumps(MESSAGE).encode("utf-8")
+
+
+def backend_dumps() -> bytes:
+    """Encode a Home Automation request body with the selected backend."""
+    return dumps(MESSAGE)
+
+
+def main() -> None:
+    """Compare the selected JSON backend with the standard library."""
+    print(f"Backend: {JSON_BACKEND}, payload: {len(RAW_BODY)} bytes")
+    for name, path in (
+        ("json loads", stdlib_loads),
+        (f"{JSON_BACKEND} loads", backend_loads),
+        ("json dumps", stdlib_dumps),
+        (f"{JSON_BACKEND} dumps", backend_dumps),
+    ):
+        seconds = min(repeat(path, number=NUMBER, repeat=5)) / NUMBER
+        print(f"{name:>13}: {seconds * 1000000:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import gc
+import json
+from timeit import repeat
+from tracemalloc import get_traced_memory, start, stop
+
+from hemera.dataclasses import HttpRequest
+from hemera.events import ProjectionDecoder
+from hemera.slack import create_slack_message
+from hemera.types import HemeraHttpRequest
+from tests.hemera.resources.http_request_data import BODY, HEADER
+
+RAW_BODY = json.dumps(BODY).encode("utf-8")
+NUMBER = 2000
+
+DECODER = ProjectionDecoder(HemeraHttpRequest.FIELDS)
+
+
+def dict_path() -> HemeraHttpRequest:
+    """Decode the whole payload into nested dictionaries."""
+    hemera_http_request = HemeraHttpRequest(
+        req=HttpRequest(header=HEADER, body=dict(json.loads(RAW_BODY)))
+    )
+    create_slack_message(hemera_http_request=hemera_http_request)
+    return hemera_http_request
+
+
+def projection_path() -> HemeraHttpRequest:
+    """Decode only the paths of the request fields."""
+    hemera_http_request = HemeraHttpRequest(
+        req=HttpRequest(header=HEADER, body=DECODER.decode(RAW_BODY))
+    )
+    create_slack_message(hemera_http_request=hemera_http_request)
+    return hemera_http_request
+
+
+def measure_memory(path) -> tuple:
+    """Return the peak and retained memory of a path in bytes."""
+    gc.collect()
+    start()
+    baseline, _ = get_traced_memory()
+    result = path()
+    gc.collect()
+    retained, peak = get_traced_memory()
+    stop()
+    del result
+    return peak - baseline, retained - baseline
+
+
+def main() -> None:
+    """Compare the dict path with the projection path."""
+    print(f"Payload: {len(RAW_BODY)} bytes")
+    for name, path in (("dict", dict_path), ("projection", projection_path)):
+        seconds = min(repeat(path, number=NUMBER, repeat=5)) / NUMBER
+        peak, retained = measure_memory(path)
+        print(
+            f"{name:>10}: {seconds * 1000000:8.1f} us/request, "
+            f"peak {peak / 1024:7.1f} KiB, retained {retained / 1024:7.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from hemera.webhook import main_async as main
+
+__all__ = ["main"]
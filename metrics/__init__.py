@@ -0,0 +1,17 @@
+import azure.functions as func
+
+from hemera.metrics import CONTENT_TYPE, render_metrics
+
+
+def main(req: func.HttpRequest) -> func.HttpResponse:
+    """Azure Function entry point serving the metrics of this worker.
+
+    Args:
+        req (func.HttpRequest): The incoming HTTP request.
+
+    Returns:
+        func.HttpResponse: The metrics in the Prometheus text format.
+    """
+    return func.HttpResponse(
+        render_metrics(), status_code=200, headers={"Content-Type": CONTENT_TYPE}
+    )
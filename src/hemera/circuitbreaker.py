@@ -0,0 +1,282 @@
+from collections import deque
+from logging import Logger, getLogger
+from threading import Lock
+from time import monotonic
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from hemera.dataclasses import CircuitBreakerStats
+from hemera.exceptions import CircuitOpenError
+
+LOGGER = getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CIRCUIT_BREAKER_FAILURE_RATE = 0.5
+CIRCUIT_BREAKER_MINIMUM_CALLS = 5
+CIRCUIT_BREAKER_WINDOW = 20
+CIRCUIT_BREAKER_OPEN_SECONDS = 30.0
+CIRCUIT_BREAKER_HALF_OPEN_PROBES = 1
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """Fails calls to a downstream fast while it is failing.
+
+    The breaker opens when the failure rate of the last calls reaches the
+    threshold, and rejects calls while open. After a while it lets a few
+    probe calls through: their success closes the breaker, a failure opens
+    it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = CIRCUIT_BREAKER_FAILURE_RATE,
+        minimum_calls: int = CIRCUIT_BREAKER_MINIMUM_CALLS,
+        window: int = CIRCUIT_BREAKER_WINDOW,
+        open_seconds: float = CIRCUIT_BREAKER_OPEN_SECONDS,
+        half_open_probes: int = CIRCUIT_BREAKER_HALF_OPEN_PROBES,
+        clock: Callable[[], float] = monotonic,
+        logger: Logger = LOGGER,
+    ):
+        """Initialize an instance of the CircuitBreaker class.
+
+        Args:
+            name (str): The name of the downstream.
+            failure_rate (float, optional): The failure rate opening the breaker.
+                Defaults to CIRCUIT_BREAKER_FAILURE_RATE.
+            minimum_calls (int, optional): The number of calls before the failure rate is used.
+                Defaults to CIRCUIT_BREAKER_MINIMUM_CALLS.
+            window (int, optional): The number of last calls the failure rate is computed over.
+                Defaults to CIRCUIT_BREAKER_WINDOW.
+            open_seconds (float, optional): The seconds the breaker stays open before probing.
+                Defaults to CIRCUIT_BREAKER_OPEN_SECONDS.
+            half_open_probes (int, optional): The number of probe calls let through at once.
+                Defaults to CIRCUIT_BREAKER_HALF_OPEN_PROBES.
+            clock (Callable[[], float], optional): The clock. Defaults to monotonic.
+            logger (Logger, optional): The logger. Defaults to LOGGER.
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self.logger = logger
+        self._lock = Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._calls = 0
+        self._failures = 0
+        self._rejected = 0
+        self._opened = 0
+
+    def _transition(self, state: str) -> None:
+        """Move the breaker to another state, the lock must be held.
+
+        Args:
+            state (str): The new state.
+        """
+        self.logger.warning(
+            "Circuit breaker %s changed from %s to %s.", self.name, self._state, state
+        )
+        self._state = state
+        self._probes = 0
+        self._outcomes.clear()
+        if state == OPEN:
+            self._opened += 1
+            self._opened_at = self.clock()
+
+    @property
+    def state(self) -> str:
+        """The state of the breaker, closed, open or half_open."""
+        with self._lock:
+            if self._state == OPEN and (
+                self.clock() - self._opened_at >= self.open_seconds
+            ):
+                self._transition(HALF_OPEN)
+            return self._state
+
+    def _acquire(self) -> bool:
+        """Check whether a call may pass.
+
+        Returns:
+            bool: True when the call may pass, False when it is rejected.
+        """
+        with self._lock:
+            if self._state == OPEN:
+                if self.clock() - self._opened_at < self.open_seconds:
+                    self._rejected += 1
+                    return False
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self._rejected += 1
+                    return False
+                self._probes += 1
+            self._calls += 1
+            return True
+
+    def _record(self, failed: bool) -> None:
+        """Record the outcome of a call that passed.
+
+        Args:
+            failed (bool): Whether the call failed.
+        """
+        with self._lock:
+            if failed:
+                self._failures += 1
+
+            if self._state == HALF_OPEN:
+                self._transition(OPEN if failed else CLOSED)
+                return
+            if self._state == OPEN:
+                return
+
+            self._outcomes.append(failed)
+            if (
+                len(self._outcomes) >= self.minimum_calls
+                and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate
+            ):
+                self._transition(OPEN)
+
+    def _release(self) -> None:
+        """Release a call that passed without an outcome, such as a cancelled
+        call, so a half-open breaker lets another probe pass."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def call(
+        self,
+        function: Callable[..., T],
+        *args: Any,
+        fallback: Optional[Callable[[], T]] = None,
+        is_failure: Callable[[Exception], bool] = lambda e: True,
+        **kwargs: Any,
+    ) -> T:
+        """Call a function through the breaker.
+
+        Args:
+            function (Callable[..., T]): The function calling the downstream.
+            fallback (Optional[Callable[[], T]], optional): The function called instead while the
+                breaker rejects calls. Defaults to None.
+            is_failure (Callable[[Exception], bool], optional): Whether an error counts as a failure of
+                the downstream. Defaults to every error.
+
+        Raises:
+            CircuitOpenError: When the call is rejected and there is no fallback.
+
+        Returns:
+            T: The result of the function or the fallback.
+        """
+        if not self._acquire():
+            if fallback is not None:
+                return fallback()
+            raise CircuitOpenError(self.name)
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            self._record(failed=is_failure(e))
+            raise
+        except BaseException:
+            self._release()
+            raise
+        self._record(failed=False)
+        return result
+
+    async def call_async(
+        self,
+        function: Callable[..., Awaitable[T]],
+        *args: Any,
+        fallback: Optional[Callable[[], Awaitable[T]]] = None,
+        is_failure: Callable[[Exception], bool] = lambda e: True,
+        **kwargs: Any,
+    ) -> T:
+        """Await a coroutine function through the breaker.
+
+        Args:
+            function (Callable[..., Awaitable[T]]): The coroutine function calling the downstream.
+            fallback (Optional[Callable[[], Awaitable[T]]], optional): The coroutine function awaited
+                instead while the breaker rejects calls. Defaults to None.
+            is_failure (Callable[[Exception], bool], optional): Whether an error counts as a failure of
+                the downstream. Defaults to every error.
+
+        Raises:
+            CircuitOpenError: When the call is rejected and there is no fallback.
+
+        Returns:
+            T: The result of the function or the fallback.
+        """
+        if not self._acquire():
+            if fallback is not None:
+                return await fallback()
+            raise CircuitOpenError(self.name)
+        try:
+            result = await function(*args, **kwargs)
+        except Exception as e:
+            self._record(failed=is_failure(e))
+            raise
+        except BaseException:
+            self._release()
+            raise
+        self._record(failed=False)
+        return result
+
+    def stats(self) -> CircuitBreakerStats:
+        """Return the statistics of this breaker.
+
+        Returns:
+            CircuitBreakerStats: The state and the number of calls, failures, rejected calls and openings.
+        """
+        state = self.state
+        with self._lock:
+            return CircuitBreakerStats(
+                name=self.name,
+                state=state,
+                calls=self._calls,
+                failures=self._failures,
+                rejected=self._rejected,
+                opened=self._opened,
+            )
+
+
+_CIRCUIT_BREAKERS: Dict[str, CircuitBreaker] = {}
+_CIRCUIT_BREAKERS_LOCK = Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker of a downstream.
+
+    Args:
+        name (str): The name of the downstream.
+
+    Returns:
+        CircuitBreaker: The circuit breaker.
+    """
+    with _CIRCUIT_BREAKERS_LOCK:
+        circuit_breaker = _CIRCUIT_BREAKERS.get(name)
+        if circuit_breaker is None:
+            circuit_breaker = _CIRCUIT_BREAKERS[name] = CircuitBreaker(name)
+        return circuit_breaker
+
+
+def get_circuit_breakers() -> Tuple[CircuitBreaker, ...]:
+    """Return every process-wide circuit breaker.
+
+    Returns:
+        Tuple[CircuitBreaker, ...]: The circuit breakers, in creation order.
+    """
+    with _CIRCUIT_BREAKERS_LOCK:
+        return tuple(_CIRCUIT_BREAKERS.values())
+
+
+def clear_circuit_breakers() -> None:
+    """Forget every process-wide circuit breaker."""
+    with _CIRCUIT_BREAKERS_LOCK:
+        _CIRCUIT_BREAKERS.clear()
@@ -0,0 +1,77 @@
+from argparse import ArgumentParser, FileType
+from logging import WARNING, basicConfig
+from typing import List, Optional
+
+from hemera.replay import replay
+
+
+def create_parser() -> ArgumentParser:
+    """Create the argument parser of the hemera command.
+
+    Returns:
+        ArgumentParser: The argument parser.
+    """
+    parser = ArgumentParser(prog="hemera", description="Hemera command line tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = subparsers.add_parser(
+        "replay", help="Replay captured GitHub deliveries from a JSONL file."
+    )
+    replay_parser.add_argument(
+        "file",
+        type=FileType("r"),
+        help='JSONL file with one {"header": ..., "body": ...} record per line, - for stdin.',
+    )
+    replay_parser.add_argument(
+        "--author",
+        default=None,
+        help="Only accept pull requests by this author.",
+    )
+    replay_parser.add_argument(
+        "--send",
+        action="store_true",
+        help="Send to Slack and Home Assistant instead of a dry run.",
+    )
+    replay_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes. Defaults to 1.",
+    )
+    replay_parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=64,
+        help="Number of deliveries sent to a worker at once. Defaults to 64.",
+    )
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the hemera command.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments. Defaults to None.
+
+    Returns:
+        int: The exit code.
+    """
+    args = create_parser().parse_args(argv)
+    basicConfig(level=WARNING)
+
+    with args.file:
+        report = replay(
+            stream=args.file,
+            pr_author_filter=args.author,
+            dry_run=not args.send,
+            workers=args.workers,
+            chunksize=args.chunksize,
+        )
+
+    print(report.format())
+    return 0 if not report.outcomes.get("failed") else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,208 @@
+from logging import Logger, getLogger
+from threading import Lock, Timer
+from typing import Any, Callable, Dict, Hashable, Mapping, NamedTuple, Optional, Tuple
+
+from hemera.dataclasses import HemeraConfig, HttpRequest
+from hemera.exceptions import HemeraError
+from hemera.types import GithubHttpRequest, HemeraHttpRequest
+
+LOGGER = getLogger(__name__)
+
+CoalesceHandler = Callable[[GithubHttpRequest, Tuple[str, ...]], None]
+
+
+def merge_bodies(old: Mapping[str, Any], new: Mapping[str, Any]) -> Dict[str, Any]:
+    """Merge two request bodies, the values of the newer body win.
+
+    Args:
+        old (Mapping[str, Any]): The older body.
+        new (Mapping[str, Any]): The newer body.
+
+    Returns:
+        Dict[str, Any]: The merged body.
+    """
+    merged = dict(old)
+    for key, value in new.items():
+        previous = merged.get(key)
+        if isinstance(value, Mapping) and isinstance(previous, Mapping):
+            merged[key] = merge_bodies(previous, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def get_pull_request_key(github_http_request: GithubHttpRequest) -> Optional[Hashable]:
+    """Return the coalescing key of a pull request event.
+
+    Args:
+        github_http_request (GithubHttpRequest): The HTTP request of the event.
+
+    Returns:
+        Optional[Hashable]: The repository and pull request number, None for other events.
+    """
+    if not isinstance(github_http_request, HemeraHttpRequest):
+        return None
+    try:
+        return (
+            github_http_request.repository,
+            github_http_request.pullrequestnumber,
+        )
+    except HemeraError:
+        return None
+
+
+class _Pending(NamedTuple):
+    """The combined event of a key, waiting for its window to close."""
+
+    github_http_request: GithubHttpRequest
+    events: int
+    delivery_ids: Tuple[str, ...]
+    timer: Timer
+
+
+def _get_delivery_ids(github_http_request: GithubHttpRequest) -> Tuple[str, ...]:
+    """Return the GitHub delivery ID of an event.
+
+    Args:
+        github_http_request (GithubHttpRequest): The HTTP request of the event.
+
+    Returns:
+        Tuple[str, ...]: The delivery ID, empty when the event has none.
+    """
+    delivery_id = github_http_request.req.header.get("x-github-delivery")
+    return (delivery_id,) if delivery_id else ()
+
+
+class Coalescer:
+    """Holds the events of a key for a short window and handles them as one
+    combined event.
+
+    The window starts with the first event of a key, so a notification is
+    never delayed by more than the window. Fields of later events overwrite
+    those of earlier ones. The handler gets the delivery IDs of every
+    combined event, so all of them can be redelivered when it fails.
+    """
+
+    def __init__(
+        self,
+        handler: CoalesceHandler,
+        window: float,
+        key: Callable[[GithubHttpRequest], Optional[Hashable]] = get_pull_request_key,
+        logger: Logger = LOGGER,
+    ):
+        """Initialize an instance of the Coalescer class.
+
+        Args:
+            handler (CoalesceHandler): The function that handles a combined event and its delivery IDs.
+            window (float): The number of seconds events of a key are held.
+            key (Callable[[GithubHttpRequest], Optional[Hashable]], optional): The function returning the
+                coalescing key of an event, None to not coalesce it. Defaults to get_pull_request_key.
+            logger (Logger, optional): The logger. Defaults to LOGGER.
+        """
+        self.handler = handler
+        self.window = window
+        self.key = key
+        self.logger = logger
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._lock = Lock()
+
+    def submit(self, github_http_request: GithubHttpRequest) -> bool:
+        """Hold an event until the window of its key closes.
+
+        Args:
+            github_http_request (GithubHttpRequest): The HTTP request of the event.
+
+        Returns:
+            bool: True when the event is held, False when it must be handled now.
+        """
+        key = self.key(github_http_request)
+        if key is None:
+            return False
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                timer = Timer(self.window, self._emit, args=(key,))
+                timer.daemon = True
+                self._pending[key] = _Pending(
+                    github_http_request=github_http_request,
+                    events=1,
+                    delivery_ids=_get_delivery_ids(github_http_request),
+                    timer=timer,
+                )
+                timer.start()
+                return True
+
+            previous = pending.github_http_request
+            combined = type(github_http_request)(
+                req=HttpRequest(
+                    header=dict(github_http_request.req.header),
+                    body=merge_bodies(previous.req.body, github_http_request.req.body),
+                )
+            )
+            self._pending[key] = _Pending(
+                github_http_request=combined,
+                events=pending.events + 1,
+                delivery_ids=pending.delivery_ids
+                + _get_delivery_ids(github_http_request),
+                timer=pending.timer,
+            )
+            return True
+
+    def _emit(self, key: Hashable) -> None:
+        """Handle the combined event of a key.
+
+        Args:
+            key (Hashable): The coalescing key.
+        """
+        with self._lock:
+            pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+
+        self.logger.info("Handling %d coalesced event(s) of %s.", pending.events, key)
+        try:
+            self.handler(pending.github_http_request, pending.delivery_ids)
+        except Exception as e:
+            self.logger.error("Error handling coalesced events, %s", e)
+
+    def flush(self) -> None:
+        """Handle every held event now."""
+        with self._lock:
+            keys = list(self._pending)
+            for key in keys:
+                self._pending[key].timer.cancel()
+        for key in keys:
+            self._emit(key)
+
+
+_COALESCERS: Dict[HemeraConfig, Optional[Coalescer]] = {}
+_COALESCERS_LOCK = Lock()
+
+
+def get_coalescer(
+    config: HemeraConfig,
+    handler: CoalesceHandler,
+) -> Optional[Coalescer]:
+    """Return the process-wide coalescer for a configuration.
+
+    The events held by the coalescer of a previous configuration are still
+    handled once their window ends. The handler is only used by a new
+    coalescer.
+
+    Args:
+        config (HemeraConfig): The Hemera configuration.
+        handler (CoalesceHandler): The function that handles a combined event and its delivery IDs.
+
+    Returns:
+        Optional[Coalescer]: The coalescer, or None when events are not coalesced.
+    """
+    with _COALESCERS_LOCK:
+        if config not in _COALESCERS:
+            _COALESCERS.clear()
+            _COALESCERS[config] = (
+                Coalescer(handler=handler, window=config.pr_coalesce_window)
+                if config.pr_coalesce_window > 0
+                else None
+            )
+        return _COALESCERS[config]
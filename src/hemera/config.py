@@ -0,0 +1,184 @@
+from functools import lru_cache
+from logging import Logger, getLogger
+from os import getenv as os_getenv
+from typing import Callable, Sequence, TypeVar
+
+from hemera.dataclasses import HemeraConfig
+from hemera.deprecated import (
+    DEPRECATEDENVIRIONMENTVARIABLES,
+    scan_for_deprecated_env_vars,
+)
+from hemera.exceptions import (
+    EnvironmentVariableInvalidError,
+    EnvironmentVariableNotSetError,
+)
+
+LOGGER = getLogger(__name__)
+
+DELIVERY_DEDUP_BACKENDS = ("", "memory", "sqlite")
+WORK_QUEUE_BACKENDS = ("", "memory", "sqlite")
+OUTBOX_BACKENDS = ("", "sqlite")
+
+T = TypeVar("T")
+
+
+def _getenv_as(name: str, default: T, convert: Callable[[str], T]) -> T:
+    """Return an optional environment variable converted to another type.
+
+    Args:
+        name (str): The name of the environment variable.
+        default (T): The value to return when the environment variable is not set.
+        convert (Callable[[str], T]): The conversion to apply to the value.
+
+    Raises:
+        EnvironmentVariableInvalidError: When the value cannot be converted.
+
+    Returns:
+        T: The converted value.
+    """
+    value = os_getenv(name)
+    if not value:
+        return default
+    try:
+        return convert(value)
+    except ValueError as e:
+        raise EnvironmentVariableInvalidError(env_var_name=name) from e
+
+
+def _getenv_choice(name: str, choices: Sequence[str]) -> str:
+    """Return an optional environment variable restricted to a set of values.
+
+    Args:
+        name (str): The name of the environment variable.
+        choices (Sequence[str]): The allowed values, the first one is the default.
+
+    Raises:
+        EnvironmentVariableInvalidError: When the value is not allowed.
+
+    Returns:
+        str: The value.
+    """
+    value = (os_getenv(name) or choices[0]).lower()
+    if value not in choices:
+        raise EnvironmentVariableInvalidError(env_var_name=name)
+    return value
+
+
+def load_config(logger: Logger = LOGGER) -> HemeraConfig:
+    """Load and validate the Hemera configuration from the environment.
+
+    Args:
+        logger (Logger, optional): The logger. Defaults to LOGGER.
+
+    Raises:
+        EnvironmentVariableNotSetError: When environment variables are not set.
+        EnvironmentVariableInvalidError: When environment variables have an invalid value.
+        EnvironmentVariableDeprecatedError: When a deprecated environment variable is used.
+
+    Returns:
+        HemeraConfig: The Hemera configuration.
+    """
+    scan_for_deprecated_env_vars(
+        deprecated_env_vars=DEPRECATEDENVIRIONMENTVARIABLES, logger=logger
+    )
+
+    slack_api_token = os_getenv("SLACK_API_TOKEN")
+    slack_channel = os_getenv("SLACK_CHANNEL")
+    homeautomation_webhook = os_getenv("HOMEAUTOMATION_WEBHOOK")
+    pr_author_filter = os_getenv("PR_AUTHOR_FILTER") or os_getenv("ALLOWED_USERNAME")
+
+    if (
+        not slack_api_token
+        or not slack_channel
+        or not homeautomation_webhook
+        or not pr_author_filter
+    ):
+        raise EnvironmentVariableNotSetError
+
+    return HemeraConfig(
+        slack_api_token=slack_api_token,
+        slack_channel=slack_channel,
+        homeautomation_webhook=homeautomation_webhook,
+        pr_author_filter=pr_author_filter,
+        delivery_dedup_backend=_getenv_choice(
+            "DELIVERY_DEDUP_BACKEND", DELIVERY_DEDUP_BACKENDS
+        ),
+        delivery_dedup_ttl=_getenv_as(
+            "DELIVERY_DEDUP_TTL", HemeraConfig.delivery_dedup_ttl, float
+        ),
+        delivery_dedup_max_entries=_getenv_as(
+            "DELIVERY_DEDUP_MAX_ENTRIES", HemeraConfig.delivery_dedup_max_entries, int
+        ),
+        delivery_dedup_sqlite_path=os_getenv(
+            "DELIVERY_DEDUP_SQLITE_PATH", HemeraConfig.delivery_dedup_sqlite_path
+        ),
+        work_queue_backend=_getenv_choice("WORK_QUEUE_BACKEND", WORK_QUEUE_BACKENDS),
+        work_queue_size=_getenv_as(
+            "WORK_QUEUE_SIZE", HemeraConfig.work_queue_size, int
+        ),
+        work_queue_workers=_getenv_as(
+            "WORK_QUEUE_WORKERS", HemeraConfig.work_queue_workers, int
+        ),
+        work_queue_sqlite_path=os_getenv(
+            "WORK_QUEUE_SQLITE_PATH", HemeraConfig.work_queue_sqlite_path
+        ),
+        github_webhook_secret=os_getenv("GITHUB_WEBHOOK_SECRET", "").encode("utf-8"),
+        slack_message_templates=os_getenv(
+            "SLACK_MESSAGE_TEMPLATES", HemeraConfig.slack_message_templates
+        ),
+        routing_rules=os_getenv("ROUTING_RULES", HemeraConfig.routing_rules),
+        pr_coalesce_window=_getenv_as(
+            "PR_COALESCE_WINDOW", HemeraConfig.pr_coalesce_window, float
+        ),
+        homeautomation_timeout=_getenv_as(
+            "HOMEAUTOMATION_TIMEOUT", HemeraConfig.homeautomation_timeout, float
+        ),
+        homeautomation_pool_size=_getenv_as(
+            "HOMEAUTOMATION_POOL_SIZE", HemeraConfig.homeautomation_pool_size, int
+        ),
+        homeautomation_retries=_getenv_as(
+            "HOMEAUTOMATION_RETRIES", HemeraConfig.homeautomation_retries, int
+        ),
+        request_deadline=_getenv_as(
+            "REQUEST_DEADLINE", HemeraConfig.request_deadline, float
+        ),
+        sink_workers=_getenv_as("SINK_WORKERS", HemeraConfig.sink_workers, int),
+        sink_max_concurrency=_getenv_as(
+            "SINK_MAX_CONCURRENCY", HemeraConfig.sink_max_concurrency, int
+        ),
+        outbox_backend=_getenv_choice("OUTBOX_BACKEND", OUTBOX_BACKENDS),
+        outbox_sqlite_path=os_getenv(
+            "OUTBOX_SQLITE_PATH", HemeraConfig.outbox_sqlite_path
+        ),
+        outbox_max_attempts=_getenv_as(
+            "OUTBOX_MAX_ATTEMPTS", HemeraConfig.outbox_max_attempts, int
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_config() -> HemeraConfig:
+    """Return the process-wide Hemera configuration.
+
+    The configuration is loaded once and reused by every invocation handled by
+    this worker. Use invalidate_config or reload_config to pick up changes.
+
+    Returns:
+        HemeraConfig: The Hemera configuration.
+    """
+    return load_config()
+
+
+def invalidate_config() -> None:
+    """Drop the cached Hemera configuration."""
+    get_config.cache_clear()
+
+
+def reload_config() -> HemeraConfig:
+    """Drop the cached Hemera configuration and load it again.
+
+    Returns:
+        HemeraConfig: The freshly loaded Hemera configuration.
+    """
+    invalidate_config()
+    return get_config()
@@ -1,12 +1,14 @@
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from os.path import join as path_join
+from tempfile import gettempdir
+from typing import Dict, Mapping, Optional, Tuple
 
 
 @dataclass
 class HttpRequest:
     """Dataclass for Hemera HTTP request."""
 
-    header: Dict[str, str]
+    header: Mapping[str, str]
     body: Dict[str, object]
 
 
@@ -31,3 +33,102 @@ class DeprecatedEnvirionmentVariable:
     name: str
     deprecated_in_hemera_version: str
     replacement: str
+
+
+@dataclass(frozen=True)
+class SlackRateLimiterStats:
+    """Dataclass for the statistics of the Slack rate limiter."""
+
+    queue_depth: int
+    throttled_seconds: float
+    rate_limited: int
+
+
+@dataclass(frozen=True)
+class CircuitBreakerStats:
+    """Dataclass for the statistics of a circuit breaker."""
+
+    name: str
+    state: str
+    calls: int
+    failures: int
+    rejected: int
+    opened: int
+
+
+@dataclass(frozen=True)
+class HomeAutomationResult:
+    """Dataclass for the result of a Home Automation webhook request."""
+
+    homeautomation_webhook: str
+    latency: float
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the request succeeded."""
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class SinkOutcome:
+    """Dataclass for the outcome of a delivery to a sink."""
+
+    sink: str
+    latency: float
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the sink succeeded."""
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class SinkReport:
+    """Dataclass for the outcomes of a delivery to every sink."""
+
+    outcomes: Tuple[SinkOutcome, ...]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every sink succeeded."""
+        return all(outcome.ok for outcome in self.outcomes)
+
+    @property
+    def failed(self) -> Tuple[str, ...]:
+        """The names of the sinks that failed."""
+        return tuple(outcome.sink for outcome in self.outcomes if not outcome.ok)
+
+
+@dataclass(frozen=True)
+class HemeraConfig:
+    """Dataclass for the Hemera configuration."""
+
+    slack_api_token: str
+    slack_channel: str
+    homeautomation_webhook: str
+    pr_author_filter: str
+    delivery_dedup_backend: str = ""
+    delivery_dedup_ttl: float = 3600.0
+    delivery_dedup_max_entries: int = 10000
+    delivery_dedup_sqlite_path: str = path_join(
+        gettempdir(), "hemera-deliveries.sqlite3"
+    )
+    work_queue_backend: str = ""
+    work_queue_size: int = 100
+    work_queue_workers: int = 2
+    work_queue_sqlite_path: str = path_join(gettempdir(), "hemera-work-queue.sqlite3")
+    github_webhook_secret: bytes = field(default=b"", repr=False)
+    slack_message_templates: str = ""
+    routing_rules: str = ""
+    pr_coalesce_window: float = 0.0
+    homeautomation_timeout: float = 5.0
+    homeautomation_pool_size: int = 10
+    homeautomation_retries: int = 2
+    request_deadline: float = 9.0
+    sink_workers: int = 8
+    sink_max_concurrency: int = 4
+    outbox_backend: str = ""
+    outbox_sqlite_path: str = path_join(gettempdir(), "hemera-outbox.sqlite3")
+    outbox_max_attempts: int = 10
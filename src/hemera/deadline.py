@@ -0,0 +1,65 @@
+from time import monotonic
+from typing import Callable, Optional
+
+from hemera.exceptions import DeadlineExceededError
+
+
+class Deadline:
+    """The time budget of a request, shared by all of its outbound calls.
+
+    Every call derives its timeout from the remaining budget, so the calls
+    of a request together never take longer than the budget.
+    """
+
+    def __init__(self, budget: float, clock: Callable[[], float] = monotonic):
+        """Initialize an instance of the Deadline class.
+
+        Args:
+            budget (float): The number of seconds the request may take.
+            clock (Callable[[], float], optional): The clock. Defaults to monotonic.
+        """
+        self.budget = budget
+        self.clock = clock
+        self.expires_at = clock() + budget
+
+    def remaining(self) -> float:
+        """Return the remaining budget.
+
+        Returns:
+            float: The number of seconds left, zero once the deadline passed.
+        """
+        return max(self.expires_at - self.clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the budget has run out."""
+        return self.remaining() <= 0
+
+    def timeout(self, limit: Optional[float] = None) -> float:
+        """Return the timeout of the next call.
+
+        Args:
+            limit (Optional[float], optional): The timeout of the call without a deadline. Defaults to None.
+
+        Raises:
+            DeadlineExceededError: When the budget has run out.
+
+        Returns:
+            float: The remaining budget, at most the limit.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededError
+        return remaining if limit is None else min(remaining, limit)
+
+
+def create_deadline(budget: float) -> Optional[Deadline]:
+    """Create the deadline of a request.
+
+    Args:
+        budget (float): The number of seconds the request may take, zero or less for no deadline.
+
+    Returns:
+        Optional[Deadline]: The deadline, None without a budget.
+    """
+    return Deadline(budget) if budget > 0 else None
@@ -0,0 +1,213 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from logging import Logger, getLogger
+from sqlite3 import Error as SqliteError
+from sqlite3 import connect as sqlite_connect
+from threading import Lock
+from time import monotonic, time
+from typing import Callable, Optional
+
+from hemera.dataclasses import HemeraConfig
+from hemera.exceptions import DeliveryCacheError
+
+LOGGER = getLogger(__name__)
+
+
+class DeliveryCache(ABC):
+    """Base class for GitHub delivery ID deduplication caches."""
+
+    @abstractmethod
+    def add(self, delivery_id: str) -> bool:
+        """Record a delivery ID.
+
+        Args:
+            delivery_id (str): The GitHub delivery ID.
+
+        Returns:
+            bool: True when the delivery ID was not seen within the TTL.
+        """
+
+    @abstractmethod
+    def discard(self, delivery_id: str) -> None:
+        """Forget a delivery ID so a redelivery is processed again.
+
+        Args:
+            delivery_id (str): The GitHub delivery ID.
+        """
+
+
+class InMemoryDeliveryCache(DeliveryCache):
+    """A bounded TTL delivery ID cache local to this process, evicting the
+    oldest entries first."""
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = monotonic,
+    ):
+        """Initialize an instance of the InMemoryDeliveryCache class.
+
+        Args:
+            ttl (float): The number of seconds a delivery ID is remembered.
+            max_entries (int): The maximum number of delivery IDs remembered.
+            clock (Callable[[], float], optional): The clock. Defaults to monotonic.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._expires_at: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = Lock()
+
+    def add(self, delivery_id: str) -> bool:
+        now = self.clock()
+        with self._lock:
+            # Entries share one TTL, so insertion order is also expiry order.
+            while self._expires_at:
+                oldest, expires_at = next(iter(self._expires_at.items()))
+                if expires_at > now:
+                    break
+                del self._expires_at[oldest]
+
+            if delivery_id in self._expires_at:
+                return False
+
+            self._expires_at[delivery_id] = now + self.ttl
+            while len(self._expires_at) > self.max_entries:
+                self._expires_at.popitem(last=False)
+            return True
+
+    def discard(self, delivery_id: str) -> None:
+        with self._lock:
+            self._expires_at.pop(delivery_id, None)
+
+
+class SqliteDeliveryCache(DeliveryCache):
+    """A bounded TTL delivery ID cache in a local SQLite database, shared by
+    every worker on the host.
+
+    When a delivery ID cannot be recorded because of a SQLite error, such as
+    a locked or corrupt database, the error is logged and the delivery is
+    treated as not seen, so a broken cache never rejects a delivery. Other
+    SQLite errors are raised as DeliveryCacheError.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time,
+        logger: Logger = LOGGER,
+    ):
+        """Initialize an instance of the SqliteDeliveryCache class.
+
+        Args:
+            path (str): The path of the SQLite database.
+            ttl (float): The number of seconds a delivery ID is remembered.
+            max_entries (int): The maximum number of delivery IDs remembered.
+            clock (Callable[[], float], optional): The clock. Defaults to time.
+            logger (Logger, optional): The logger. Defaults to LOGGER.
+
+        Raises:
+            DeliveryCacheError: When the database cannot be opened.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.logger = logger
+        self._lock = Lock()
+        try:
+            self._connection = sqlite_connect(
+                path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS deliveries "
+                "(delivery_id TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS deliveries_expires_at "
+                "ON deliveries (expires_at)"
+            )
+        except SqliteError as e:
+            raise DeliveryCacheError from e
+
+    def add(self, delivery_id: str) -> bool:
+        try:
+            return self._add(delivery_id)
+        except SqliteError as e:
+            self.logger.error(
+                "Error recording delivery %s, treating it as not seen, %s",
+                delivery_id,
+                e,
+            )
+            return True
+
+    def _add(self, delivery_id: str) -> bool:
+        """Record a delivery ID in one transaction.
+
+        Args:
+            delivery_id (str): The GitHub delivery ID.
+
+        Returns:
+            bool: True when the delivery ID was not seen within the TTL.
+        """
+        now = self.clock()
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "DELETE FROM deliveries WHERE expires_at <= ?", (now,)
+                )
+                inserted = connection.execute(
+                    "INSERT OR IGNORE INTO deliveries VALUES (?, ?)",
+                    (delivery_id, now + self.ttl),
+                ).rowcount
+                if inserted:
+                    connection.execute(
+                        "DELETE FROM deliveries WHERE delivery_id IN ("
+                        "SELECT delivery_id FROM deliveries "
+                        "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return inserted == 1
+
+    def discard(self, delivery_id: str) -> None:
+        with self._lock:
+            try:
+                self._connection.execute(
+                    "DELETE FROM deliveries WHERE delivery_id = ?", (delivery_id,)
+                )
+            except SqliteError as e:
+                raise DeliveryCacheError from e
+
+
+@lru_cache(maxsize=1)
+def get_delivery_cache(config: HemeraConfig) -> Optional[DeliveryCache]:
+    """Return the process-wide delivery cache for a configuration.
+
+    Args:
+        config (HemeraConfig): The Hemera configuration.
+
+    Returns:
+        Optional[DeliveryCache]: The delivery cache, or None when deduplication is disabled.
+    """
+    if config.delivery_dedup_backend == "memory":
+        return InMemoryDeliveryCache(
+            ttl=config.delivery_dedup_ttl,
+            max_entries=config.delivery_dedup_max_entries,
+        )
+    if config.delivery_dedup_backend == "sqlite":
+        return SqliteDeliveryCache(
+            path=config.delivery_dedup_sqlite_path,
+            ttl=config.delivery_dedup_ttl,
+            max_entries=config.delivery_dedup_max_entries,
+        )
+    return None
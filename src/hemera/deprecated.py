@@ -3,7 +3,7 @@ from os import environ as os_environ
 
 from hemera.dataclasses import DeprecatedEnvirionmentVariable
 from hemera.exceptions import EnvironmentVariableDeprecatedError
-from hemera.metadata import get_software_versions
+from hemera.metadata import get_hemera_version
 
 DEPRECATEDENVIRIONMENTVARIABLES = [
     DeprecatedEnvirionmentVariable(
@@ -29,7 +29,7 @@ def scan_for_deprecated_env_vars(
         EnvironmentVariableDeprecatedError: Raised when an environment variable is deprecated.
     """
 
-    hemera_version = get_software_versions(distribution="hemera").package["hemera"]
+    hemera_version = get_hemera_version()
 
     for envirionment_variable in deprecated_env_vars:
         if envirionment_variable.name in os_environ:
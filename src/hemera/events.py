@@ -0,0 +1,93 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Type
+
+from hemera.dataclasses import HttpRequest
+from hemera.serialization import loads
+from hemera.types import GithubHttpRequest, HemeraField
+
+Extractor = Callable[[Mapping[str, str], bytes], GithubHttpRequest]
+
+# The keys to keep under an object, None to keep the whole value.
+KeyTree = Dict[str, Optional["KeyTree"]]
+
+
+class ProjectionDecoder:
+    """A JSON decoder that only keeps the keys on the paths of a set of
+    fields.
+
+    The body is decoded with the selected JSON backend, orjson when it is
+    installed, and then pruned to the field paths so the unused parts of the
+    payload are never retained.
+    """
+
+    def __init__(self, fields: Mapping[str, HemeraField]):
+        """Initialize an instance of the ProjectionDecoder class.
+
+        Args:
+            fields (Mapping[str, HemeraField]): The body fields to keep.
+        """
+        self.fields = {
+            name: field for name, field in fields.items() if field.source == "body"
+        }
+        self.tree: KeyTree = {}
+        for field in self.fields.values():
+            for path in field.paths:
+                node = self.tree
+                for key in path[:-1]:
+                    child = node.setdefault(key, {})
+                    if child is None:
+                        break
+                    node = child
+                else:
+                    node[path[-1]] = None
+
+    @staticmethod
+    def _prune(value: Any, tree: KeyTree) -> Any:
+        """Keep the keys of a decoded object that are on a field path.
+
+        Args:
+            value (Any): The decoded value.
+            tree (KeyTree): The keys to keep.
+
+        Returns:
+            Any: The pruned object, or the value itself when it is not an object.
+        """
+        if not isinstance(value, dict):
+            return value
+        pruned = {}
+        for key, subtree in tree.items():
+            if key in value:
+                child = value[key]
+                pruned[key] = (
+                    child
+                    if subtree is None
+                    else ProjectionDecoder._prune(child, subtree)
+                )
+        return pruned
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        """Decode a JSON body, keeping only the keys on the field paths.
+
+        Args:
+            body (bytes): The raw JSON body.
+
+        Returns:
+            Dict[str, Any]: The pruned body.
+        """
+        return self._prune(loads(body), self.tree)
+
+
+def create_projection_extractor(request_class: Type[GithubHttpRequest]) -> Extractor:
+    """Create an extractor that decodes only the fields of a request class.
+
+    Args:
+        request_class (Type[GithubHttpRequest]): The request class of the event.
+
+    Returns:
+        Extractor: A function creating the request from the headers and raw body of a delivery.
+    """
+    decoder = ProjectionDecoder(request_class.FIELDS)
+
+    def extract(header: Mapping[str, str], body: bytes) -> GithubHttpRequest:
+        return request_class(req=HttpRequest(header=header, body=decoder.decode(body)))
+
+    return extract
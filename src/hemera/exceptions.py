@@ -71,3 +71,73 @@ class EnvironmentVariableDeprecatedError(HemeraError):
 
     def __init__(self, env_var_name: str):
         super().__init__(f"Environment variable {env_var_name} is deprecated.")
+
+
+class EnvironmentVariableInvalidError(HemeraError):
+    """Raised when an environment variable has an invalid value."""
+
+    def __init__(self, env_var_name: str):
+        super().__init__(f"Environment variable {env_var_name} is invalid.")
+
+
+class DeliveryCacheError(HemeraError):
+    """Raised when the delivery cache cannot be read or written."""
+
+    def __init__(self):
+        super().__init__("Delivery cache is unavailable.")
+
+
+class WorkQueueFullError(HemeraError):
+    """Raised when the work queue cannot accept more requests."""
+
+    def __init__(self):
+        super().__init__("Work queue is full.")
+
+
+class SignatureVerificationError(HemeraError):
+    """Raised when the signature of a GitHub delivery is missing or invalid."""
+
+    def __init__(self):
+        super().__init__("Invalid webhook signature.")
+
+
+class MessageTemplateError(HemeraError):
+    """Raised when a message template is malformed or uses an unknown field."""
+
+    def __init__(self, template: str):
+        super().__init__(f"Message template {template} is invalid.")
+
+
+class RoutingRulesError(HemeraError):
+    """Raised when the routing rules cannot be loaded."""
+
+    def __init__(self, path: str):
+        super().__init__(f"Routing rules {path} are invalid.")
+
+
+class DeadlineExceededError(HemeraError):
+    """Raised when the time budget of a request has run out."""
+
+    def __init__(self):
+        super().__init__("Deadline exceeded.")
+
+
+class BulkheadFullError(HemeraError):
+    """Raised when a sink already sends its maximum number of deliveries."""
+
+    def __init__(self, sink: str):
+        super().__init__(f"Sink {sink} is saturated.")
+
+
+class SinkNotFoundError(HemeraError):
+    """Raised when no sink is registered with a name."""
+
+    def __init__(self, sink: str):
+        super().__init__(f"Sink {sink} is not registered.")
+
+
+class CircuitOpenError(HemeraError):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Circuit breaker {name} is open.")
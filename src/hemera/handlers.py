@@ -1,12 +1,64 @@
+from asyncio import gather
+from concurrent.futures import Executor
 from logging import Logger, getLogger
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union, cast
 
+from requests import Session
+
+from hemera.dataclasses import HomeAutomationResult, SinkReport
+from hemera.deadline import Deadline
 from hemera.exceptions import AutomationHandlerException, HemeraError
-from hemera.homeautomation import send_request_to_homeautomation_webhook
-from hemera.slack import create_slack_message, send_slack_message
-from hemera.types import HemeraHttpRequest
+from hemera.homeautomation import (
+    HOMEAUTOMATION_RETRIES,
+    HOMEAUTOMATION_TIMEOUT,
+    send_request_to_homeautomation_webhook_async,
+    send_request_to_homeautomation_webhooks,
+)
+from hemera.metrics import METRICS, RENDER_STAGE, SEND_STAGE
+from hemera.outbox import SqliteOutbox
+from hemera.sinks import HOMEAUTOMATION_SINK, SINK_REGISTRY, SLACK_SINK, SinkRegistry
+from hemera.slack import (
+    create_slack_message,
+    send_slack_message,
+    send_slack_message_async,
+)
+from hemera.types import GithubHttpRequest
 
 LOGGER = getLogger(__name__)
 
+# The attributes of an AutomationHandler holding the targets of a built-in sink.
+_SINK_TARGETS = {
+    SLACK_SINK: "slack_channels",
+    HOMEAUTOMATION_SINK: "homeautomation_webhooks",
+}
+
+
+def _as_tuple(targets: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+    """Return one or more targets as a tuple.
+
+    Args:
+        targets (Union[str, Sequence[str]]): A single target or a sequence of targets.
+
+    Returns:
+        Tuple[str, ...]: The targets.
+    """
+    return (targets,) if isinstance(targets, str) else tuple(targets)
+
+
+def _record_sink(sink: str, latency: float, ok: bool) -> None:
+    """Record the latency and outcome of a sink.
+
+    Args:
+        sink (str): The name of the sink.
+        latency (float): The seconds spent sending to the sink.
+        ok (bool): Whether the sink succeeded.
+    """
+    labels = (("sink", sink),)
+    METRICS.observe("hemera_sink_seconds", latency, labels)
+    if not ok:
+        METRICS.inc("hemera_sink_errors_total", labels)
+
 
 class AutomationHandler:
     """Class to handle automation."""
@@ -14,76 +66,393 @@ class AutomationHandler:
     def __init__(
         self,
         slack_api_token: str,
-        slack_channel: str,
-        homeautomation_webhook: str,
+        slack_channel: Union[str, Sequence[str]],
+        homeautomation_webhook: Union[str, Sequence[str]],
+        message_renderer: Callable[[GithubHttpRequest], str] = cast(
+            Callable[[GithubHttpRequest], str], create_slack_message
+        ),
+        blocks_renderer: Optional[
+            Callable[[GithubHttpRequest], Optional[List[Dict[str, Any]]]]
+        ] = None,
+        homeautomation_timeout: float = HOMEAUTOMATION_TIMEOUT,
+        homeautomation_retries: int = HOMEAUTOMATION_RETRIES,
+        homeautomation_session: Optional[Session] = None,
+        homeautomation_executor: Optional[Executor] = None,
+        deadline: Optional[Deadline] = None,
+        sink_registry: Optional[SinkRegistry] = None,
+        sink_executor: Optional[Executor] = None,
+        outbox: Optional[SqliteOutbox] = None,
         logger: Logger = LOGGER,
     ):
         """Initialize an instance of the AutomationHandler class.
 
         Args:
             slack_api_token (str): The Slack API token.
-            slack_channel (str): The Slack channel.
-            homeautomation_webhook (str): The Home Automation webhook.
+            slack_channel (Union[str, Sequence[str]]): The Slack channel, or several channels.
+            homeautomation_webhook (Union[str, Sequence[str]]): The Home Automation webhook, or several webhooks.
+            message_renderer (Callable[[GithubHttpRequest], str], optional): The function creating the message.
+                Defaults to create_slack_message.
+            blocks_renderer (Optional[Callable[[GithubHttpRequest], Optional[List[Dict[str, Any]]]]], optional):
+                The function creating the Block Kit blocks of the Slack message. Defaults to None.
+            homeautomation_timeout (float, optional): The timeout of a Home Automation request in seconds.
+                Defaults to HOMEAUTOMATION_TIMEOUT.
+            homeautomation_retries (int, optional): The maximum number of retries of a Home Automation
+                request. Defaults to HOMEAUTOMATION_RETRIES.
+            homeautomation_session (Optional[Session], optional): The HTTP session of the Home Automation
+                requests, defaults to the shared session.
+            homeautomation_executor (Optional[Executor], optional): The executor sending to several Home
+                Automation webhooks concurrently, defaults to the shared executor.
+            deadline (Optional[Deadline], optional): The deadline of the request, the timeouts of the Slack
+                and Home Automation calls are derived from it. Defaults to None.
+            sink_registry (Optional[SinkRegistry], optional): The sinks the message is sent to, defaults to
+                SINK_REGISTRY.
+            sink_executor (Optional[Executor], optional): The executor running the sinks, defaults to the
+                shared executor.
+            outbox (Optional[SqliteOutbox], optional): The outbox failed sinks are stored in to be sent
+                again later. Defaults to None.
             logger (Logger, optional): The logger. Defaults to LOGGER.
         """
         self.slack_api_token = slack_api_token
-        self.slack_channel = slack_channel
-        self.homeautomation_webhook = homeautomation_webhook
+        self.slack_channels = _as_tuple(slack_channel)
+        self.homeautomation_webhooks = _as_tuple(homeautomation_webhook)
+        self.message_renderer = message_renderer
+        self.blocks_renderer = blocks_renderer
+        self.homeautomation_timeout = homeautomation_timeout
+        self.homeautomation_retries = homeautomation_retries
+        self.homeautomation_session = homeautomation_session
+        self.homeautomation_executor = homeautomation_executor
+        self.deadline = deadline
+        self.sink_registry = sink_registry or SINK_REGISTRY
+        self.sink_executor = sink_executor
+        self.outbox = outbox
         self.logger = logger
         self.message: str = ""
+        self.blocks: Optional[List[Dict[str, Any]]] = None
+        self.homeautomation_results: List[HomeAutomationResult] = []
+        self.report: Optional[SinkReport] = None
+        self.deferred: Tuple[str, ...] = ()
+        self.failed_targets: Dict[str, Tuple[str, ...]] = {}
 
     def _create_slack_message(
         self,
-        hemera_http_request: HemeraHttpRequest,
+        hemera_http_request: GithubHttpRequest,
     ):
-        """Create a Slack message from the HemeraHttpRequest and store it in.
+        """Create a Slack message from the GithubHttpRequest and store it in.
 
         Args:
-            hemera_http_request (HemeraHttpRequest): The Hemera HTTP request.
+            hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
         """
         self.logger.info("Creating Slack message.")
         try:
-            self.message = create_slack_message(hemera_http_request=hemera_http_request)
+            with METRICS.time("hemera_stage_seconds", RENDER_STAGE):
+                self.message = self.message_renderer(hemera_http_request)
+                if self.blocks_renderer is not None:
+                    self.blocks = self.blocks_renderer(hemera_http_request)
         except HemeraError as e:
             self.logger.error("Error creating Slack message, %s", e)
             raise AutomationHandlerException from e
 
     def _send_slack_message(self):
-        """Send the Slack message stored in this instance."""
+        """Send the Slack message stored in this instance to every channel.
+
+        Every channel is tried; an error is raised afterwards when one of
+        them failed.
+        """
         self.logger.info("Sending Slack message.")
+        failed: List[str] = []
+        for channel in self.slack_channels:
+            try:
+                send_slack_message(
+                    slack_api_token=self.slack_api_token,
+                    channel=channel,
+                    message=self.message,
+                    blocks=self.blocks,
+                    deadline=self.deadline,
+                )
+            except HemeraError as e:
+                self.logger.error("Error sending Slack message to %s, %s", channel, e)
+                failed.append(channel)
+        if failed:
+            self.failed_targets[SLACK_SINK] = tuple(failed)
+            raise AutomationHandlerException
+
+    def _log_homeautomation_result(self, result: HomeAutomationResult):
+        """Log and store the result of a Home Automation webhook request.
+
+        Args:
+            result (HomeAutomationResult): The result of the request.
+        """
+        self.homeautomation_results.append(result)
+        if result.ok:
+            self.logger.info(
+                "Sent request to Home Automation webhook in %.3f s.", result.latency
+            )
+        else:
+            self.logger.error(
+                "Error sending request to Home Automation webhook after %.3f s, %s",
+                result.latency,
+                result.error,
+            )
+
+    def _send_request_to_homeautomation_webhook(self):
+        """Send a request to every Home Automation webhook concurrently.
+
+        Every webhook is tried; an error is raised afterwards when one of
+        them failed.
+        """
+        self.logger.info("Sending request to Home Automation webhook.")
+        results = send_request_to_homeautomation_webhooks(
+            homeautomation_webhooks=self.homeautomation_webhooks,
+            message=self.message,
+            timeout=self.homeautomation_timeout,
+            session=self.homeautomation_session,
+            executor=self.homeautomation_executor,
+            deadline=self.deadline,
+            retries=self.homeautomation_retries,
+        )
+        for result in results:
+            self._log_homeautomation_result(result)
+        failed = tuple(
+            result.homeautomation_webhook for result in results if not result.ok
+        )
+        if failed:
+            self.failed_targets[HOMEAUTOMATION_SINK] = failed
+            raise AutomationHandlerException
+
+    async def _send_slack_message_to_channel_async(self, channel: str):
+        """Send the Slack message stored in this instance to a channel
+        without blocking.
+
+        Args:
+            channel (str): The Slack channel.
+        """
         try:
-            send_slack_message(
+            await send_slack_message_async(
                 slack_api_token=self.slack_api_token,
-                channel=self.slack_channel,
+                channel=channel,
                 message=self.message,
+                blocks=self.blocks,
+                deadline=self.deadline,
             )
         except HemeraError as e:
-            self.logger.error("Error sending Slack message, %s", e)
+            self.logger.error("Error sending Slack message to %s, %s", channel, e)
             raise AutomationHandlerException from e
 
-    def _send_request_to_homeautomation_webhook(self):
-        """Send a request to the Home Automation webhook."""
-        self.logger.info("Sending request to Home Automation webhook.")
+    async def _send_slack_message_async(self):
+        """Send the Slack message stored in this instance to every channel
+        without blocking."""
+        self.logger.info("Sending Slack message.")
+        await self._gather(
+            SLACK_SINK,
+            self.slack_channels,
+            (
+                self._send_slack_message_to_channel_async(channel)
+                for channel in self.slack_channels
+            ),
+        )
+
+    async def _send_request_to_one_homeautomation_webhook_async(
+        self, homeautomation_webhook: str
+    ):
+        """Send a request to a Home Automation webhook without blocking.
 
+        Args:
+            homeautomation_webhook (str): The Home Automation webhook.
+        """
+        started = perf_counter()
         try:
-            send_request_to_homeautomation_webhook(
-                homeautomation_webhook=self.homeautomation_webhook,
+            await send_request_to_homeautomation_webhook_async(
+                homeautomation_webhook=homeautomation_webhook,
                 message=self.message,
+                timeout=self.homeautomation_timeout,
+                deadline=self.deadline,
+                retries=self.homeautomation_retries,
             )
         except HemeraError as e:
-            self.logger.error("Error sending request to Home Automation webhook, %s", e)
+            self._log_homeautomation_result(
+                HomeAutomationResult(
+                    homeautomation_webhook=homeautomation_webhook,
+                    latency=perf_counter() - started,
+                    error=e,
+                )
+            )
             raise AutomationHandlerException from e
+        self._log_homeautomation_result(
+            HomeAutomationResult(
+                homeautomation_webhook=homeautomation_webhook,
+                latency=perf_counter() - started,
+            )
+        )
+
+    async def _send_request_to_homeautomation_webhook_async(self):
+        """Send a request to every Home Automation webhook without blocking."""
+        self.logger.info("Sending request to Home Automation webhook.")
+        await self._gather(
+            HOMEAUTOMATION_SINK,
+            self.homeautomation_webhooks,
+            (
+                self._send_request_to_one_homeautomation_webhook_async(
+                    homeautomation_webhook
+                )
+                for homeautomation_webhook in self.homeautomation_webhooks
+            ),
+        )
+
+    async def _gather(self, sink: str, targets: Tuple[str, ...], awaitables):
+        """Await the awaitable of every target of a sink to completion, then
+        raise an error when one of them failed.
+
+        Args:
+            sink (str): The name of the sink.
+            targets (Tuple[str, ...]): The targets, one per awaitable.
+            awaitables (Iterable[Awaitable]): The awaitables.
+        """
+        results = await gather(*awaitables, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+        failed = tuple(
+            target
+            for target, result in zip(targets, results)
+            if isinstance(result, Exception)
+        )
+        if failed:
+            self.failed_targets[sink] = failed
+            raise AutomationHandlerException
+
+    def _get_targets(self, sink: str) -> Tuple[str, ...]:
+        """Return the targets of a sink that failed.
+
+        Args:
+            sink (str): The name of the sink.
+
+        Returns:
+            Tuple[str, ...]: The failed Slack channels or Home Automation webhooks, every target when the
+                sink did not get to send, or an empty target for the whole of another sink.
+        """
+        if sink in self.failed_targets:
+            return self.failed_targets[sink]
+        if sink in _SINK_TARGETS:
+            return getattr(self, _SINK_TARGETS[sink])
+        return ("",)
+
+    def _defer(self, hemera_http_request: GithubHttpRequest, sinks: Tuple[str, ...]):
+        """Store the failed targets of failed sinks in the outbox to send
+        them again later.
+
+        Args:
+            hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+            sinks (Tuple[str, ...]): The names of the failed sinks.
+
+        Raises:
+            AutomationHandlerException: When there is no outbox or it cannot store the sinks.
+        """
+        if self.outbox is None:
+            raise AutomationHandlerException
+        try:
+            self.outbox.add(
+                hemera_http_request,
+                [
+                    (sink, target)
+                    for sink in sinks
+                    for target in self._get_targets(sink)
+                ],
+            )
+        except Exception as e:
+            self.logger.error("Error storing failed sinks in the outbox, %s", e)
+            raise AutomationHandlerException from e
+        self.deferred = sinks
+        self.logger.warning("Sending to %s again later.", ", ".join(sinks))
+
+    def _handle_report(
+        self, hemera_http_request: GithubHttpRequest, report: SinkReport
+    ):
+        """Record and log the outcome of every sink, and store the failed
+        sinks in the outbox.
+
+        Args:
+            hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+            report (SinkReport): The outcome of every sink.
+        """
+        for outcome in report.outcomes:
+            _record_sink(outcome.sink, outcome.latency, outcome.ok)
+            if outcome.ok:
+                self.logger.info(
+                    "Sink %s succeeded in %.3f s.", outcome.sink, outcome.latency
+                )
+            else:
+                self.logger.error(
+                    "Sink %s failed after %.3f s, %s",
+                    outcome.sink,
+                    outcome.latency,
+                    outcome.error,
+                )
+        if not report.ok:
+            self._defer(hemera_http_request, report.failed)
 
     def handle_request(
         self,
-        hemera_http_request: HemeraHttpRequest,
+        hemera_http_request: GithubHttpRequest,
     ):
-        """Handle a request.
+        """Handle a request, sending the message to every sink concurrently.
+
+        Every sink is run to completion. Failed sinks are stored in the
+        outbox when there is one, an error is raised otherwise.
+
+        Args:
+            hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+        """
+        self.logger.info("Handling request.")
+        self._create_slack_message(hemera_http_request=hemera_http_request)
+        with METRICS.time("hemera_stage_seconds", SEND_STAGE):
+            self.report = self.sink_registry.dispatch(
+                self, executor=self.sink_executor, deadline=self.deadline
+            )
+        self._handle_report(hemera_http_request, self.report)
+
+    async def handle_request_async(
+        self,
+        hemera_http_request: GithubHttpRequest,
+    ):
+        """Handle a request, sending the message to every sink concurrently
+        without blocking the event loop.
+
+        Every sink is awaited to completion. Failed sinks are stored in the
+        outbox when there is one, an error is raised otherwise.
 
         Args:
-            hemera_http_request (HemeraHttpRequest): The Hemera HTTP request.
+            hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
         """
         self.logger.info("Handling request.")
         self._create_slack_message(hemera_http_request=hemera_http_request)
-        self._send_slack_message()
-        self._send_request_to_homeautomation_webhook()
+        with METRICS.time("hemera_stage_seconds", SEND_STAGE):
+            self.report = await self.sink_registry.dispatch_async(
+                self, executor=self.sink_executor, deadline=self.deadline
+            )
+        self._handle_report(hemera_http_request, self.report)
+
+    def handle_sink(
+        self, hemera_http_request: GithubHttpRequest, sink: str, target: str = ""
+    ):
+        """Handle a request for a single sink, as the outbox does.
+
+        The latency and outcome are recorded like those of the sinks of a
+        delivery.
+
+        Args:
+            hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+            sink (str): The name of the sink.
+            target (str, optional): The Slack channel or Home Automation webhook to send to, defaults to
+                every target of the sink.
+        """
+        self.logger.info("Handling request for sink %s.", sink)
+        if target and sink in _SINK_TARGETS:
+            setattr(self, _SINK_TARGETS[sink], (target,))
+        self._create_slack_message(hemera_http_request=hemera_http_request)
+        started = perf_counter()
+        try:
+            self.sink_registry.send(sink, self)
+        except Exception:
+            _record_sink(sink, perf_counter() - started, ok=False)
+            raise
+        _record_sink(sink, perf_counter() - started, ok=True)
@@ -1,33 +1,543 @@
+from asyncio import AbstractEventLoop, get_running_loop
+from asyncio import sleep as async_sleep
+from concurrent.futures import Executor, ThreadPoolExecutor
+from email.utils import mktime_tz, parsedate_tz
+from functools import lru_cache
 from logging import getLogger
+from random import uniform
+from threading import Lock
+from time import perf_counter, sleep, time
+from typing import List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
 
-from requests import post
+from aiohttp import ClientConnectorError, ClientSession, ClientTimeout
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from urllib3.exceptions import ConnectTimeoutError
 
-from hemera.exceptions import HomeAutomationWebhookError
+from hemera.circuitbreaker import CircuitBreaker, get_circuit_breaker
+from hemera.dataclasses import HomeAutomationResult
+from hemera.deadline import Deadline
+from hemera.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    HemeraError,
+    HomeAutomationWebhookError,
+)
+from hemera.serialization import dumps
 
 LOGGER = getLogger(__name__)
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+HOMEAUTOMATION_TIMEOUT = 5.0
+HOMEAUTOMATION_POOL_SIZE = 10
+HOMEAUTOMATION_POOL_HOSTS = 10
+HOMEAUTOMATION_RETRIES = 2
+HOMEAUTOMATION_BACKOFF_FACTOR = 0.2
+
+# Home Assistant did not run the automation for these responses, so the
+# webhook can be called again without blinking the lights twice.
+HOMEAUTOMATION_RETRY_STATUSES = frozenset({429, 503})
+
+
+def split_homeautomation_webhooks(homeautomation_webhook: str) -> Tuple[str, ...]:
+    """Split a comma-separated list of Home Automation webhooks.
+
+    Args:
+        homeautomation_webhook (str): One webhook or several, separated by commas.
+
+    Returns:
+        Tuple[str, ...]: The webhooks.
+    """
+    return tuple(
+        webhook.strip()
+        for webhook in homeautomation_webhook.split(",")
+        if webhook.strip()
+    )
+
+
+@lru_cache(maxsize=None)
+def get_homeautomation_session(
+    pool_size: int = HOMEAUTOMATION_POOL_SIZE,
+    pool_hosts: int = HOMEAUTOMATION_POOL_HOSTS,
+) -> Session:
+    """Return the process-wide HTTP session for Home Automation webhooks.
+
+    Connections are kept alive and reused across requests. The session keeps
+    a connection pool for each of up to pool_hosts Home Assistant hosts, the
+    least recently used pool is closed beyond that. Each pool keeps up to
+    pool_size connections, one per concurrent request to the host. The
+    session does not retry, send_request_to_homeautomation_webhook does so
+    within the deadline of the request.
+
+    Args:
+        pool_size (int, optional): The number of connections kept per host, the pool_maxsize of the
+            adapter. Defaults to HOMEAUTOMATION_POOL_SIZE.
+        pool_hosts (int, optional): The number of hosts connections are kept for, the pool_connections
+            of the adapter. Defaults to HOMEAUTOMATION_POOL_HOSTS.
+
+    Returns:
+        Session: The HTTP session.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_hosts, pool_maxsize=pool_size, max_retries=0
+    )
+    session = Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_homeautomation_circuit_breaker(homeautomation_webhook: str) -> CircuitBreaker:
+    """Return the circuit breaker of the Home Assistant instance of a webhook.
+
+    Args:
+        homeautomation_webhook (str): The Home Automation webhook.
+
+    Returns:
+        CircuitBreaker: The circuit breaker, shared by the webhooks of one host.
+    """
+    return get_circuit_breaker(
+        f"homeautomation:{urlsplit(homeautomation_webhook).netloc}"
+    )
+
+
+def _is_homeautomation_outage(error: Exception) -> bool:
+    """Check whether an error means Home Assistant is unavailable.
+
+    Args:
+        error (Exception): The error of a request.
+
+    Returns:
+        bool: False for responses other than server errors, True otherwise.
+    """
+    status = getattr(error, "status", None) or getattr(
+        getattr(error, "response", None), "status_code", None
+    )
+    return status is None or status >= 500
+
+
+def _is_connect_error(error: RequestsConnectionError) -> bool:
+    """Check whether a request failed before it reached the webhook.
+
+    Args:
+        error (RequestsConnectionError): The connection error of a request.
+
+    Returns:
+        bool: True when no connection was made, False when it broke off mid-request.
+    """
+    # NewConnectionError and NameResolutionError derive from ConnectTimeoutError.
+    reason = getattr(error.args[0] if error.args else None, "reason", None)
+    return isinstance(reason, ConnectTimeoutError)
+
+
+def _get_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the delay a response asks for in its Retry-After header.
+
+    Args:
+        headers (Mapping[str, str]): The case-insensitive headers of the response.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, None without a valid header.
+    """
+    retry_after = headers.get("Retry-After")
+    if retry_after is None:
+        return None
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        date = parsedate_tz(retry_after)
+        return None if date is None else max(mktime_tz(date) - time(), 0.0)
+
+
+def _get_retry_delay(
+    attempt: int,
+    retries: int,
+    timeout: float,
+    deadline: Optional[Deadline],
+    retry_after: Optional[float] = None,
+) -> Optional[float]:
+    """Return the delay before the next attempt of a request.
+
+    The delay is the Retry-After of the response or a jittered exponential
+    backoff, so retries of concurrent requests do not arrive together. A
+    delay is never longer than the timeout or the remaining budget.
+
+    Args:
+        attempt (int): The number of the failed attempt, counting from zero.
+        retries (int): The maximum number of retries.
+        timeout (float): The timeout of each attempt in seconds.
+        deadline (Optional[Deadline]): The deadline of the request.
+        retry_after (Optional[float], optional): The delay the response asks for. Defaults to None.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, None when the request is not retried because
+            the retries are used up or the delay is too long.
+    """
+    if attempt >= retries:
+        return None
+    if retry_after is None:
+        backoff = HOMEAUTOMATION_BACKOFF_FACTOR * 2**attempt
+        delay = backoff / 2 + uniform(0, backoff / 2)
+    else:
+        delay = retry_after
+    if delay > timeout or (deadline is not None and delay >= deadline.remaining()):
+        return None
+    return delay
+
+
+def _post_to_homeautomation_webhook(
+    session: Session,
+    homeautomation_webhook: str,
+    message: str,
+    timeout: float,
+    retries: int,
+    deadline: Optional[Deadline],
+) -> None:
+    """Post a message to a Home Automation webhook.
+
+    Only failures where the webhook did not run are retried: connection
+    errors and the HOMEAUTOMATION_RETRY_STATUSES. Read timeouts are not
+    retried. With a deadline, every attempt and delay fits in the remaining
+    budget.
+
+    Args:
+        session (Session): The HTTP session.
+        homeautomation_webhook (str): The Home Automation webhook.
+        message (str): The message to send.
+        timeout (float): The timeout of each attempt in seconds.
+        retries (int): The maximum number of retries.
+        deadline (Optional[Deadline]): The deadline of the request.
+    """
+    data = dumps({"message": message})
+    attempt = 0
+    while True:
+        try:
+            response = session.post(
+                url=homeautomation_webhook,
+                data=data,
+                headers=JSON_HEADERS,
+                timeout=timeout if deadline is None else deadline.timeout(timeout),
+            )
+        except RequestsConnectionError as e:
+            delay = (
+                _get_retry_delay(attempt, retries, timeout, deadline)
+                if _is_connect_error(e)
+                else None
+            )
+            if delay is None:
+                raise
+        else:
+            delay = (
+                _get_retry_delay(
+                    attempt,
+                    retries,
+                    timeout,
+                    deadline,
+                    _get_retry_after(response.headers),
+                )
+                if response.status_code in HOMEAUTOMATION_RETRY_STATUSES
+                else None
+            )
+            if delay is None:
+                response.raise_for_status()
+                return
+        sleep(delay)
+        attempt += 1
+
 
 def send_request_to_homeautomation_webhook(
     homeautomation_webhook: str,
     message: str,
+    timeout: float = HOMEAUTOMATION_TIMEOUT,
+    session: Optional[Session] = None,
+    deadline: Optional[Deadline] = None,
+    retries: int = HOMEAUTOMATION_RETRIES,
 ) -> None:
     """Send a request to the Home Automation webhook.
 
+    With a deadline, the timeout of every attempt is at most the remaining
+    budget, and no retry is started that would not fit in it. While the
+    circuit breaker of the Home Assistant instance is open, the request is
+    rejected right away.
+
+    Args:
+        homeautomation_webhook (str): The Home Automation webhook.
+        message (str): The message to send.
+        timeout (float, optional): The timeout of each attempt in seconds. Defaults to HOMEAUTOMATION_TIMEOUT.
+        session (Optional[Session], optional): The HTTP session, defaults to the shared session.
+        deadline (Optional[Deadline], optional): The deadline of the request. Defaults to None.
+        retries (int, optional): The maximum number of retries. Defaults to HOMEAUTOMATION_RETRIES.
+
+    Raises:
+        HomeAutomationWebhookError: When an error occurs when running the Home Automation webhook.
+        DeadlineExceededError: When the budget has run out.
+        CircuitOpenError: When the circuit breaker of the Home Assistant instance is open.
+    """
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceededError
+    try:
+        get_homeautomation_circuit_breaker(homeautomation_webhook).call(
+            _post_to_homeautomation_webhook,
+            session or get_homeautomation_session(),
+            homeautomation_webhook,
+            message,
+            timeout,
+            retries,
+            deadline,
+            is_failure=_is_homeautomation_outage,
+        )
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        raise HomeAutomationWebhookError from e
+
+
+@lru_cache(maxsize=None)
+def get_homeautomation_executor(
+    max_workers: int = HOMEAUTOMATION_POOL_SIZE,
+) -> Executor:
+    """Return the process-wide executor sending requests to Home Automation
+    webhooks.
+
+    Args:
+        max_workers (int, optional): The maximum number of concurrent requests. Defaults to HOMEAUTOMATION_POOL_SIZE.
+
+    Returns:
+        Executor: The executor.
+    """
+    return ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="hemera-homeautomation"
+    )
+
+
+def _send_timed_request_to_homeautomation_webhook(
+    homeautomation_webhook: str,
+    message: str,
+    timeout: float,
+    session: Optional[Session],
+    deadline: Optional[Deadline],
+    retries: int,
+) -> HomeAutomationResult:
+    """Send a request to a Home Automation webhook and measure it.
+
+    Args:
+        homeautomation_webhook (str): The Home Automation webhook.
+        message (str): The message to send.
+        timeout (float): The timeout in seconds.
+        session (Optional[Session]): The HTTP session, defaults to the shared session.
+        deadline (Optional[Deadline]): The deadline of the request.
+        retries (int): The maximum number of retries.
+
+    Returns:
+        HomeAutomationResult: The result of the request.
+    """
+    started = perf_counter()
+    try:
+        send_request_to_homeautomation_webhook(
+            homeautomation_webhook=homeautomation_webhook,
+            message=message,
+            timeout=timeout,
+            session=session,
+            deadline=deadline,
+            retries=retries,
+        )
+    except HemeraError as e:
+        return HomeAutomationResult(
+            homeautomation_webhook=homeautomation_webhook,
+            latency=perf_counter() - started,
+            error=e,
+        )
+    return HomeAutomationResult(
+        homeautomation_webhook=homeautomation_webhook,
+        latency=perf_counter() - started,
+    )
+
+
+def send_request_to_homeautomation_webhooks(
+    homeautomation_webhooks: Sequence[str],
+    message: str,
+    timeout: float = HOMEAUTOMATION_TIMEOUT,
+    session: Optional[Session] = None,
+    executor: Optional[Executor] = None,
+    deadline: Optional[Deadline] = None,
+    retries: int = HOMEAUTOMATION_RETRIES,
+) -> List[HomeAutomationResult]:
+    """Send a request to several Home Automation webhooks concurrently.
+
+    Every webhook is sent to on the executor, so a slow webhook only delays
+    its own result. A single webhook is sent to on the calling thread.
+
+    Args:
+        homeautomation_webhooks (Sequence[str]): The Home Automation webhooks.
+        message (str): The message to send.
+        timeout (float, optional): The timeout of each request in seconds. Defaults to HOMEAUTOMATION_TIMEOUT.
+        session (Optional[Session], optional): The HTTP session, defaults to the shared session.
+        executor (Optional[Executor], optional): The executor, defaults to the shared executor.
+        deadline (Optional[Deadline], optional): The deadline of the request, webhooks reached after it
+            fail without a request. Defaults to None.
+        retries (int, optional): The maximum number of retries of each request. Defaults to HOMEAUTOMATION_RETRIES.
+
+    Returns:
+        List[HomeAutomationResult]: The result of every webhook, in order.
+    """
+    if len(homeautomation_webhooks) <= 1:
+        return [
+            _send_timed_request_to_homeautomation_webhook(
+                homeautomation_webhook=homeautomation_webhook,
+                message=message,
+                timeout=timeout,
+                session=session,
+                deadline=deadline,
+                retries=retries,
+            )
+            for homeautomation_webhook in homeautomation_webhooks
+        ]
+
+    executor = executor or get_homeautomation_executor()
+    futures = [
+        executor.submit(
+            _send_timed_request_to_homeautomation_webhook,
+            homeautomation_webhook=homeautomation_webhook,
+            message=message,
+            timeout=timeout,
+            session=session,
+            deadline=deadline,
+            retries=retries,
+        )
+        for homeautomation_webhook in homeautomation_webhooks
+    ]
+    return [future.result() for future in futures]
+
+
+_HOMEAUTOMATION_CLIENT_SESSIONS: "WeakKeyDictionary[AbstractEventLoop, ClientSession]" = (
+    WeakKeyDictionary()
+)
+_HOMEAUTOMATION_CLIENT_SESSIONS_LOCK = Lock()
+
+
+def get_homeautomation_client_session() -> ClientSession:
+    """Return the aiohttp session of the running event loop.
+
+    An aiohttp session is bound to the event loop it was created on, so every
+    loop gets its own. The session keeps its connections to Home Assistant
+    alive between deliveries.
+
+    Returns:
+        ClientSession: The session, created on first use.
+    """
+    loop = get_running_loop()
+    with _HOMEAUTOMATION_CLIENT_SESSIONS_LOCK:
+        session = _HOMEAUTOMATION_CLIENT_SESSIONS.get(loop)
+        if session is None or session.closed:
+            session = _HOMEAUTOMATION_CLIENT_SESSIONS[loop] = ClientSession()
+        return session
+
+
+async def close_homeautomation_client_session() -> None:
+    """Close the aiohttp session of the running event loop."""
+    with _HOMEAUTOMATION_CLIENT_SESSIONS_LOCK:
+        session = _HOMEAUTOMATION_CLIENT_SESSIONS.pop(get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def _post_to_homeautomation_webhook_async(
+    homeautomation_webhook: str,
+    message: str,
+    timeout: float,
+    retries: int,
+    deadline: Optional[Deadline],
+) -> None:
+    """Post a message to a Home Automation webhook without blocking the event
+    loop.
+
+    Retries like _post_to_homeautomation_webhook: only connection errors
+    and the HOMEAUTOMATION_RETRY_STATUSES are retried.
+
+    Args:
+        homeautomation_webhook (str): The Home Automation webhook.
+        message (str): The message to send.
+        timeout (float): The timeout of each attempt in seconds.
+        retries (int): The maximum number of retries.
+        deadline (Optional[Deadline]): The deadline of the request.
+    """
+    session = get_homeautomation_client_session()
+    data = dumps({"message": message})
+    attempt = 0
+    while True:
+        try:
+            async with session.post(
+                url=homeautomation_webhook,
+                data=data,
+                headers=JSON_HEADERS,
+                timeout=ClientTimeout(
+                    total=timeout if deadline is None else deadline.timeout(timeout)
+                ),
+            ) as response:
+                delay = (
+                    _get_retry_delay(
+                        attempt,
+                        retries,
+                        timeout,
+                        deadline,
+                        _get_retry_after(response.headers),
+                    )
+                    if response.status in HOMEAUTOMATION_RETRY_STATUSES
+                    else None
+                )
+                if delay is None:
+                    response.raise_for_status()
+                    return
+        except ClientConnectorError:
+            delay = _get_retry_delay(attempt, retries, timeout, deadline)
+            if delay is None:
+                raise
+        await async_sleep(delay)
+        attempt += 1
+
+
+async def send_request_to_homeautomation_webhook_async(
+    homeautomation_webhook: str,
+    message: str,
+    timeout: float = HOMEAUTOMATION_TIMEOUT,
+    deadline: Optional[Deadline] = None,
+    retries: int = HOMEAUTOMATION_RETRIES,
+) -> None:
+    """Send a request to the Home Automation webhook without blocking the
+    event loop.
+
+    The requests share the aiohttp session of the running event loop, and
+    are retried like send_request_to_homeautomation_webhook.
+
     Args:
         homeautomation_webhook (str): The Home Automation webhook.
         message (str): The message to send.
+        timeout (float, optional): The timeout of each attempt in seconds. Defaults to HOMEAUTOMATION_TIMEOUT.
+        deadline (Optional[Deadline], optional): The deadline of the request. Defaults to None.
+        retries (int, optional): The maximum number of retries. Defaults to HOMEAUTOMATION_RETRIES.
 
     Raises:
         HomeAutomationWebhookError: When an error occurs when running the Home Automation webhook.
+        DeadlineExceededError: When the budget has run out.
+        CircuitOpenError: When the circuit breaker of the Home Assistant instance is open.
     """
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceededError
     try:
-        response = post(
-            url=homeautomation_webhook,
-            json={
-                "message": message,
-            },
-            timeout=5,
+        await get_homeautomation_circuit_breaker(homeautomation_webhook).call_async(
+            _post_to_homeautomation_webhook_async,
+            homeautomation_webhook,
+            message,
+            timeout,
+            retries,
+            deadline,
+            is_failure=_is_homeautomation_outage,
         )
-        response.raise_for_status()
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HomeAutomationWebhookError from e
@@ -1,55 +1,21 @@
-from logging import Logger, getLogger
+from logging import getLogger
+from typing import Mapping
 
 import azure.functions as func
 
-from hemera.dataclasses import HttpRequest
-
 LOGGER = getLogger(__name__)
 
 
-def convert_http_request_headers(req: func.HttpRequest) -> dict:
-    """Convert an Azure Functions HTTP request's headers to a dictionary.
-
-    Args:
-        req (func.HttpRequest): The Azure Functions HTTP request.
-
-    Returns:
-        dict: The Azure Functions HTTP request's headers as a dictionary.
-    """
-    return dict(req.headers)
-
+def convert_http_request_headers(req: func.HttpRequest) -> Mapping[str, str]:
+    """Return an Azure Functions HTTP request's headers without copying them.
 
-def convert_http_request_body(req: func.HttpRequest) -> dict:
-    """Convert an Azure Functions HTTP request's body to a dictionary.
+    The body is decoded by the extractor of the event router, which only
+    keeps the fields of the request class.
 
     Args:
         req (func.HttpRequest): The Azure Functions HTTP request.
 
     Returns:
-        dict: The Azure Functions HTTP request's body as a dictionary.
+        Mapping[str, str]: A read-only, case-insensitive view of the headers.
     """
-    return dict(req.get_json())
-
-
-def convert_http_request(
-    req: func.HttpRequest,
-    logger: Logger = LOGGER,
-) -> HttpRequest:
-    """Convert an Azure Functions HTTP request to a dictionary.
-
-    Args:
-        req (func.HttpRequest): The Azure Functions HTTP request.
-        logger (Logger, optional): The logger. Defaults to LOGGER.
-
-    Returns:
-        HttpRequest: The Azure Functions HTTP request as a HttpRequest dataclass.
-    """
-
-    http_request = HttpRequest(
-        header=convert_http_request_headers(req=req),
-        body=convert_http_request_body(req=req),
-    )
-
-    logger.debug(f"Converted HTTP request to dictionary: {http_request}")
-
-    return http_request
+    return req.headers
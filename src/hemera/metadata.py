@@ -1,9 +1,24 @@
+from functools import lru_cache
 from importlib.metadata import version
 
 from hemera.dataclasses import PythonVersion
 from hemera.exceptions import SoftwareVerionsNotFoundError
 
 
+@lru_cache(maxsize=None)
+def _get_distribution_version(distribution: str) -> str:
+    """Return the installed version of a distribution, resolved once per
+    process.
+
+    Args:
+        distribution (str): The distribution.
+
+    Returns:
+        str: The version of the distribution.
+    """
+    return version(distribution)
+
+
 def get_software_versions(distribution: str) -> PythonVersion:
     """Get the software versions.
 
@@ -17,6 +32,20 @@ def get_software_versions(distribution: str) -> PythonVersion:
         PythonVersion: The software versions.
     """
     try:
-        return PythonVersion(package={distribution: version(distribution)})
+        return PythonVersion(
+            package={distribution: _get_distribution_version(distribution)}
+        )
     except Exception as e:
         raise SoftwareVerionsNotFoundError from e
+
+
+def get_hemera_version() -> str:
+    """Get the version of the Hemera core package.
+
+    Raises:
+        SoftwareVerionsNotFoundError: When the software versions are not found.
+
+    Returns:
+        str: The version of the Hemera core package.
+    """
+    return get_software_versions(distribution="hemera").package["hemera"]
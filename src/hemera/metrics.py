@@ -0,0 +1,398 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+from threading import Lock, local
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, TypeVar, cast
+
+import azure.functions as func
+
+from hemera.circuitbreaker import CLOSED, HALF_OPEN, OPEN, get_circuit_breakers
+from hemera.slack import SLACK_RATE_LIMITER
+
+Labels = Tuple[Tuple[str, str], ...]
+MetricKey = Tuple[str, Labels]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Seconds, from a template render to a Slack call running into its timeout.
+LATENCY_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CIRCUIT_BREAKER_STATES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+PREFILTER_STAGE: Labels = (("stage", "prefilter"),)
+PARSE_STAGE: Labels = (("stage", "parse"),)
+FILTER_STAGE: Labels = (("stage", "filter"),)
+RENDER_STAGE: Labels = (("stage", "render"),)
+SEND_STAGE: Labels = (("stage", "send"),)
+
+
+class _Shard:
+    """The metrics recorded by one thread."""
+
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters: Dict[MetricKey, float] = {}
+        self.histograms: Dict[MetricKey, List[float]] = {}
+
+
+class Metrics:
+    """Counters and fixed-bucket histograms with a shard per thread.
+
+    A thread only writes its own shard, so recording takes no lock. The
+    shards are summed when the metrics are rendered.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """Initialize an instance of the Metrics class.
+
+        Args:
+            buckets (Sequence[float], optional): The upper bounds of the histogram buckets, ascending.
+                Defaults to LATENCY_BUCKETS.
+        """
+        self.buckets = tuple(buckets)
+        self._descriptions: Dict[str, Tuple[str, str]] = {}
+        self._local = local()
+        self._shards: List[_Shard] = []
+        self._lock = Lock()
+
+    def describe(self, name: str, kind: str, description: str) -> "Metrics":
+        """Describe a metric for its HELP and TYPE lines.
+
+        Args:
+            name (str): The name of the metric.
+            kind (str): The type of the metric, counter or histogram.
+            description (str): The description of the metric.
+
+        Returns:
+            Metrics: These metrics, to chain descriptions.
+        """
+        self._descriptions[name] = (kind, description)
+        return self
+
+    def _shard(self) -> _Shard:
+        """Return the shard of the calling thread.
+
+        Returns:
+            _Shard: The shard, created on the first call of a thread.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1.0) -> None:
+        """Increment a counter.
+
+        Args:
+            name (str): The name of the counter.
+            labels (Labels, optional): The labels. Defaults to ().
+            value (float, optional): The increment. Defaults to 1.0.
+        """
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0.0) + value
+
+    def observe(self, name: str, seconds: float, labels: Labels = ()) -> None:
+        """Record a latency in a histogram.
+
+        Args:
+            name (str): The name of the histogram.
+            seconds (float): The latency.
+            labels (Labels, optional): The labels. Defaults to ().
+        """
+        histograms = self._shard().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            # A count per bucket, the +Inf bucket and the sum.
+            histogram = histograms[key] = [0.0] * (len(self.buckets) + 2)
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+
+    @contextmanager
+    def time(self, name: str, labels: Labels = ()) -> Iterator[None]:
+        """Record the latency of a block in a histogram, also when it fails.
+
+        Args:
+            name (str): The name of the histogram.
+            labels (Labels, optional): The labels. Defaults to ().
+        """
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - started, labels)
+
+    def collect(self) -> Tuple[Dict[MetricKey, float], Dict[MetricKey, List[float]]]:
+        """Sum the shards of every thread.
+
+        Returns:
+            Tuple[Dict[MetricKey, float], Dict[MetricKey, List[float]]]: The counters and the histograms.
+        """
+        with self._lock:
+            shards = list(self._shards)
+
+        counters: Dict[MetricKey, float] = {}
+        histograms: Dict[MetricKey, List[float]] = {}
+        for shard in shards:
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0.0) + value
+            for key, histogram in list(shard.histograms.items()):
+                total = histograms.setdefault(key, [0.0] * len(histogram))
+                for i, value in enumerate(list(histogram)):
+                    total[i] += value
+        return counters, histograms
+
+    def _header(self, lines: List[str], name: str, kind: str) -> None:
+        """Append the HELP and TYPE lines of a metric.
+
+        Args:
+            lines (List[str]): The lines of the exposition.
+            name (str): The name of the metric.
+            kind (str): The type of the metric when it is not described.
+        """
+        kind, description = self._descriptions.get(name, (kind, ""))
+        if description:
+            lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text format.
+
+        Returns:
+            str: The exposition.
+        """
+        counters, histograms = self.collect()
+        lines: List[str] = []
+
+        for name in sorted({name for name, _ in counters}):
+            self._header(lines, name, "counter")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {_format(value)}")
+
+        bounds = [_format(bucket) for bucket in self.buckets] + ["+Inf"]
+        for name in sorted({name for name, _ in histograms}):
+            self._header(lines, name, "histogram")
+            for (metric, labels), histogram in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                count = 0.0
+                for bound, value in zip(bounds, histogram):
+                    count += value
+                    bucket_labels = labels + (("le", bound),)
+                    lines.append(
+                        f"{name}_bucket{_format_labels(bucket_labels)} {_format(count)}"
+                    )
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {_format(histogram[-1])}"
+                )
+                lines.append(f"{name}_count{_format_labels(labels)} {_format(count)}")
+
+        return "".join(f"{line}\n" for line in lines)
+
+    def clear(self) -> None:
+        """Forget every recorded value."""
+        with self._lock:
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+
+def _format(value: float) -> str:
+    """Format a sample value.
+
+    Args:
+        value (float): The value.
+
+    Returns:
+        str: The value, without a fraction when it is whole.
+    """
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _format_labels(labels: Labels) -> str:
+    """Format the labels of a sample.
+
+    Args:
+        labels (Labels): The labels.
+
+    Returns:
+        str: The labels in braces, empty without labels.
+    """
+    if not labels:
+        return ""
+    return (
+        "{"
+        + ",".join(
+            '{}="{}"'.format(
+                name,
+                value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+            )
+            for name, value in labels
+        )
+        + "}"
+    )
+
+
+METRICS = (
+    Metrics()
+    .describe(
+        "hemera_requests_total", "counter", "GitHub deliveries handled, by status."
+    )
+    .describe(
+        "hemera_request_seconds",
+        "histogram",
+        "Seconds spent handling a GitHub delivery.",
+    )
+    .describe(
+        "hemera_stage_seconds",
+        "histogram",
+        "Seconds spent in a stage of handling a GitHub delivery.",
+    )
+    .describe("hemera_sink_seconds", "histogram", "Seconds spent sending to a sink.")
+    .describe("hemera_sink_errors_total", "counter", "Failed sends to a sink.")
+)
+
+
+def _record_request(started: float, status_code: int) -> None:
+    """Record a handled request.
+
+    Args:
+        started (float): The perf_counter value when the request started.
+        status_code (int): The status code of the response.
+    """
+    METRICS.observe("hemera_request_seconds", perf_counter() - started)
+    METRICS.inc("hemera_requests_total", (("status", str(status_code)),))
+
+
+def measure_requests(function: F) -> F:
+    """Decorate an Azure Function entry point to count its responses and
+    measure its latency.
+
+    Args:
+        function (F): The entry point, a function or a coroutine function.
+
+    Returns:
+        F: The measured entry point, with the signature of the entry point.
+    """
+    if iscoroutinefunction(function):
+
+        @wraps(function)
+        async def measured_async(req: func.HttpRequest) -> func.HttpResponse:
+            started = perf_counter()
+            try:
+                response = await function(req)
+            except Exception:
+                _record_request(started, 500)
+                raise
+            _record_request(started, response.status_code)
+            return response
+
+        return cast(F, measured_async)
+
+    @wraps(function)
+    def measured(req: func.HttpRequest) -> func.HttpResponse:
+        started = perf_counter()
+        try:
+            response = function(req)
+        except Exception:
+            _record_request(started, 500)
+            raise
+        _record_request(started, response.status_code)
+        return response
+
+    return cast(F, measured)
+
+
+def render_metrics() -> str:
+    """Render the recorded metrics and the state of the circuit breakers and
+    the Slack rate limiter in the Prometheus text format.
+
+    Returns:
+        str: The exposition.
+    """
+    lines = [METRICS.render()]
+
+    circuit_breakers = [
+        circuit_breaker.stats() for circuit_breaker in get_circuit_breakers()
+    ]
+    if circuit_breakers:
+        for name, kind, description, field in (
+            (
+                "hemera_circuit_breaker_state",
+                "gauge",
+                "State of a circuit breaker, 0 closed, 1 half open, 2 open.",
+                "state",
+            ),
+            (
+                "hemera_circuit_breaker_rejected_total",
+                "counter",
+                "Calls rejected by a circuit breaker.",
+                "rejected",
+            ),
+            (
+                "hemera_circuit_breaker_opened_total",
+                "counter",
+                "Times a circuit breaker opened.",
+                "opened",
+            ),
+        ):
+            lines.append(f"# HELP {name} {description}\n# TYPE {name} {kind}\n")
+            for stats in circuit_breakers:
+                value = getattr(stats, field)
+                if field == "state":
+                    value = CIRCUIT_BREAKER_STATES[value]
+                labels = _format_labels((("downstream", stats.name),))
+                lines.append(f"{name}{labels} {value}\n")
+
+    rate_limiter = SLACK_RATE_LIMITER.stats()
+    for name, kind, description, value in (
+        (
+            "hemera_slack_queue_depth",
+            "gauge",
+            "Slack messages waiting for their channel.",
+            rate_limiter.queue_depth,
+        ),
+        (
+            "hemera_slack_throttled_seconds_total",
+            "counter",
+            "Seconds Slack messages waited for their channel.",
+            rate_limiter.throttled_seconds,
+        ),
+        (
+            "hemera_slack_rate_limited_total",
+            "counter",
+            "Slack responses asking to retry later.",
+            rate_limiter.rate_limited,
+        ),
+    ):
+        lines.append(
+            f"# HELP {name} {description}\n# TYPE {name} {kind}\n"
+            f"{name} {_format(float(value))}\n"
+        )
+
+    return "".join(lines)
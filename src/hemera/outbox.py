@@ -0,0 +1,376 @@
+from logging import Logger, getLogger
+from os import getpid
+from sqlite3 import connect as sqlite_connect
+from threading import Event, Lock, Thread
+from time import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from hemera.dataclasses import HemeraConfig
+from hemera.types import GithubHttpRequest
+from hemera.workqueue import dump_work_item, load_work_item
+
+LOGGER = getLogger(__name__)
+
+OUTBOX_BASE_DELAY = 1.0
+OUTBOX_MAX_DELAY = 300.0
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_RETENTION = 86400.0
+OUTBOX_LEASE = 300.0
+
+OutboxHandler = Callable[[GithubHttpRequest, str, str], None]
+
+
+class SqliteOutbox:
+    """A durable outbox of failed sink deliveries in a local SQLite database.
+
+    Every failed target of a delivery is stored once, keyed by the GitHub
+    delivery ID, the sink and the target, so only the Slack channels and
+    Home Automation webhooks that failed are sent again. A background drainer sends the due entries
+    again, backing off exponentially after every failure. Sent and given up
+    entries are kept for a day so a delivery is never sent to a target twice.
+
+    Worker processes may share the database: an entry is leased to the
+    drainer that claimed it, and claimed again once the lease expires.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        base_delay: float = OUTBOX_BASE_DELAY,
+        max_delay: float = OUTBOX_MAX_DELAY,
+        poll_interval: float = 1.0,
+        lease: float = OUTBOX_LEASE,
+        clock: Callable[[], float] = time,
+        logger: Logger = LOGGER,
+    ):
+        """Initialize an instance of the SqliteOutbox class.
+
+        Args:
+            path (str): The path of the SQLite database.
+            max_attempts (int, optional): The number of times an entry is sent before it is given up.
+                Defaults to OUTBOX_MAX_ATTEMPTS.
+            base_delay (float, optional): The seconds before the first retry, doubled after every failure.
+                Defaults to OUTBOX_BASE_DELAY.
+            max_delay (float, optional): The maximum seconds between two retries. Defaults to OUTBOX_MAX_DELAY.
+            poll_interval (float, optional): Seconds the idle drainer waits between checks. Defaults to 1.0.
+            lease (float, optional): Seconds a claimed entry is reserved for its drainer. Defaults to OUTBOX_LEASE.
+            clock (Callable[[], float], optional): The clock. Defaults to time.
+            logger (Logger, optional): The logger. Defaults to LOGGER.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.clock = clock
+        self._owner = f"{getpid()}-{uuid4().hex}"
+        self.logger = logger
+        self._lock = Lock()
+        self._wake = Event()
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+        self._connection = sqlite_connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outbox "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, delivery_id TEXT NOT NULL, "
+            "sink TEXT NOT NULL, target TEXT NOT NULL, work_item TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL, "
+            "sent_at REAL, claimed_by TEXT, claimed_until REAL, "
+            "UNIQUE (delivery_id, sink, target))"
+        )
+
+    def start(self, handler: OutboxHandler) -> "SqliteOutbox":
+        """Start the drainer thread.
+
+        Args:
+            handler (OutboxHandler): The function that sends a request to a target of a sink, raising an error
+                when it fails.
+
+        Returns:
+            SqliteOutbox: This outbox.
+        """
+        self._thread = Thread(
+            target=self._drain_forever,
+            args=(handler,),
+            name="hemera-outbox",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def add(
+        self,
+        hemera_http_request: GithubHttpRequest,
+        targets: Sequence[Tuple[str, str]],
+    ) -> None:
+        """Store the failed targets of a delivery in one transaction.
+
+        A target already stored for the delivery, or already sent, is ignored.
+
+        Args:
+            hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+            targets (Sequence[Tuple[str, str]]): The sink and target of every failed target, an empty
+                target stands for the whole sink.
+        """
+        delivery_id = hemera_http_request.req.header.get("x-github-delivery") or (
+            uuid4().hex
+        )
+        work_item = dump_work_item(hemera_http_request)
+        next_attempt_at = self.clock() + self.base_delay
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO outbox "
+                    "(delivery_id, sink, target, work_item, next_attempt_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (delivery_id, sink, target, work_item, next_attempt_at)
+                        for sink, target in targets
+                    ],
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        self._wake.set()
+
+    def _due(self, now: float) -> List[Tuple[int, str, str, str, str, int]]:
+        """Return a batch of entries due for sending.
+
+        Args:
+            now (float): The current time.
+
+        Returns:
+            List[Tuple[int, str, str, str, str, int]]: The ID, delivery ID, sink, target, work item and
+                attempts of every entry.
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, delivery_id, sink, target, work_item, attempts FROM outbox "
+                "WHERE sent_at IS NULL AND attempts < ? AND next_attempt_at <= ? "
+                "AND (claimed_until IS NULL OR claimed_until <= ?) "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (self.max_attempts, now, now, OUTBOX_BATCH_SIZE),
+            ).fetchall()
+
+    def _claim(self, entry_id: int) -> bool:
+        """Claim a due entry for this drainer.
+
+        Another process may claim the same entry at the same time, so the
+        claim only succeeds when the entry is still not leased.
+
+        Args:
+            entry_id (int): The ID of the entry.
+
+        Returns:
+            bool: Whether this drainer holds the entry now.
+        """
+        now = self.clock()
+        with self._lock:
+            return bool(
+                self._connection.execute(
+                    "UPDATE outbox SET claimed_by = ?, claimed_until = ? "
+                    "WHERE id = ? AND sent_at IS NULL "
+                    "AND (claimed_until IS NULL OR claimed_until <= ?)",
+                    (self._owner, now + self.lease, entry_id, now),
+                ).rowcount
+            )
+
+    def _backoff(self, attempts: int) -> float:
+        """Return the seconds to wait after a number of failed attempts.
+
+        Args:
+            attempts (int): The number of failed attempts.
+
+        Returns:
+            float: The backoff.
+        """
+        return min(self.base_delay * 2**attempts, self.max_delay)
+
+    def drain(self, handler: OutboxHandler) -> int:
+        """Send every due entry once.
+
+        Args:
+            handler (OutboxHandler): The function that sends a request to a target of a sink, raising an error
+                when it fails.
+
+        Returns:
+            int: The number of entries sent successfully.
+        """
+        sent = 0
+        for entry_id, delivery_id, sink, target, work_item, attempts in self._due(
+            self.clock()
+        ):
+            if not self._claim(entry_id):
+                continue
+            try:
+                handler(load_work_item(work_item), sink, target)
+            except Exception as e:
+                attempts += 1
+                if attempts >= self.max_attempts:
+                    self.logger.error(
+                        "Giving up delivery %s to sink %s after %d attempts, %s",
+                        delivery_id,
+                        sink,
+                        attempts,
+                        e,
+                    )
+                else:
+                    self.logger.warning(
+                        "Error sending delivery %s to sink %s, attempt %d, %s",
+                        delivery_id,
+                        sink,
+                        attempts,
+                        e,
+                    )
+                with self._lock:
+                    self._connection.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt_at = ?, "
+                        "claimed_by = NULL, claimed_until = NULL "
+                        "WHERE id = ? AND claimed_by = ?",
+                        (
+                            attempts,
+                            self.clock() + self._backoff(attempts),
+                            entry_id,
+                            self._owner,
+                        ),
+                    )
+                continue
+
+            self.logger.info("Sent delivery %s to sink %s.", delivery_id, sink)
+            sent += 1
+            with self._lock:
+                self._connection.execute(
+                    "UPDATE outbox SET sent_at = ?, claimed_by = NULL, claimed_until = NULL "
+                    "WHERE id = ? AND claimed_by = ?",
+                    (self.clock(), entry_id, self._owner),
+                )
+
+        expired = self.clock() - OUTBOX_RETENTION
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM outbox WHERE sent_at < ? "
+                "OR (sent_at IS NULL AND attempts >= ? AND next_attempt_at < ?)",
+                (expired, self.max_attempts, expired),
+            )
+        return sent
+
+    def pending(self) -> int:
+        """Return the number of entries that are not sent yet.
+
+        Returns:
+            int: The number of pending entries, including given up ones.
+        """
+        with self._lock:
+            (pending,) = self._connection.execute(
+                "SELECT COUNT(*) FROM outbox WHERE sent_at IS NULL"
+            ).fetchone()
+        return pending
+
+    def _drain_forever(self, handler: OutboxHandler) -> None:
+        """Drain the outbox until it is closed, then close its connection.
+
+        Args:
+            handler (OutboxHandler): The function that sends a request to a target of a sink.
+        """
+        try:
+            while not self._stopped.is_set():
+                try:
+                    self.drain(handler)
+                except Exception as e:
+                    self.logger.error("Error draining the outbox, %s", e)
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        finally:
+            self._close_connection()
+
+    def _close_connection(self) -> None:
+        """Close the connection to the SQLite database."""
+        with self._lock:
+            self._connection.close()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the drainer thread once its current entry is sent, and close
+        the connection to the database.
+
+        A drainer that is still sending when the timeout expires closes the
+        connection itself once it stops.
+
+        Args:
+            timeout (Optional[float], optional): The number of seconds to wait for the drainer. Defaults to None.
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        if self._thread is None or not self._thread.is_alive():
+            self._close_connection()
+
+
+def _create_outbox(
+    config: HemeraConfig, handler: OutboxHandler
+) -> Optional[SqliteOutbox]:
+    """Create and start the outbox of a configuration.
+
+    Args:
+        config (HemeraConfig): The Hemera configuration.
+        handler (OutboxHandler): The function the drainer sends a request to a target of a sink with.
+
+    Returns:
+        Optional[SqliteOutbox]: The started outbox, or None when failed deliveries are not retried.
+    """
+    if config.outbox_backend == "sqlite":
+        return SqliteOutbox(
+            path=config.outbox_sqlite_path,
+            max_attempts=config.outbox_max_attempts,
+        ).start(handler)
+    return None
+
+
+_OUTBOXES: Dict[HemeraConfig, Optional[SqliteOutbox]] = {}
+_OUTBOXES_LOCK = Lock()
+
+
+def get_outbox(config: HemeraConfig, handler: OutboxHandler) -> Optional[SqliteOutbox]:
+    """Return the process-wide outbox for a configuration.
+
+    The outbox of a previous configuration is closed without waiting for
+    its drainer. The handler is only used to start the drainer of a new
+    outbox.
+
+    Args:
+        config (HemeraConfig): The Hemera configuration.
+        handler (OutboxHandler): The function the drainer sends a request to a target of a sink with.
+
+    Returns:
+        Optional[SqliteOutbox]: The started outbox, or None when failed deliveries are not retried.
+    """
+    with _OUTBOXES_LOCK:
+        if config not in _OUTBOXES:
+            for stale in _OUTBOXES.values():
+                if stale is not None:
+                    stale.close(timeout=0)
+            _OUTBOXES.clear()
+            _OUTBOXES[config] = _create_outbox(config, handler)
+        return _OUTBOXES[config]
+
+
+def close_outbox(timeout: Optional[float] = None) -> None:
+    """Close and forget the process-wide outbox.
+
+    Args:
+        timeout (Optional[float], optional): The number of seconds to wait for the drainer. Defaults to None.
+    """
+    with _OUTBOXES_LOCK:
+        for outbox in _OUTBOXES.values():
+            if outbox is not None:
+                outbox.close(timeout)
+        _OUTBOXES.clear()
@@ -0,0 +1,81 @@
+from json import loads
+from logging import Logger, getLogger
+from re import compile as re_compile
+from typing import Collection, Optional
+
+import azure.functions as func
+
+from hemera.exceptions import (
+    GithubEventNotSupportedError,
+    UnauthorizedUserError,
+    ValueNotFoundInHemeraHttpRequest,
+)
+
+LOGGER = getLogger(__name__)
+
+# Matches body["pull_request"]["user"]["login"] when "user" is the first object
+# nested in "pull_request", which is the order GitHub sends it in. Escaped quotes
+# inside string values can never match the unescaped key names.
+PULL_REQUEST_AUTHOR_PATTERN = re_compile(
+    rb'"pull_request"\s*:\s*\{[^{]*?"user"\s*:\s*\{\s*"login"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+
+
+def scan_pull_request_author(body: bytes) -> Optional[str]:
+    """Find the pull request author in a raw request body without decoding it.
+
+    Args:
+        body (bytes): The raw request body.
+
+    Returns:
+        Optional[str]: The pull request author, or None when it could not be found with certainty.
+    """
+    match = PULL_REQUEST_AUTHOR_PATTERN.search(body)
+    if match is None:
+        return None
+
+    try:
+        return loads(b'"' + match.group(1) + b'"')
+    except ValueError:
+        return None
+
+
+def prefilter_request(
+    req: func.HttpRequest,
+    pr_author_filter: str,
+    supported_events: Collection[str] = ("pull_request",),
+    logger: Logger = LOGGER,
+) -> None:
+    """Reject a request from its headers and raw body before it is decoded.
+
+    Requests the pre-filter cannot decide on are let through, the full checks
+    run again after decoding.
+
+    Args:
+        req (func.HttpRequest): The Azure Functions HTTP request.
+        pr_author_filter (str): The pull request author that may trigger automation.
+        supported_events (Collection[str], optional): The supported GitHub events. Defaults to ("pull_request",).
+        logger (Logger, optional): The logger. Defaults to LOGGER.
+
+    Raises:
+        ValueNotFoundInHemeraHttpRequest: When the GitHub event header is missing.
+        GithubEventNotSupportedError: When the GitHub event is not supported.
+        UnauthorizedUserError: When the pull request author is not whitelisted.
+    """
+    githubevent = req.headers.get("x-github-event")
+
+    if githubevent is None:
+        raise ValueNotFoundInHemeraHttpRequest
+
+    if githubevent not in supported_events:
+        raise GithubEventNotSupportedError
+
+    if githubevent != "pull_request":
+        return
+
+    username = scan_pull_request_author(req.get_body())
+
+    if username is None:
+        logger.debug("Pull request author not found by the pre-filter.")
+    elif username != pr_author_filter:
+        raise UnauthorizedUserError
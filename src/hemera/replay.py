@@ -0,0 +1,205 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+from logging import getLogger
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from hemera.config import get_config
+from hemera.dataclasses import HttpRequest
+from hemera.exceptions import GithubEventNotSupportedError, HemeraError
+from hemera.handlers import AutomationHandler
+from hemera.homeautomation import split_homeautomation_webhooks
+from hemera.router import get_event_router
+from hemera.serialization import loads
+
+LOGGER = getLogger(__name__)
+
+STAGES = ("decode", "filter", "render", "sink")
+
+ACCEPTED = "accepted"
+FILTERED = "filtered"
+FAILED = "failed"
+
+ReplayResult = Tuple[str, Dict[str, float]]
+
+
+@dataclass
+class ReplayReport:
+    """Dataclass for the outcome of a replay."""
+
+    events: int = 0
+    outcomes: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    stage_seconds: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    elapsed_seconds: float = 0.0
+
+    def add(self, result: ReplayResult) -> None:
+        """Add the result of a single delivery to the report.
+
+        Args:
+            result (ReplayResult): The outcome and stage timings of the delivery.
+        """
+        outcome, timings = result
+        self.events += 1
+        self.outcomes[outcome] += 1
+        for stage, seconds in timings.items():
+            self.stage_seconds[stage] += seconds
+
+    @property
+    def events_per_second(self) -> float:
+        """Return the number of deliveries replayed per second."""
+        if not self.elapsed_seconds:
+            return 0.0
+        return self.events / self.elapsed_seconds
+
+    def format(self) -> str:
+        """Format the report for humans.
+
+        Returns:
+            str: The formatted report.
+        """
+        lines = [
+            f"Events: {self.events} "
+            f"({', '.join(f'{self.outcomes[o]} {o}' for o in (ACCEPTED, FILTERED, FAILED))})",
+            f"Elapsed: {self.elapsed_seconds:.3f} s",
+            f"Throughput: {self.events_per_second:.1f} events/s",
+        ]
+        for stage in STAGES:
+            seconds = self.stage_seconds.get(stage, 0.0)
+            mean = seconds / self.events if self.events else 0.0
+            lines.append(
+                f"Stage {stage}: {seconds * 1000:.3f} ms total, "
+                f"{mean * 1000000:.1f} us/event"
+            )
+        return "\n".join(lines)
+
+
+def replay_delivery(
+    line: str,
+    pr_author_filter: Optional[str],
+    dry_run: bool,
+) -> ReplayResult:
+    """Push a single captured delivery through the pipeline.
+
+    Args:
+        line (str): A JSON record with the "header" and "body" of the delivery, header names are
+            case-insensitive.
+        pr_author_filter (Optional[str]): The author that may trigger automation, None to accept any author.
+        dry_run (bool): Render the message without sending it.
+
+    Returns:
+        ReplayResult: The outcome and stage timings of the delivery.
+    """
+    timings: Dict[str, float] = {}
+    start = perf_counter()
+
+    try:
+        router = get_event_router()
+        record = loads(line)
+        # Captured headers keep the case GitHub sent them with.
+        header = {key.lower(): value for key, value in record["header"].items()}
+        githubevent = header.get("x-github-event", "")
+        if githubevent not in router.events:
+            timings["filter"] = perf_counter() - start
+            return FILTERED, timings
+
+        hemera_http_request = router.plugin(githubevent).request_class(
+            req=HttpRequest(header=header, body=record["body"])
+        )
+        timings["decode"] = perf_counter() - start
+
+        start = perf_counter()
+        try:
+            route = router.route(hemera_http_request)
+            accepted = (
+                pr_author_filter is None
+                or hemera_http_request.username == pr_author_filter
+            )
+        except GithubEventNotSupportedError:
+            accepted = False
+        timings["filter"] = perf_counter() - start
+        if not accepted:
+            return FILTERED, timings
+
+        start = perf_counter()
+        message = route.render(hemera_http_request)
+        timings["render"] = perf_counter() - start
+
+        start = perf_counter()
+        if not dry_run:
+            config = get_config()
+            AutomationHandler(
+                slack_api_token=config.slack_api_token,
+                slack_channel=config.slack_channel,
+                homeautomation_webhook=split_homeautomation_webhooks(
+                    config.homeautomation_webhook
+                ),
+                message_renderer=route.render,
+            ).handle_request(hemera_http_request=hemera_http_request)
+        else:
+            LOGGER.debug("Dry run, not sending: %s", message)
+        timings["sink"] = perf_counter() - start
+    except (HemeraError, KeyError, ValueError) as e:
+        LOGGER.error("Error replaying delivery, %s", e)
+        return FAILED, timings
+
+    return ACCEPTED, timings
+
+
+def _batches(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split the non-empty lines of a stream into batches.
+
+    Args:
+        lines (Iterable[str]): The lines.
+        size (int): The maximum number of lines in a batch.
+
+    Yields:
+        Iterator[List[str]]: The batches.
+    """
+    iterator = (line for line in lines if line.strip())
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def replay(
+    stream: TextIO,
+    pr_author_filter: Optional[str] = None,
+    dry_run: bool = True,
+    workers: int = 1,
+    chunksize: int = 64,
+) -> ReplayReport:
+    """Replay a JSONL stream of captured deliveries.
+
+    Args:
+        stream (TextIO): The JSONL stream, one {"header": ..., "body": ...} record per line.
+        pr_author_filter (Optional[str], optional): The author that may trigger automation. Defaults to None.
+        dry_run (bool, optional): Render the messages without sending them. Defaults to True.
+        workers (int, optional): The number of worker processes, 1 replays in this process. Defaults to 1.
+        chunksize (int, optional): The number of deliveries sent to a worker at once. Defaults to 64.
+
+    Returns:
+        ReplayReport: The outcome of the replay.
+    """
+    report = ReplayReport()
+    replay_line = partial(
+        replay_delivery, pr_author_filter=pr_author_filter, dry_run=dry_run
+    )
+    start = perf_counter()
+
+    if workers <= 1:
+        for batch in _batches(stream, chunksize):
+            for line in batch:
+                report.add(replay_line(line))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch in _batches(stream, workers * chunksize * 4):
+                for result in executor.map(replay_line, batch, chunksize=chunksize):
+                    report.add(result)
+
+    report.elapsed_seconds = perf_counter() - start
+    return report
@@ -0,0 +1,218 @@
+from functools import lru_cache
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from hemera.dataclasses import HemeraConfig
+from hemera.events import Extractor, create_projection_extractor
+from hemera.exceptions import (
+    GithubEventNotSupportedError,
+    HemeraError,
+    UnauthorizedUserError,
+)
+from hemera.slack import (
+    create_issues_slack_message,
+    create_push_slack_message,
+    create_release_slack_message,
+    create_slack_message,
+    create_workflow_run_slack_message,
+)
+from hemera.types import (
+    GithubHttpRequest,
+    HemeraHttpRequest,
+    IssuesHttpRequest,
+    PushHttpRequest,
+    ReleaseHttpRequest,
+    WorkflowRunHttpRequest,
+)
+
+EventFilter = Callable[[GithubHttpRequest, HemeraConfig], None]
+MessageRenderer = Callable[[GithubHttpRequest], str]
+
+Request = TypeVar("Request", bound=GithubHttpRequest)
+
+
+def filter_author(github_http_request: GithubHttpRequest, config: HemeraConfig) -> None:
+    """Only accept events of the configured author.
+
+    Args:
+        github_http_request (GithubHttpRequest): The HTTP request of the event.
+        config (HemeraConfig): The Hemera configuration.
+
+    Raises:
+        UnauthorizedUserError: When the user is not whitelisted.
+    """
+    if github_http_request.username != config.pr_author_filter:
+        raise UnauthorizedUserError
+
+
+class EventPlugin(NamedTuple):
+    """The extractor of a GitHub event, used for every action."""
+
+    request_class: Type[GithubHttpRequest]
+    extract: Extractor
+
+
+class EventRoute(NamedTuple):
+    """The filter and message renderer of a GitHub event and action."""
+
+    accept: EventFilter
+    render: MessageRenderer
+
+
+class EventRouter:
+    """A dispatch table from GitHub events and actions to their plugins."""
+
+    def __init__(self):
+        """Initialize an instance of the EventRouter class."""
+        self._plugins: Dict[str, EventPlugin] = {}
+        self._routes: Dict[Tuple[str, Optional[str]], EventRoute] = {}
+
+    def register(
+        self,
+        githubevent: str,
+        request_class: Type[Request],
+        render: Callable[[Request], str],
+        accept: EventFilter = filter_author,
+        actions: Optional[Iterable[str]] = None,
+        extract: Optional[Extractor] = None,
+    ) -> "EventRouter":
+        """Register the plugins of a GitHub event.
+
+        Args:
+            githubevent (str): The value of the X-GitHub-Event header.
+            request_class (Type[Request]): The request class of the event.
+            render (Callable[[Request], str]): The function creating the message of a request of the class.
+            accept (EventFilter, optional): The function rejecting unwanted events. Defaults to filter_author.
+            actions (Optional[Iterable[str]], optional): The supported actions, None for every action. Defaults to None.
+            extract (Optional[Extractor], optional): The extractor, defaults to a projection of the request class.
+
+        Returns:
+            EventRouter: This router.
+        """
+        self._plugins[githubevent] = EventPlugin(
+            request_class=request_class,
+            extract=extract or create_projection_extractor(request_class),
+        )
+        # The route only renders requests extracted as the request class.
+        route = EventRoute(accept=accept, render=cast(MessageRenderer, render))
+        for action in actions if actions is not None else (None,):
+            self._routes[(githubevent, action)] = route
+        return self
+
+    @property
+    def events(self) -> Collection[str]:
+        """Return the supported GitHub events."""
+        return self._plugins.keys()
+
+    def plugin(self, githubevent: str) -> EventPlugin:
+        """Return the plugin of a GitHub event.
+
+        Args:
+            githubevent (str): The value of the X-GitHub-Event header.
+
+        Raises:
+            GithubEventNotSupportedError: When the GitHub event is not registered.
+
+        Returns:
+            EventPlugin: The plugin of the event.
+        """
+        try:
+            return self._plugins[githubevent]
+        except KeyError as e:
+            raise GithubEventNotSupportedError from e
+
+    def extract(self, header: Mapping[str, str], body: bytes) -> GithubHttpRequest:
+        """Extract the request of a delivery with the plugin of its event.
+
+        Args:
+            header (Mapping[str, str]): The headers of the delivery.
+            body (bytes): The raw JSON body.
+
+        Raises:
+            GithubEventNotSupportedError: When the GitHub event is not registered.
+
+        Returns:
+            GithubHttpRequest: The HTTP request of the event.
+        """
+        return self.plugin(header.get("x-github-event", "")).extract(header, body)
+
+    def route(self, github_http_request: GithubHttpRequest) -> EventRoute:
+        """Return the route of a decoded GitHub event.
+
+        Args:
+            github_http_request (GithubHttpRequest): The HTTP request of the event.
+
+        Raises:
+            GithubEventNotSupportedError: When the GitHub event or action is not registered.
+
+        Returns:
+            EventRoute: The route of the event.
+        """
+        githubevent = github_http_request.githubevent
+        try:
+            action = github_http_request.action
+        except HemeraError:
+            action = None
+
+        route = self._routes.get((githubevent, action)) or self._routes.get(
+            (githubevent, None)
+        )
+        if route is None:
+            raise GithubEventNotSupportedError
+        return route
+
+
+def create_event_router() -> EventRouter:
+    """Create the router of the GitHub events supported by Hemera.
+
+    Returns:
+        EventRouter: The event router.
+    """
+    return (
+        EventRouter()
+        .register(
+            "pull_request", request_class=HemeraHttpRequest, render=create_slack_message
+        )
+        .register(
+            "push", request_class=PushHttpRequest, render=create_push_slack_message
+        )
+        .register(
+            "issues",
+            request_class=IssuesHttpRequest,
+            render=create_issues_slack_message,
+            actions=("opened", "closed", "reopened"),
+        )
+        .register(
+            "release",
+            request_class=ReleaseHttpRequest,
+            render=create_release_slack_message,
+            actions=("published",),
+        )
+        .register(
+            "workflow_run",
+            request_class=WorkflowRunHttpRequest,
+            render=create_workflow_run_slack_message,
+            actions=("completed",),
+        )
+    )
+
+
+@lru_cache(maxsize=1)
+def get_event_router() -> EventRouter:
+    """Return the process-wide event router, built once.
+
+    Returns:
+        EventRouter: The event router.
+    """
+    return create_event_router()
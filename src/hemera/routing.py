@@ -0,0 +1,250 @@
+from fnmatch import translate
+from functools import lru_cache
+from re import compile as re_compile
+from typing import Any, Dict, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+from hemera.dataclasses import HemeraConfig
+from hemera.exceptions import HemeraError, RoutingRulesError
+from hemera.homeautomation import split_homeautomation_webhooks
+from hemera.serialization import loads
+from hemera.types import GithubHttpRequest
+
+GLOB_CHARACTERS = frozenset("*?[")
+
+
+class Destination(NamedTuple):
+    """The Slack channels and Home Automation webhooks of an event."""
+
+    slack_channels: Tuple[str, ...]
+    homeautomation_webhooks: Tuple[str, ...]
+
+
+class RoutingRule(NamedTuple):
+    """A rule sending the events of matching repositories and branches to a
+    destination.
+
+    A missing branch matches every branch, also events without one.
+    """
+
+    repository: str
+    branch: Optional[str]
+    destination: Destination
+
+
+def _is_glob(pattern: str) -> bool:
+    """Check whether a pattern contains glob characters.
+
+    Args:
+        pattern (str): The pattern.
+
+    Returns:
+        bool: True when the pattern is a glob.
+    """
+    return not GLOB_CHARACTERS.isdisjoint(pattern)
+
+
+def _compile_glob(pattern: Optional[str]) -> Optional[Pattern[str]]:
+    """Compile a case-sensitive glob into a regular expression.
+
+    Args:
+        pattern (Optional[str]): The glob, None to match anything.
+
+    Returns:
+        Optional[Pattern[str]]: The regular expression, None to match anything.
+    """
+    return re_compile(translate(pattern)) if pattern is not None else None
+
+
+class RoutingIndex:
+    """An index from repositories and branches to destinations.
+
+    Rules without glob characters are looked up in a dict, the others are
+    matched in order. Every matching rule adds its destination. An event gets
+    the default Slack channels or Home Automation webhooks when its matching
+    rules name none, so events that match no rule go to the default
+    destination.
+    """
+
+    def __init__(self, rules: Sequence[RoutingRule], default: Destination):
+        """Initialize an instance of the RoutingIndex class.
+
+        Args:
+            rules (Sequence[RoutingRule]): The rules, in order.
+            default (Destination): The destination of events that match no rule.
+        """
+        self.default = default
+        self._exact: Dict[Tuple[str, Optional[str]], List[Tuple[int, Destination]]] = {}
+        self._globs: List[
+            Tuple[int, Pattern[str], Optional[Pattern[str]], Destination]
+        ] = []
+
+        for position, rule in enumerate(rules):
+            if _is_glob(rule.repository) or (
+                rule.branch is not None and _is_glob(rule.branch)
+            ):
+                self._globs.append(
+                    (
+                        position,
+                        re_compile(translate(rule.repository)),
+                        _compile_glob(rule.branch),
+                        rule.destination,
+                    )
+                )
+            else:
+                self._exact.setdefault((rule.repository, rule.branch), []).append(
+                    (position, rule.destination)
+                )
+
+        self.resolve = lru_cache(maxsize=1024)(self._resolve)
+
+    def _resolve(self, repository: str, branch: Optional[str]) -> Destination:
+        """Find the destination of a repository and branch.
+
+        Args:
+            repository (str): The full name of the repository.
+            branch (Optional[str]): The branch, None when the event has none.
+
+        Returns:
+            Destination: The combined destinations of the matching rules in rule order, with the
+                default targets of a sink the rules name none for.
+        """
+        matches = list(self._exact.get((repository, None), ()))
+        if branch is not None:
+            matches.extend(self._exact.get((repository, branch), ()))
+
+        for position, repository_pattern, branch_pattern, destination in self._globs:
+            if not repository_pattern.match(repository):
+                continue
+            if branch_pattern is not None and (
+                branch is None or not branch_pattern.match(branch)
+            ):
+                continue
+            matches.append((position, destination))
+
+        if not matches:
+            return self.default
+
+        matches.sort(key=lambda match: match[0])
+        slack_channels = tuple(
+            dict.fromkeys(
+                channel
+                for _, destination in matches
+                for channel in destination.slack_channels
+            )
+        )
+        homeautomation_webhooks = tuple(
+            dict.fromkeys(
+                webhook
+                for _, destination in matches
+                for webhook in destination.homeautomation_webhooks
+            )
+        )
+        return Destination(
+            slack_channels=slack_channels or self.default.slack_channels,
+            homeautomation_webhooks=homeautomation_webhooks
+            or self.default.homeautomation_webhooks,
+        )
+
+    def route(self, github_http_request: GithubHttpRequest) -> Destination:
+        """Find the destination of a GitHub event.
+
+        Args:
+            github_http_request (GithubHttpRequest): The HTTP request of the event.
+
+        Returns:
+            Destination: The destination of the event.
+        """
+        try:
+            repository = github_http_request.repository
+        except HemeraError:
+            return self.default
+
+        try:
+            branch = github_http_request.branch
+        except HemeraError:
+            branch = None
+
+        return self.resolve(repository, branch)
+
+
+def _get_targets(rule: Dict[str, Any], key: str) -> Tuple[str, ...]:
+    """Return the targets of a rule, a string or a list of strings.
+
+    Args:
+        rule (Dict[str, Any]): The decoded rule.
+        key (str): The key of the targets.
+
+    Raises:
+        TypeError: When the targets are not strings.
+
+    Returns:
+        Tuple[str, ...]: The targets.
+    """
+    targets = rule.get(key, ())
+    if isinstance(targets, str):
+        targets = (targets,)
+    if not all(isinstance(target, str) for target in targets):
+        raise TypeError(key)
+    return tuple(targets)
+
+
+def load_routing_rules(path: str) -> List[RoutingRule]:
+    """Load the routing rules from a JSON file.
+
+    The file holds a list of rules, each with a "repository" glob, an optional
+    "branch" glob and the "slack_channels" and "homeautomation_webhooks" to
+    send matching events to.
+
+    Args:
+        path (str): The path of the JSON file.
+
+    Raises:
+        RoutingRulesError: When the file or a rule is invalid.
+
+    Returns:
+        List[RoutingRule]: The rules, in order.
+    """
+    try:
+        with open(path, "rb") as file:
+            definitions = loads(file.read())
+
+        return [
+            RoutingRule(
+                repository=str(rule["repository"]),
+                branch=str(rule["branch"]) if rule.get("branch") else None,
+                destination=Destination(
+                    slack_channels=_get_targets(rule, "slack_channels"),
+                    homeautomation_webhooks=_get_targets(
+                        rule, "homeautomation_webhooks"
+                    ),
+                ),
+            )
+            for rule in definitions
+        ]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise RoutingRulesError(path=path) from e
+
+
+@lru_cache(maxsize=1)
+def get_routing_index(config: HemeraConfig) -> RoutingIndex:
+    """Return the process-wide routing index for a configuration.
+
+    Args:
+        config (HemeraConfig): The Hemera configuration.
+
+    Raises:
+        RoutingRulesError: When the routing rules are invalid.
+
+    Returns:
+        RoutingIndex: The routing index, sending every event to the configured channel and webhook without rules.
+    """
+    rules = load_routing_rules(config.routing_rules) if config.routing_rules else []
+    return RoutingIndex(
+        rules=rules,
+        default=Destination(
+            slack_channels=(config.slack_channel,),
+            homeautomation_webhooks=split_homeautomation_webhooks(
+                config.homeautomation_webhook
+            ),
+        ),
+    )
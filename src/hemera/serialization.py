@@ -0,0 +1,41 @@
+import json
+from typing import Any, Callable, Union
+
+# orjson is installed with the "fast-json" extra, the backend is selected once.
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _stdlib_loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document with the standard library.
+
+    Args:
+        data (Union[bytes, str]): The JSON document.
+
+    Returns:
+        Any: The decoded value.
+    """
+    return json.loads(data)
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON with the standard library.
+
+    Args:
+        value (Any): The value to encode.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+loads: Callable[[Union[bytes, str]], Any] = (
+    orjson.loads if orjson is not None else _stdlib_loads
+)
+
+dumps: Callable[[Any], bytes] = orjson.dumps if orjson is not None else _stdlib_dumps
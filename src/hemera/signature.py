@@ -0,0 +1,54 @@
+from hashlib import sha256
+from hmac import compare_digest
+from hmac import new as hmac_new
+from typing import Optional
+
+import azure.functions as func
+
+from hemera.exceptions import SignatureVerificationError
+
+SIGNATURE_HEADER = "x-hub-signature-256"
+SIGNATURE_PREFIX = "sha256="
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: bytes) -> None:
+    """Verify the HMAC-SHA256 signature GitHub sends with a delivery.
+
+    Args:
+        body (bytes): The raw request body.
+        signature (Optional[str]): The value of the X-Hub-Signature-256 header.
+        secret (bytes): The webhook secret.
+
+    Raises:
+        SignatureVerificationError: When the signature is missing or does not match.
+    """
+    if not signature:
+        raise SignatureVerificationError
+
+    expected = SIGNATURE_PREFIX + hmac_new(secret, body, sha256).hexdigest()
+
+    if not compare_digest(expected.encode("utf-8"), signature.encode("utf-8")):
+        raise SignatureVerificationError
+
+
+def verify_request_signature(req: func.HttpRequest, secret: bytes) -> None:
+    """Verify the signature of an Azure Functions HTTP request before its body
+    is decoded.
+
+    Verification is skipped when no secret is configured.
+
+    Args:
+        req (func.HttpRequest): The Azure Functions HTTP request.
+        secret (bytes): The webhook secret.
+
+    Raises:
+        SignatureVerificationError: When the signature is missing or does not match.
+    """
+    if not secret:
+        return
+
+    verify_signature(
+        body=req.get_body(),
+        signature=req.headers.get(SIGNATURE_HEADER),
+        secret=secret,
+    )
@@ -0,0 +1,402 @@
+from asyncio import gather, get_running_loop
+from asyncio import sleep as async_sleep
+from concurrent.futures import Executor, ThreadPoolExecutor
+from logging import Logger, getLogger
+from operator import methodcaller
+from threading import BoundedSemaphore, Lock
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from hemera.dataclasses import SinkOutcome, SinkReport
+from hemera.deadline import Deadline
+from hemera.exceptions import BulkheadFullError, SinkNotFoundError
+
+LOGGER = getLogger(__name__)
+
+SINK_WORKERS = 8
+SINK_MAX_CONCURRENCY = 4
+SINK_BULKHEAD_TIMEOUT = 5.0
+SINK_BULKHEAD_POLL_INTERVAL = 0.01
+
+SLACK_SINK = "slack"
+HOMEAUTOMATION_SINK = "homeautomation"
+
+SinkFunction = Callable[[Any], None]
+AsyncSinkFunction = Callable[[Any], Awaitable[None]]
+
+
+class Sink(NamedTuple):
+    """A destination of a delivery, with its bulkhead."""
+
+    name: str
+    send: SinkFunction
+    send_async: Optional[AsyncSinkFunction]
+    max_concurrency: int
+    bulkhead: BoundedSemaphore
+
+
+class SinkRegistry:
+    """Registry of the sinks a delivery is sent to.
+
+    Every sink runs on a shared executor. A sink may only run a bounded
+    number of deliveries at once; a delivery finding its bulkhead full waits
+    a bounded time for it, without taking a worker another sink needs, and
+    fails for that sink when it stays full.
+    """
+
+    def __init__(
+        self,
+        bulkhead_timeout: float = SINK_BULKHEAD_TIMEOUT,
+        logger: Logger = LOGGER,
+    ):
+        """Initialize an instance of the SinkRegistry class.
+
+        Args:
+            bulkhead_timeout (float, optional): The number of seconds a delivery waits for a full bulkhead.
+                Defaults to SINK_BULKHEAD_TIMEOUT.
+            logger (Logger, optional): The logger. Defaults to LOGGER.
+        """
+        self.bulkhead_timeout = bulkhead_timeout
+        self.logger = logger
+        self._sinks: Dict[str, Sink] = {}
+
+    def register(
+        self,
+        name: str,
+        send: SinkFunction,
+        max_concurrency: int = SINK_MAX_CONCURRENCY,
+        send_async: Optional[AsyncSinkFunction] = None,
+    ) -> "SinkRegistry":
+        """Register a sink.
+
+        A sink registered again with the same concurrency keeps its bulkhead,
+        so deliveries in flight still count against it.
+
+        Args:
+            name (str): The name of the sink.
+            send (SinkFunction): The function sending a delivery, raising an error when it fails.
+            max_concurrency (int, optional): The number of deliveries the sink may send at once.
+                Defaults to SINK_MAX_CONCURRENCY.
+            send_async (Optional[AsyncSinkFunction], optional): The coroutine function sending a delivery
+                without blocking, send runs on the executor without it. Defaults to None.
+
+        Returns:
+            SinkRegistry: This registry, to chain registrations.
+        """
+        registered = self._sinks.get(name)
+        self._sinks[name] = Sink(
+            name=name,
+            send=send,
+            send_async=send_async,
+            max_concurrency=max_concurrency,
+            bulkhead=(
+                registered.bulkhead
+                if registered is not None
+                and registered.max_concurrency == max_concurrency
+                else BoundedSemaphore(max_concurrency)
+            ),
+        )
+        return self
+
+    @property
+    def sinks(self) -> Tuple[str, ...]:
+        """The names of the registered sinks, in registration order."""
+        return tuple(self._sinks)
+
+    def send(self, name: str, delivery: Any) -> None:
+        """Send a delivery to one sink on the calling thread, waiting for its
+        bulkhead.
+
+        Args:
+            name (str): The name of the sink.
+            delivery (Any): The delivery.
+
+        Raises:
+            SinkNotFoundError: When no sink has the name.
+        """
+        sink = self._sinks.get(name)
+        if sink is None:
+            raise SinkNotFoundError(name)
+        with sink.bulkhead:
+            sink.send(delivery)
+
+    def _wait_budget(self, deadline: Optional[Deadline]) -> Deadline:
+        """Return the time deliveries may wait for full bulkheads.
+
+        Args:
+            deadline (Optional[Deadline]): The deadline of the delivery.
+
+        Returns:
+            Deadline: The bulkhead timeout, at most the remaining budget.
+        """
+        if deadline is None:
+            return Deadline(self.bulkhead_timeout)
+        return Deadline(min(self.bulkhead_timeout, deadline.remaining()))
+
+    def _saturated(self, sink: Sink) -> SinkOutcome:
+        """Return the outcome of a sink whose bulkhead stayed full.
+
+        Args:
+            sink (Sink): The sink.
+
+        Returns:
+            SinkOutcome: The failed outcome.
+        """
+        self.logger.warning("Sink %s is saturated.", sink.name)
+        return SinkOutcome(
+            sink=sink.name, latency=0.0, error=BulkheadFullError(sink.name)
+        )
+
+    @staticmethod
+    def _run(sink: Sink, delivery: Any) -> SinkOutcome:
+        """Send a delivery to a sink holding its bulkhead and measure it.
+
+        Args:
+            sink (Sink): The sink.
+            delivery (Any): The delivery.
+
+        Returns:
+            SinkOutcome: The outcome of the sink.
+        """
+        started = perf_counter()
+        try:
+            sink.send(delivery)
+        except Exception as e:
+            return SinkOutcome(
+                sink=sink.name, latency=perf_counter() - started, error=e
+            )
+        finally:
+            sink.bulkhead.release()
+        return SinkOutcome(sink=sink.name, latency=perf_counter() - started)
+
+    def _submit(self, executor: Executor, sink: Sink, delivery: Any) -> Any:
+        """Run a sink holding its bulkhead on the executor.
+
+        Args:
+            executor (Executor): The executor.
+            sink (Sink): The sink.
+            delivery (Any): The delivery.
+
+        Returns:
+            Future[SinkOutcome]: The future outcome of the sink.
+        """
+        try:
+            return executor.submit(self._run, sink, delivery)
+        except Exception:
+            sink.bulkhead.release()
+            raise
+
+    def dispatch(
+        self,
+        delivery: Any,
+        executor: Optional[Executor] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> SinkReport:
+        """Send a delivery to every sink concurrently.
+
+        Sinks with a free bulkhead are started first, then the calling thread
+        waits for the full bulkheads.
+
+        Args:
+            delivery (Any): The delivery, passed to the function of every sink.
+            executor (Optional[Executor], optional): The executor, defaults to the shared executor.
+            deadline (Optional[Deadline], optional): The deadline of the delivery, full bulkheads are not
+                waited for past it. Defaults to None.
+
+        Returns:
+            SinkReport: The outcome of every sink, in registration order.
+        """
+        executor = executor or get_sink_executor()
+        pending: Dict[str, Any] = {}
+        saturated: List[Sink] = []
+        for sink in self._sinks.values():
+            if sink.bulkhead.acquire(blocking=False):
+                pending[sink.name] = self._submit(executor, sink, delivery)
+            else:
+                saturated.append(sink)
+
+        wait_budget = self._wait_budget(deadline)
+        for sink in saturated:
+            if sink.bulkhead.acquire(timeout=wait_budget.remaining()):
+                pending[sink.name] = self._submit(executor, sink, delivery)
+            else:
+                pending[sink.name] = self._saturated(sink)
+
+        return SinkReport(
+            outcomes=tuple(
+                outcome if isinstance(outcome, SinkOutcome) else outcome.result()
+                for outcome in (pending[name] for name in self._sinks)
+            )
+        )
+
+    async def _acquire_async(self, sink: Sink, wait_budget: Deadline) -> bool:
+        """Wait for the bulkhead of a sink without blocking the event loop.
+
+        Args:
+            sink (Sink): The sink.
+            wait_budget (Deadline): The time left to wait.
+
+        Returns:
+            bool: Whether the bulkhead was acquired.
+        """
+        while not sink.bulkhead.acquire(blocking=False):
+            if wait_budget.expired:
+                return False
+            await async_sleep(min(SINK_BULKHEAD_POLL_INTERVAL, wait_budget.remaining()))
+        return True
+
+    async def _run_async(
+        self,
+        sink: Sink,
+        delivery: Any,
+        executor: Optional[Executor],
+        wait_budget: Deadline,
+    ) -> SinkOutcome:
+        """Send a delivery to a sink without blocking the event loop, holding
+        its bulkhead, and measure it.
+
+        Args:
+            sink (Sink): The sink.
+            delivery (Any): The delivery.
+            executor (Optional[Executor]): The executor of sinks without a coroutine function.
+            wait_budget (Deadline): The time left to wait for the bulkhead.
+
+        Returns:
+            SinkOutcome: The outcome of the sink.
+        """
+        if not await self._acquire_async(sink, wait_budget):
+            return self._saturated(sink)
+        started = perf_counter()
+        try:
+            if sink.send_async is None:
+                await get_running_loop().run_in_executor(
+                    executor or get_sink_executor(), sink.send, delivery
+                )
+            else:
+                await sink.send_async(delivery)
+        except Exception as e:
+            return SinkOutcome(
+                sink=sink.name, latency=perf_counter() - started, error=e
+            )
+        finally:
+            sink.bulkhead.release()
+        return SinkOutcome(sink=sink.name, latency=perf_counter() - started)
+
+    async def dispatch_async(
+        self,
+        delivery: Any,
+        executor: Optional[Executor] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> SinkReport:
+        """Send a delivery to every sink concurrently without blocking the
+        event loop.
+
+        Args:
+            delivery (Any): The delivery, passed to the function of every sink.
+            executor (Optional[Executor], optional): The executor of sinks without a coroutine function,
+                defaults to the shared executor.
+            deadline (Optional[Deadline], optional): The deadline of the delivery, full bulkheads are not
+                waited for past it. Defaults to None.
+
+        Returns:
+            SinkReport: The outcome of every sink, in registration order.
+        """
+        wait_budget = self._wait_budget(deadline)
+        outcomes = await gather(
+            *(
+                self._run_async(sink, delivery, executor, wait_budget)
+                for sink in self._sinks.values()
+            )
+        )
+        return SinkReport(outcomes=tuple(outcomes))
+
+
+_SINK_EXECUTORS: Dict[int, Executor] = {}
+_SINK_EXECUTORS_LOCK = Lock()
+
+
+def get_sink_executor(max_workers: Optional[int] = None) -> Executor:
+    """Return the process-wide executor running the sinks.
+
+    The executor of a previous number of workers is shut down without
+    waiting for the sinks it runs.
+
+    Args:
+        max_workers (Optional[int], optional): The number of worker threads, defaults to the number of
+            the current executor or SINK_WORKERS.
+
+    Returns:
+        Executor: The executor.
+    """
+    with _SINK_EXECUTORS_LOCK:
+        if max_workers is None:
+            max_workers = next(iter(_SINK_EXECUTORS), SINK_WORKERS)
+        if max_workers not in _SINK_EXECUTORS:
+            for stale in _SINK_EXECUTORS.values():
+                stale.shutdown(wait=False)
+            _SINK_EXECUTORS.clear()
+            _SINK_EXECUTORS[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="hemera-sink"
+            )
+        return _SINK_EXECUTORS[max_workers]
+
+
+SINK_REGISTRY = SinkRegistry()
+
+
+def register_builtin_sinks(
+    max_concurrency: int = SINK_MAX_CONCURRENCY,
+    registry: SinkRegistry = SINK_REGISTRY,
+) -> SinkRegistry:
+    """Register the built-in sinks.
+
+    The built-in sinks send the message of an AutomationHandler to its Slack
+    channels and Home Automation webhooks.
+
+    Args:
+        max_concurrency (int, optional): The number of deliveries each sink may send at once.
+            Defaults to SINK_MAX_CONCURRENCY.
+        registry (SinkRegistry, optional): The sink registry. Defaults to the process-wide SINK_REGISTRY.
+
+    Returns:
+        SinkRegistry: The sink registry.
+    """
+    return registry.register(
+        SLACK_SINK,
+        methodcaller("_send_slack_message"),
+        max_concurrency=max_concurrency,
+        send_async=methodcaller("_send_slack_message_async"),
+    ).register(
+        HOMEAUTOMATION_SINK,
+        methodcaller("_send_request_to_homeautomation_webhook"),
+        max_concurrency=max_concurrency,
+        send_async=methodcaller("_send_request_to_homeautomation_webhook_async"),
+    )
+
+
+_SINK_REGISTRIES: Dict[int, SinkRegistry] = {
+    SINK_MAX_CONCURRENCY: register_builtin_sinks()
+}
+_SINK_REGISTRIES_LOCK = Lock()
+
+
+def get_sink_registry(max_concurrency: int = SINK_MAX_CONCURRENCY) -> SinkRegistry:
+    """Return the process-wide sink registry with the built-in sinks.
+
+    The built-in sinks are only registered again when the number of
+    deliveries each sink may send at once changes.
+
+    Args:
+        max_concurrency (int, optional): The number of deliveries each sink may send at once.
+            Defaults to SINK_MAX_CONCURRENCY.
+
+    Returns:
+        SinkRegistry: The process-wide SINK_REGISTRY.
+    """
+    with _SINK_REGISTRIES_LOCK:
+        if max_concurrency not in _SINK_REGISTRIES:
+            _SINK_REGISTRIES.clear()
+            _SINK_REGISTRIES[max_concurrency] = register_builtin_sinks(
+                max_concurrency=max_concurrency
+            )
+        return _SINK_REGISTRIES[max_concurrency]
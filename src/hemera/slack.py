@@ -1,13 +1,396 @@
+from asyncio import AbstractEventLoop, get_running_loop
+from asyncio import sleep as async_sleep
+from collections import OrderedDict
+from copy import copy
 from logging import getLogger
+from ssl import SSLContext, create_default_context
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+from weakref import WeakKeyDictionary
 
+from aiohttp import ClientSession, TCPConnector
 from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError as SlackSdkApiError
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
 from slack_sdk.web.slack_response import SlackResponse
 
-from hemera.exceptions import SlackApiError, ValueNotFoundInHemeraHttpRequest
-from hemera.types import HemeraHttpRequest
+from hemera.circuitbreaker import get_circuit_breaker
+from hemera.dataclasses import SlackRateLimiterStats
+from hemera.deadline import Deadline
+from hemera.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    SlackApiError,
+    ValueNotFoundInHemeraHttpRequest,
+)
+from hemera.types import (
+    HemeraHttpRequest,
+    IssuesHttpRequest,
+    PushHttpRequest,
+    ReleaseHttpRequest,
+    WorkflowRunHttpRequest,
+)
 
 LOGGER = getLogger(__name__)
 
+SLACK_CLIENT_IDLE_TIMEOUT = 300.0
+SLACK_TIMEOUT = 30
+
+# Slack allows about one message per second per channel, with short bursts.
+SLACK_MESSAGES_PER_SECOND = 1.0
+SLACK_MESSAGE_BURST = 1
+SLACK_RATE_LIMITED_RETRIES = 3
+
+SLACK_CIRCUIT_BREAKER = "slack"
+
+Client = TypeVar("Client")
+SlackClient = TypeVar("SlackClient", WebClient, AsyncWebClient)
+
+
+class SlackClientPool(Generic[Client]):
+    """A thread-safe, process-wide cache of Slack clients keyed by token,
+    evicting clients that were not used for a while."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[str], Client],
+        idle_timeout: float,
+        clock: Callable[[], float] = monotonic,
+    ):
+        """Initialize an instance of the SlackClientPool class.
+
+        Args:
+            client_factory (Callable[[str], Client]): The function creating a client for a token.
+            idle_timeout (float): The number of seconds an unused client is kept.
+            clock (Callable[[], float], optional): The clock. Defaults to monotonic.
+        """
+        self.client_factory = client_factory
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self._clients: "OrderedDict[str, Tuple[Client, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, token: str) -> Client:
+        """Return the client of a token, creating it when it is not cached.
+
+        Args:
+            token (str): The Slack API token.
+
+        Returns:
+            Client: The Slack client.
+        """
+        now = self.clock()
+        with self._lock:
+            # Clients are moved to the end when used, so the first is the idlest.
+            while self._clients:
+                oldest, (_, last_used) = next(iter(self._clients.items()))
+                if now - last_used < self.idle_timeout:
+                    break
+                del self._clients[oldest]
+
+            entry = self._clients.pop(token, None)
+            client = entry[0] if entry is not None else self.client_factory(token)
+            self._clients[token] = (client, now)
+            return client
+
+    def clear(self) -> None:
+        """Forget every cached client."""
+        with self._lock:
+            self._clients.clear()
+
+
+# Loading the CA certificates is the expensive part of a TLS handshake setup,
+# so a single context is shared by every client.
+SSL_CONTEXT: SSLContext = create_default_context()
+
+_SLACK_SESSIONS: "WeakKeyDictionary[AbstractEventLoop, ClientSession]" = (
+    WeakKeyDictionary()
+)
+_SLACK_SESSIONS_LOCK = Lock()
+
+
+def get_slack_session() -> ClientSession:
+    """Return the aiohttp session of the running event loop.
+
+    An aiohttp session is bound to the event loop it was created on, so every
+    loop gets its own. The session keeps its connections to Slack alive
+    between deliveries.
+
+    Returns:
+        ClientSession: The session, created on first use.
+    """
+    loop = get_running_loop()
+    with _SLACK_SESSIONS_LOCK:
+        session = _SLACK_SESSIONS.get(loop)
+        if session is None or session.closed:
+            session = _SLACK_SESSIONS[loop] = ClientSession(
+                connector=TCPConnector(ssl=SSL_CONTEXT)
+            )
+        return session
+
+
+async def close_slack_session() -> None:
+    """Close the aiohttp session of the running event loop."""
+    with _SLACK_SESSIONS_LOCK:
+        session = _SLACK_SESSIONS.pop(get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+class _ChannelBucket:
+    """The token bucket of a single Slack channel.
+
+    Tokens are only added after refilled_at, which lies in the future while
+    the channel is blocked.
+    """
+
+    __slots__ = ("tokens", "refilled_at")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.refilled_at = now
+
+    def refill(self, now: float, rate: float, burst: int) -> None:
+        """Add the tokens earned since the last refill."""
+        if now > self.refilled_at:
+            self.tokens = min(burst, self.tokens + (now - self.refilled_at) * rate)
+            self.refilled_at = now
+
+
+class SlackRateLimiter:
+    """Paces Slack messages with a token bucket per channel.
+
+    Senders reserve a slot and wait for it instead of failing, so a burst of
+    messages to one channel is spread out while other channels are not
+    delayed. A rate limited response blocks the channel for its Retry-After.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = monotonic,
+        sleep: Callable[[float], None] = sleep,
+    ):
+        """Initialize an instance of the SlackRateLimiter class.
+
+        Args:
+            rate (float): The number of messages per second per channel.
+            burst (int): The number of messages a channel may send at once.
+            clock (Callable[[], float], optional): The clock. Defaults to monotonic.
+            sleep (Callable[[float], None], optional): The function to wait with. Defaults to sleep.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets: Dict[str, _ChannelBucket] = {}
+        self._lock = Lock()
+        self._queue_depth = 0
+        self._throttled_seconds = 0.0
+        self._rate_limited = 0
+
+    def _get_bucket(self, channel: str, now: float) -> _ChannelBucket:
+        """Return the refilled bucket of a channel, the lock must be held.
+
+        Args:
+            channel (str): The Slack channel.
+            now (float): The current time.
+
+        Returns:
+            _ChannelBucket: The bucket of the channel.
+        """
+        bucket = self._buckets.get(channel)
+        if bucket is None:
+            bucket = self._buckets[channel] = _ChannelBucket(self.burst, now)
+        else:
+            bucket.refill(now, self.rate, self.burst)
+        return bucket
+
+    def _reserve(self, channel: str) -> float:
+        """Reserve the next slot of a channel.
+
+        Args:
+            channel (str): The Slack channel.
+
+        Returns:
+            float: The number of seconds to wait for the slot.
+        """
+        now = self.clock()
+        with self._lock:
+            bucket = self._get_bucket(channel, now)
+
+            # Tokens may go negative, every queued sender owes one token.
+            bucket.tokens -= 1
+            delay = max(bucket.refilled_at - now, 0.0) + max(
+                -bucket.tokens / self.rate, 0.0
+            )
+            if delay:
+                self._queue_depth += 1
+                self._throttled_seconds += delay
+            return delay
+
+    def _cancel(self, channel: str, delay: float) -> None:
+        """Give back a reserved slot that will not be used.
+
+        Args:
+            channel (str): The Slack channel.
+            delay (float): The number of seconds the slot was away.
+        """
+        now = self.clock()
+        with self._lock:
+            bucket = self._get_bucket(channel, now)
+            bucket.tokens = min(bucket.tokens + 1, self.burst)
+            self._throttled_seconds -= delay
+
+    def _reserve_within(self, channel: str, timeout: Optional[float]) -> float:
+        """Reserve the next slot of a channel that is reached in time.
+
+        Args:
+            channel (str): The Slack channel.
+            timeout (Optional[float]): The maximum number of seconds to wait, None to wait as long as needed.
+
+        Raises:
+            DeadlineExceededError: When the slot is not reached in time.
+
+        Returns:
+            float: The number of seconds to wait for the slot.
+        """
+        delay = self._reserve(channel)
+        if timeout is not None and delay >= timeout:
+            self._cancel(channel, delay)
+            self._release(delay)
+            raise DeadlineExceededError
+        return delay
+
+    def _release(self, delay: float) -> None:
+        """Mark a reserved slot as reached.
+
+        Args:
+            delay (float): The number of seconds waited for the slot.
+        """
+        if delay:
+            with self._lock:
+                self._queue_depth -= 1
+
+    def acquire(self, channel: str, timeout: Optional[float] = None) -> None:
+        """Wait until a message may be sent to a channel.
+
+        Args:
+            channel (str): The Slack channel.
+            timeout (Optional[float], optional): The maximum number of seconds to wait. Defaults to None.
+
+        Raises:
+            DeadlineExceededError: When the message may not be sent within the timeout.
+        """
+        delay = self._reserve_within(channel, timeout)
+        try:
+            if delay:
+                LOGGER.debug(
+                    "Throttling Slack message to %s for %.3f s.", channel, delay
+                )
+                self.sleep(delay)
+        finally:
+            self._release(delay)
+
+    async def acquire_async(
+        self, channel: str, timeout: Optional[float] = None
+    ) -> None:
+        """Wait until a message may be sent to a channel without blocking the
+        event loop.
+
+        Args:
+            channel (str): The Slack channel.
+            timeout (Optional[float], optional): The maximum number of seconds to wait. Defaults to None.
+
+        Raises:
+            DeadlineExceededError: When the message may not be sent within the timeout.
+        """
+        delay = self._reserve_within(channel, timeout)
+        try:
+            if delay:
+                LOGGER.debug(
+                    "Throttling Slack message to %s for %.3f s.", channel, delay
+                )
+                await async_sleep(delay)
+        finally:
+            self._release(delay)
+
+    def block(self, channel: str, retry_after: float) -> None:
+        """Block a channel after Slack rate limited it.
+
+        Args:
+            channel (str): The Slack channel.
+            retry_after (float): The number of seconds Slack asked to wait.
+        """
+        now = self.clock()
+        with self._lock:
+            self._rate_limited += 1
+            bucket = self._get_bucket(channel, now)
+            # A single message may be sent once the channel is unblocked.
+            bucket.tokens = min(bucket.tokens, 1.0)
+            bucket.refilled_at = max(bucket.refilled_at, now + retry_after)
+
+    def stats(self) -> SlackRateLimiterStats:
+        """Return the statistics of this rate limiter.
+
+        Returns:
+            SlackRateLimiterStats: The number of waiting senders, the total seconds
+                they were throttled and the number of rate limited responses.
+        """
+        with self._lock:
+            return SlackRateLimiterStats(
+                queue_depth=self._queue_depth,
+                throttled_seconds=self._throttled_seconds,
+                rate_limited=self._rate_limited,
+            )
+
+    def clear(self) -> None:
+        """Forget the state of every channel."""
+        with self._lock:
+            self._buckets.clear()
+
+
+def _get_retry_after(error: SlackSdkApiError) -> Optional[float]:
+    """Return the Retry-After of a rate limited Slack response.
+
+    Args:
+        error (SlackSdkApiError): The Slack SDK error.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, None when the response was not rate limited.
+    """
+    response = error.response
+    if getattr(response, "status_code", None) != 429:
+        return None
+
+    headers = {key.lower(): value for key, value in (response.headers or {}).items()}
+    try:
+        return float(headers.get("retry-after", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+SLACK_RATE_LIMITER = SlackRateLimiter(
+    rate=SLACK_MESSAGES_PER_SECOND, burst=SLACK_MESSAGE_BURST
+)
+
+SLACK_CLIENTS: SlackClientPool[WebClient] = SlackClientPool(
+    client_factory=lambda token: WebClient(
+        token=token, ssl=SSL_CONTEXT, timeout=SLACK_TIMEOUT
+    ),
+    idle_timeout=SLACK_CLIENT_IDLE_TIMEOUT,
+)
+
+ASYNC_SLACK_CLIENTS: SlackClientPool[AsyncWebClient] = SlackClientPool(
+    client_factory=lambda token: AsyncWebClient(
+        token=token, ssl=SSL_CONTEXT, timeout=SLACK_TIMEOUT
+    ),
+    idle_timeout=SLACK_CLIENT_IDLE_TIMEOUT,
+)
+
 
 def create_slack_message(hemera_http_request: HemeraHttpRequest) -> str:
     """Create a Slack message from the HemeraHttpRequest.
@@ -35,27 +418,261 @@ def create_slack_message(hemera_http_request: HemeraHttpRequest) -> str:
         raise ValueNotFoundInHemeraHttpRequest from e
 
 
+def create_push_slack_message(push_http_request: PushHttpRequest) -> str:
+    """Create a Slack message from a GitHub push event.
+
+    Args:
+        push_http_request (PushHttpRequest): The HTTP request of the push event.
+
+    Raises:
+        ValueNotFoundInHemeraHttpRequest: When a value is not found in the PushHttpRequest.
+
+    Returns:
+        str: The Slack message.
+    """
+    try:
+        return (
+            f"{push_http_request.username} pushed to {push_http_request.ref}\n"
+            f"<{push_http_request.compareurl}|"
+            f"{push_http_request.headcommitmessage.splitlines()[0]}>\n"
+            f"Repository: {push_http_request.repository}\n"
+            f"Created by Hemera v{push_http_request.metadata.core}"
+        )
+    except Exception as e:
+        raise ValueNotFoundInHemeraHttpRequest from e
+
+
+def create_issues_slack_message(issues_http_request: IssuesHttpRequest) -> str:
+    """Create a Slack message from a GitHub issues event.
+
+    Args:
+        issues_http_request (IssuesHttpRequest): The HTTP request of the issues event.
+
+    Raises:
+        ValueNotFoundInHemeraHttpRequest: When a value is not found in the IssuesHttpRequest.
+
+    Returns:
+        str: The Slack message.
+    """
+    try:
+        return (
+            f"{issues_http_request.username} {issues_http_request.action} an issue\n"
+            f"<{issues_http_request.issueurl}|"
+            f"{issues_http_request.issuenumber}: {issues_http_request.issuetitle}>\n"
+            f"Repository: {issues_http_request.repository}\n"
+            f"Created by Hemera v{issues_http_request.metadata.core}"
+        )
+    except Exception as e:
+        raise ValueNotFoundInHemeraHttpRequest from e
+
+
+def create_release_slack_message(release_http_request: ReleaseHttpRequest) -> str:
+    """Create a Slack message from a GitHub release event.
+
+    Args:
+        release_http_request (ReleaseHttpRequest): The HTTP request of the release event.
+
+    Raises:
+        ValueNotFoundInHemeraHttpRequest: When a value is not found in the ReleaseHttpRequest.
+
+    Returns:
+        str: The Slack message.
+    """
+    try:
+        return (
+            f"{release_http_request.username} {release_http_request.action} a release\n"
+            f"<{release_http_request.releaseurl}|"
+            f"{release_http_request.releasename or release_http_request.releasetag}>\n"
+            f"Tag: {release_http_request.releasetag}\n"
+            f"Repository: {release_http_request.repository}\n"
+            f"Created by Hemera v{release_http_request.metadata.core}"
+        )
+    except Exception as e:
+        raise ValueNotFoundInHemeraHttpRequest from e
+
+
+def create_workflow_run_slack_message(
+    workflow_run_http_request: WorkflowRunHttpRequest,
+) -> str:
+    """Create a Slack message from a GitHub workflow_run event.
+
+    Args:
+        workflow_run_http_request (WorkflowRunHttpRequest): The HTTP request of the workflow_run event.
+
+    Raises:
+        ValueNotFoundInHemeraHttpRequest: When a value is not found in the WorkflowRunHttpRequest.
+
+    Returns:
+        str: The Slack message.
+    """
+    try:
+        return (
+            f"Workflow {workflow_run_http_request.workflowname} "
+            f"{workflow_run_http_request.action} with "
+            f"{workflow_run_http_request.workflowconclusion}\n"
+            f"<{workflow_run_http_request.workflowurl}|"
+            f"{workflow_run_http_request.workflowbranch}>\n"
+            f"Triggered by: {workflow_run_http_request.username}\n"
+            f"Repository: {workflow_run_http_request.repository}\n"
+            f"Created by Hemera v{workflow_run_http_request.metadata.core}"
+        )
+    except Exception as e:
+        raise ValueNotFoundInHemeraHttpRequest from e
+
+
+def _is_slack_outage(error: Exception) -> bool:
+    """Check whether an error means Slack is unavailable.
+
+    Args:
+        error (Exception): The error of a Slack API call.
+
+    Returns:
+        bool: False for Slack API responses other than server errors, True otherwise.
+    """
+    if isinstance(error, SlackSdkApiError):
+        return error.response.status_code >= 500
+    return True
+
+
+def _with_session(client: AsyncWebClient) -> AsyncWebClient:
+    """Return an async Slack client using the session of the running event
+    loop.
+
+    Pooled clients are shared between event loops, so a copy gets the session.
+
+    Args:
+        client (AsyncWebClient): The pooled async Slack client.
+
+    Returns:
+        AsyncWebClient: The client with the session.
+    """
+    client = copy(client)
+    client.session = get_slack_session()
+    return client
+
+
+def _with_deadline(client: SlackClient, deadline: Optional[Deadline]) -> SlackClient:
+    """Return a Slack client whose timeout is the remaining budget.
+
+    Pooled clients are shared, so a copy gets the timeout.
+
+    Args:
+        client (SlackClient): The pooled Slack client.
+        deadline (Optional[Deadline]): The deadline of the request.
+
+    Raises:
+        DeadlineExceededError: When the budget has run out.
+
+    Returns:
+        SlackClient: The client, unchanged without a deadline.
+    """
+    if deadline is None:
+        return client
+    client = copy(client)
+    # Annotated as int by slack_sdk, both clients pass fractional seconds on.
+    client.timeout = deadline.timeout(SLACK_TIMEOUT)  # type: ignore[assignment]
+    return client
+
+
 def send_slack_message(
     slack_api_token: str,
     channel: str,
     message: str,
+    blocks: Optional[List[Dict[str, Any]]] = None,
+    deadline: Optional[Deadline] = None,
 ) -> SlackResponse:
     """Send a message to Slack.
 
     Args:
         slack_api_token (str): The Slack API token.
         channel (str): The Slack channel.
-        message (str): The message to send.
+        message (str): The message to send, the notification text when there are blocks.
+        blocks (Optional[List[Dict[str, Any]]], optional): The Block Kit blocks. Defaults to None.
+        deadline (Optional[Deadline], optional): The deadline of the request. Defaults to None.
 
     Raises:
         SlackApiError: When an error occurs when sending a message to Slack.
+        DeadlineExceededError: When the message cannot be sent before the deadline.
+        CircuitOpenError: When the Slack circuit breaker is open.
 
     Returns:
         SlackResponse: The Slack response.
     """
     try:
-        client = WebClient(token=slack_api_token)
-        response = client.chat_postMessage(channel=channel, text=message)
-        return response
+        client = SLACK_CLIENTS.get(slack_api_token)
+        attempt = 0
+        while True:
+            SLACK_RATE_LIMITER.acquire(
+                channel, timeout=deadline.timeout() if deadline else None
+            )
+            try:
+                return get_circuit_breaker(SLACK_CIRCUIT_BREAKER).call(
+                    _with_deadline(client, deadline).chat_postMessage,
+                    channel=channel,
+                    text=message,
+                    blocks=blocks,
+                    is_failure=_is_slack_outage,
+                )
+            except SlackSdkApiError as e:
+                retry_after = _get_retry_after(e)
+                if retry_after is None or attempt == SLACK_RATE_LIMITED_RETRIES:
+                    raise
+                LOGGER.warning("Slack rate limited %s for %s s.", channel, retry_after)
+                SLACK_RATE_LIMITER.block(channel, retry_after)
+                attempt += 1
+    except (DeadlineExceededError, CircuitOpenError):
+        raise
+    except Exception as e:
+        raise SlackApiError from e
+
+
+async def send_slack_message_async(
+    slack_api_token: str,
+    channel: str,
+    message: str,
+    blocks: Optional[List[Dict[str, Any]]] = None,
+    deadline: Optional[Deadline] = None,
+) -> AsyncSlackResponse:
+    """Send a message to Slack without blocking the event loop.
+
+    Args:
+        slack_api_token (str): The Slack API token.
+        channel (str): The Slack channel.
+        message (str): The message to send, the notification text when there are blocks.
+        blocks (Optional[List[Dict[str, Any]]], optional): The Block Kit blocks. Defaults to None.
+        deadline (Optional[Deadline], optional): The deadline of the request. Defaults to None.
+
+    Raises:
+        SlackApiError: When an error occurs when sending a message to Slack.
+        DeadlineExceededError: When the message cannot be sent before the deadline.
+        CircuitOpenError: When the Slack circuit breaker is open.
+
+    Returns:
+        AsyncSlackResponse: The Slack response.
+    """
+    try:
+        client = _with_session(ASYNC_SLACK_CLIENTS.get(slack_api_token))
+        attempt = 0
+        while True:
+            await SLACK_RATE_LIMITER.acquire_async(
+                channel, timeout=deadline.timeout() if deadline else None
+            )
+            try:
+                return await get_circuit_breaker(SLACK_CIRCUIT_BREAKER).call_async(
+                    _with_deadline(client, deadline).chat_postMessage,
+                    channel=channel,
+                    text=message,
+                    blocks=blocks,
+                    is_failure=_is_slack_outage,
+                )
+            except SlackSdkApiError as e:
+                retry_after = _get_retry_after(e)
+                if retry_after is None or attempt == SLACK_RATE_LIMITED_RETRIES:
+                    raise
+                LOGGER.warning("Slack rate limited %s for %s s.", channel, retry_after)
+                SLACK_RATE_LIMITER.block(channel, retry_after)
+                attempt += 1
+    except (DeadlineExceededError, CircuitOpenError):
+        raise
     except Exception as e:
         raise SlackApiError from e
@@ -0,0 +1,289 @@
+from functools import lru_cache
+from operator import attrgetter
+from string import Formatter
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Type
+
+from hemera.dataclasses import HemeraConfig
+from hemera.exceptions import (
+    HemeraError,
+    MessageTemplateError,
+    ValueNotFoundInHemeraHttpRequest,
+)
+from hemera.router import get_event_router
+from hemera.serialization import loads
+from hemera.types import GithubHttpRequest
+
+Blocks = List[Dict[str, Any]]
+Render = Callable[[GithubHttpRequest], Any]
+
+CONVERSIONS: Dict[Optional[str], Callable[[Any], Any]] = {
+    None: lambda value: value,
+    "s": str,
+    "r": repr,
+    "a": ascii,
+}
+
+
+def get_template_fields(request_class: Type[GithubHttpRequest]) -> FrozenSet[str]:
+    """Return the attributes of a request class a template may use.
+
+    Args:
+        request_class (Type[GithubHttpRequest]): The request class of the event.
+
+    Returns:
+        FrozenSet[str]: The declared fields and public properties, and metadata.
+    """
+    names = set(request_class.FIELDS)
+    for cls in request_class.__mro__:
+        names.update(
+            name
+            for name, value in vars(cls).items()
+            if isinstance(value, property) and not name.startswith("_")
+        )
+    names.add("metadata")
+    return frozenset(names)
+
+
+def compile_text(
+    template: str,
+    request_class: Type[GithubHttpRequest],
+) -> Callable[[GithubHttpRequest], str]:
+    """Compile a str.format template into a function rendering it.
+
+    Fields are the declared fields and properties of the request class, like
+    {username} or {metadata.core}. The template is parsed once, rendering
+    only reads the fields and formats their values.
+
+    Args:
+        template (str): The template.
+        request_class (Type[GithubHttpRequest]): The request class of the event.
+
+    Raises:
+        ValueError: When the template is malformed or uses an unknown field.
+
+    Returns:
+        Callable[[GithubHttpRequest], str]: The render function.
+    """
+    fields = get_template_fields(request_class)
+    parts: List[Tuple[str, Optional[Callable[[Any], Any]], Callable, str]] = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        if field_name is None:
+            parts.append((literal, None, CONVERSIONS[None], ""))
+            continue
+        if not field_name or "[" in field_name or "{" in (format_spec or ""):
+            raise ValueError(f"Unsupported template field {{{field_name}}}.")
+        name, *attributes = field_name.split(".")
+        if name not in fields or any(
+            attribute.startswith("_") for attribute in attributes
+        ):
+            raise ValueError(f"Unknown template field {{{field_name}}}.")
+        if conversion not in CONVERSIONS:
+            raise ValueError(f"Unknown conversion !{conversion}.")
+        parts.append(
+            (
+                literal,
+                attrgetter(field_name),
+                CONVERSIONS[conversion],
+                format_spec or "",
+            )
+        )
+
+    if all(getter is None for _, getter, _, _ in parts):
+        constant = "".join(literal for literal, _, _, _ in parts)
+        return lambda github_http_request: constant
+
+    def render(github_http_request: GithubHttpRequest) -> str:
+        return "".join(
+            [
+                literal
+                if getter is None
+                else literal + format(convert(getter(github_http_request)), spec)
+                for literal, getter, convert, spec in parts
+            ]
+        )
+
+    return render
+
+
+def compile_blocks(template: Any, request_class: Type[GithubHttpRequest]) -> Render:
+    """Compile a Block Kit template into a function rendering it.
+
+    Every string in the template is compiled with compile_text, the structure
+    around them is copied on every render.
+
+    Args:
+        template (Any): The decoded Block Kit JSON.
+        request_class (Type[GithubHttpRequest]): The request class of the event.
+
+    Raises:
+        ValueError: When a string in the template is malformed or uses an unknown field.
+
+    Returns:
+        Render: The render function.
+    """
+    if isinstance(template, str):
+        return compile_text(template, request_class)
+
+    if isinstance(template, list):
+        items = [compile_blocks(item, request_class) for item in template]
+        return lambda github_http_request: [item(github_http_request) for item in items]
+
+    if isinstance(template, dict):
+        values = [
+            (key, compile_blocks(value, request_class))
+            for key, value in template.items()
+        ]
+        return lambda github_http_request: {
+            key: value(github_http_request) for key, value in values
+        }
+
+    return lambda github_http_request: template
+
+
+class MessageTemplate:
+    """A compiled message template of a GitHub event, with an optional Block
+    Kit layout.
+
+    Rendered messages are memoized in the renders of the request, so every
+    sink of a delivery shares one render.
+    """
+
+    def __init__(
+        self,
+        githubevent: str,
+        text: str,
+        blocks: Optional[Blocks] = None,
+        request_class: Type[GithubHttpRequest] = GithubHttpRequest,
+    ):
+        """Initialize an instance of the MessageTemplate class.
+
+        Args:
+            githubevent (str): The GitHub event the template is for.
+            text (str): The plain text template, also the notification fallback of the blocks.
+            blocks (Optional[Blocks], optional): The Block Kit template. Defaults to None.
+            request_class (Type[GithubHttpRequest], optional): The request class of the event.
+                Defaults to GithubHttpRequest.
+
+        Raises:
+            MessageTemplateError: When a template is malformed or uses an unknown field.
+        """
+        self.githubevent = githubevent
+        try:
+            self._render_text = compile_text(text, request_class)
+            self._render_blocks = (
+                compile_blocks(blocks, request_class) if blocks is not None else None
+            )
+        except ValueError as e:
+            raise MessageTemplateError(template=githubevent) from e
+
+    def _render(self, github_http_request: GithubHttpRequest) -> Tuple[str, Any]:
+        """Render the text and blocks of a request once.
+
+        Args:
+            github_http_request (GithubHttpRequest): The HTTP request of the event.
+
+        Raises:
+            ValueNotFoundInHemeraHttpRequest: When a field is not found in the request.
+
+        Returns:
+            Tuple[str, Any]: The text and the blocks, None without a Block Kit template.
+        """
+        renders = github_http_request.renders
+        try:
+            return renders[self]
+        except KeyError:
+            pass
+
+        try:
+            rendered = renders[self] = (
+                self._render_text(github_http_request),
+                self._render_blocks(github_http_request)
+                if self._render_blocks is not None
+                else None,
+            )
+        except Exception as e:
+            raise ValueNotFoundInHemeraHttpRequest from e
+        return rendered
+
+    def __call__(self, github_http_request: GithubHttpRequest) -> str:
+        """Render the plain text message of a request.
+
+        Args:
+            github_http_request (GithubHttpRequest): The HTTP request of the event.
+
+        Returns:
+            str: The message.
+        """
+        return self._render(github_http_request)[0]
+
+    def render_blocks(self, github_http_request: GithubHttpRequest) -> Optional[Blocks]:
+        """Render the Block Kit blocks of a request.
+
+        Args:
+            github_http_request (GithubHttpRequest): The HTTP request of the event.
+
+        Returns:
+            Optional[Blocks]: The blocks, None without a Block Kit template.
+        """
+        return self._render(github_http_request)[1]
+
+
+def load_message_templates(path: str) -> Mapping[str, MessageTemplate]:
+    """Load and compile the message templates from a JSON file.
+
+    The file maps a GitHub event to its template, either a string or an
+    object with a "text" string and optional "blocks" list.
+
+    Args:
+        path (str): The path of the JSON file.
+
+    Raises:
+        MessageTemplateError: When the file or a template is invalid.
+
+    Returns:
+        Mapping[str, MessageTemplate]: The compiled template of every event in the file.
+    """
+    try:
+        with open(path, "rb") as file:
+            definitions = loads(file.read())
+    except (OSError, ValueError) as e:
+        raise MessageTemplateError(template=path) from e
+
+    if not isinstance(definitions, dict):
+        raise MessageTemplateError(template=path)
+
+    router = get_event_router()
+    templates = {}
+    for githubevent, definition in definitions.items():
+        if isinstance(definition, str):
+            definition = {"text": definition}
+        try:
+            request_class = router.plugin(githubevent).request_class
+            text = definition["text"]
+        except (HemeraError, KeyError, TypeError) as e:
+            raise MessageTemplateError(template=githubevent) from e
+        templates[githubevent] = MessageTemplate(
+            githubevent=githubevent,
+            text=text,
+            blocks=definition.get("blocks"),
+            request_class=request_class,
+        )
+    return templates
+
+
+@lru_cache(maxsize=1)
+def get_message_templates(config: HemeraConfig) -> Mapping[str, MessageTemplate]:
+    """Return the process-wide message templates for a configuration.
+
+    Args:
+        config (HemeraConfig): The Hemera configuration.
+
+    Raises:
+        MessageTemplateError: When the templates are invalid.
+
+    Returns:
+        Mapping[str, MessageTemplate]: The compiled templates, empty when none are configured.
+    """
+    if not config.slack_message_templates:
+        return {}
+    return load_message_templates(config.slack_message_templates)
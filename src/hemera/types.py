@@ -1,14 +1,12 @@
-from logging import Logger, getLogger
-from typing import Any, List
-
-import azure.functions as func
+from functools import lru_cache
+from logging import getLogger
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Type
 
 from hemera.dataclasses import HttpRequest, Metadata, PythonVersion
 from hemera.exceptions import (
     ValueNotFoundInHemeraHttpRequest,
     ValueNotFoundInHemeraMetadata,
 )
-from hemera.http_request_handler import convert_http_request
 from hemera.metadata import get_software_versions
 
 LOGGER = getLogger(__name__)
@@ -50,14 +48,119 @@ class HemeraMetadata:
             raise ValueNotFoundInHemeraMetadata from e
 
 
-class HemeraHttpRequest:
-    """A class to represent a Hemera HTTP request."""
+def _compile_path(keys: Sequence[str]) -> Callable[[Any], Any]:
+    """Compile a key path into a function that walks it.
+
+    Args:
+        keys (Sequence[str]): The keys to access the value.
+
+    Returns:
+        Callable[[Any], Any]: A function returning the value, raising KeyError or TypeError when it is missing.
+    """
+    if len(keys) == 1:
+        (key,) = keys
+        return lambda value: value[key]
+
+    if len(keys) == 2:
+        first, second = keys
+        return lambda value: value[first][second]
+
+    if len(keys) == 3:
+        first, second, third = keys
+        return lambda value: value[first][second][third]
+
+    def access(value: Any) -> Any:
+        for key in keys:
+            value = value[key]
+        return value
+
+    return access
+
+
+class HemeraField:
+    """A field of a Hemera HTTP request, read once and memoized per
+    request."""
+
+    def __init__(self, source: str, *paths: Tuple[str, ...]):
+        """Initialize an instance of the HemeraField class.
+
+        Args:
+            source (str): The source of the field. Either "header" or "body".
+            *paths (Tuple[str, ...]): The key paths to the field, tried in order.
+        """
+        self.source = source
+        self.paths = paths
+        self.name = ""
+        self._accessors = tuple(_compile_path(keys) for keys in paths)
+
+    def __set_name__(self, owner: Type["GithubHttpRequest"], name: str) -> None:
+        self.name = name
+        if "FIELDS" not in vars(owner):
+            owner.FIELDS = dict(getattr(owner, "FIELDS", {}))
+        owner.FIELDS[name] = self
+
+    def extract(self, req: HttpRequest) -> Any:
+        """Return the value of the field from an HTTP request.
+
+        Args:
+            req (HttpRequest): The HTTP request.
+
+        Raises:
+            ValueNotFoundInHemeraHttpRequest: When none of the paths lead to a value.
+
+        Returns:
+            Any: The value of the field.
+        """
+        source = req.header if self.source == "header" else req.body
+        for accessor in self._accessors:
+            try:
+                return accessor(source)
+            except (KeyError, TypeError):
+                continue
+        raise ValueNotFoundInHemeraHttpRequest
+
+    def __get__(
+        self,
+        instance: Optional["GithubHttpRequest"],
+        owner: Type["GithubHttpRequest"],
+    ) -> Any:
+        if instance is None:
+            return self
+
+        values = instance._values
+        try:
+            return values[self.name]
+        except KeyError:
+            value = values[self.name] = self.extract(instance.req)
+            return value
+
+
+@lru_cache(maxsize=None)
+def _get_field(source: str, keys: Tuple[str, ...]) -> HemeraField:
+    """Return the compiled field of a key path.
+
+    Args:
+        source (str): The source of the field. Either "header" or "body".
+        keys (Tuple[str, ...]): The keys to access the field.
+
+    Returns:
+        HemeraField: The field, compiled once per source and key path.
+    """
+    return HemeraField(source, keys)
+
+
+class GithubHttpRequest:
+    """A class to represent the HTTP request of a GitHub event."""
+
+    __slots__ = ("_req", "_values", "metadata", "renders")
+
+    FIELDS: Dict[str, HemeraField]
 
     def __init__(
         self,
         req: HttpRequest = HttpRequest(header={}, body={}),
     ):
-        """Initialize an instance of the HemeraHttpRequest class.
+        """Initialize an instance of the GithubHttpRequest class.
 
         Args:
             req (HttpRequest, optional): The HTTP request. Defaults to HttpRequest(header={}, body={}).
@@ -65,32 +168,25 @@ class HemeraHttpRequest:
         self.req = req
         self.metadata = HemeraMetadata._from_runtime()
 
-    @classmethod
-    def from_azure_functions_http_request(
-        cls,
-        req: func.HttpRequest,
-        logger: Logger = LOGGER,
-    ) -> "HemeraHttpRequest":
-        """Create an instance of the HemeraHttpRequest class from an Azure
-        Functions HTTP request.
-
-        Args:
-            req (func.HttpRequest): The Azure Functions HTTP request.
-            logger (Logger, optional): The logger. Defaults to LOGGER.
-
-        Returns:
-            HemeraHttpRequest: An instance of the HemeraHttpRequest class.
-        """
-        return cls(
-            req=convert_http_request(
-                req=req,
-                logger=logger,
-            ),
-        )
+    @property
+    def req(self) -> HttpRequest:
+        """Return the HTTP request."""
+        return self._req
+
+    @req.setter
+    def req(self, req: HttpRequest) -> None:
+        """Replace the HTTP request and forget the memoized field values and
+        renders."""
+        self._req = req
+        self._values: Dict[str, Any] = {}
+        # Messages rendered from this request, keyed by their renderer.
+        self.renders: Dict[Hashable, Any] = {}
 
     def _get_property_value(self, source: str, keys: List[str]) -> Any:
         """Return the value of a property.
 
+        Prefer the declared fields, which are memoized per request.
+
         Args:
             source (str): The source of the property. Either "header" or "body".
             keys (List[str]): The keys to access the property.
@@ -101,78 +197,131 @@ class HemeraHttpRequest:
         Returns:
             Any: The value of the property.
         """
-        try:
-            value = getattr(self.req, source)
-            for key in keys:
-                value = value[key]
-            return value
-        except KeyError as e:
-            raise ValueNotFoundInHemeraHttpRequest from e
+        return _get_field(source, tuple(keys)).extract(self.req)
 
-    @property
-    def username(self) -> str:
-        """Return the username."""
-        return self._get_property_value(
-            source="body", keys=["pull_request", "user", "login"]
-        )
-        # Fields that contains a username:
-        # body["pull_request"]["user"]["login"]
-        # body["pull_request"]["head"]["user"]["login"]
-        # body["pull_request"]["head"]["repo"]["owner"]["login"]
-        # body["pull_request"]["base"]["user"]["login"]
-        # body["pull_request"]["base"]["repo"]["owner"]["login"]
-        # body["repository"]["owner"]["login"]
-        # body["sender"]["login"]
+    githubevent = HemeraField("header", ("x-github-event",))
 
-    @property
-    def action(self) -> object:
-        """Return the action."""
-        return self._get_property_value(source="body", keys=["action"])
+    action = HemeraField("body", ("action",))
 
-    @property
-    def repository(self) -> str:
-        """Return the repository name."""
-        return self._get_property_value(source="body", keys=["repository", "full_name"])
-        # Fields that contains a repository name:
-        # body["pull_request"]["head"]["repo"]["full_name"]
-        # body["pull_request"]["base"]["repo"]["full_name"]
-        # body["repository"]["full_name"]
+    username = HemeraField("body", ("sender", "login"))
 
-    @property
-    def githubevent(self) -> str:
-        """Return the GitHub event."""
-        return self._get_property_value(source="header", keys=["x-github-event"])
+    repository = HemeraField("body", ("repository", "full_name"))
 
     @property
-    def pullrequesturl(self) -> str:
-        """Return the pull request URL."""
-        return self._get_property_value(
-            source="body", keys=["pull_request", "html_url"]
-        )
+    def branch(self) -> Optional[str]:
+        """Return the branch the event is about, None when there is none."""
+        return None
 
-    @property
-    def pullrequestnumber(self) -> str:
-        """Return the pull request number."""
-        return self._get_property_value(source="body", keys=["pull_request", "number"])
-        # Fields that contains a pull request number:
-        # body["pull_request"]["number"]
-        # body["number"]
+
+class HemeraHttpRequest(GithubHttpRequest):
+    """A class to represent a Hemera HTTP request of a GitHub pull_request
+    event."""
+
+    __slots__ = ()
+
+    # Fields that contains a username:
+    # body["pull_request"]["user"]["login"]
+    # body["pull_request"]["head"]["user"]["login"]
+    # body["pull_request"]["head"]["repo"]["owner"]["login"]
+    # body["pull_request"]["base"]["user"]["login"]
+    # body["pull_request"]["base"]["repo"]["owner"]["login"]
+    # body["repository"]["owner"]["login"]
+    # body["sender"]["login"]
+    # Only the pull request author is used, the others are different users.
+    username = HemeraField("body", ("pull_request", "user", "login"))
+
+    repository = HemeraField(
+        "body",
+        ("repository", "full_name"),
+        ("pull_request", "base", "repo", "full_name"),
+    )
+
+    pullrequesturl = HemeraField("body", ("pull_request", "html_url"))
+
+    pullrequestnumber = HemeraField(
+        "body",
+        ("pull_request", "number"),
+        ("number",),
+    )
+
+    pullrequesttitle = HemeraField("body", ("pull_request", "title"))
+
+    pullrequesttargetbranch = HemeraField("body", ("pull_request", "base", "ref"))
+
+    pullrequestsourcebranch = HemeraField("body", ("pull_request", "head", "ref"))
 
     @property
-    def pullrequesttitle(self) -> str:
-        """Return the pull request title."""
-        return self._get_property_value(source="body", keys=["pull_request", "title"])
+    def branch(self) -> Optional[str]:
+        """Return the target branch of the pull request."""
+        return self.pullrequesttargetbranch
+
+
+class PushHttpRequest(GithubHttpRequest):
+    """A class to represent the HTTP request of a GitHub push event."""
+
+    __slots__ = ()
+
+    username = HemeraField("body", ("sender", "login"), ("pusher", "name"))
+
+    ref = HemeraField("body", ("ref",))
+
+    compareurl = HemeraField("body", ("compare",))
+
+    headcommitmessage = HemeraField("body", ("head_commit", "message"))
 
     @property
-    def pullrequesttargetbranch(self) -> str:
-        """Return the pull request target branch."""
-        return self._get_property_value(
-            source="body", keys=["pull_request", "base", "ref"]
-        )
+    def branch(self) -> Optional[str]:
+        """Return the pushed branch, None when a tag was pushed."""
+        prefix = "refs/heads/"
+        return self.ref.replace(prefix, "", 1) if self.ref.startswith(prefix) else None
+
+
+class IssuesHttpRequest(GithubHttpRequest):
+    """A class to represent the HTTP request of a GitHub issues event."""
+
+    __slots__ = ()
+
+    username = HemeraField("body", ("issue", "user", "login"))
+
+    issueurl = HemeraField("body", ("issue", "html_url"))
+
+    issuenumber = HemeraField("body", ("issue", "number"))
+
+    issuetitle = HemeraField("body", ("issue", "title"))
+
+
+class ReleaseHttpRequest(GithubHttpRequest):
+    """A class to represent the HTTP request of a GitHub release event."""
+
+    __slots__ = ()
+
+    username = HemeraField("body", ("release", "author", "login"))
+
+    releaseurl = HemeraField("body", ("release", "html_url"))
+
+    releasename = HemeraField("body", ("release", "name"))
+
+    releasetag = HemeraField("body", ("release", "tag_name"))
+
+
+class WorkflowRunHttpRequest(GithubHttpRequest):
+    """A class to represent the HTTP request of a GitHub workflow_run event."""
+
+    __slots__ = ()
+
+    username = HemeraField(
+        "body", ("workflow_run", "actor", "login"), ("sender", "login")
+    )
+
+    workflowname = HemeraField("body", ("workflow_run", "name"))
+
+    workflowconclusion = HemeraField("body", ("workflow_run", "conclusion"))
+
+    workflowurl = HemeraField("body", ("workflow_run", "html_url"))
+
+    workflowbranch = HemeraField("body", ("workflow_run", "head_branch"))
 
     @property
-    def pullrequestsourcebranch(self) -> str:
-        """Return the pull request source branch."""
-        return self._get_property_value(
-            source="body", keys=["pull_request", "head", "ref"]
-        )
+    def branch(self) -> Optional[str]:
+        """Return the branch the workflow ran on."""
+        return self.workflowbranch
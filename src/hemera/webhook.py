@@ -0,0 +1,389 @@
+from contextlib import contextmanager
+from logging import getLogger
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import azure.functions as func
+
+from hemera.coalesce import get_coalescer
+from hemera.config import get_config
+from hemera.dataclasses import HemeraConfig
+from hemera.deadline import Deadline, create_deadline
+from hemera.dedup import get_delivery_cache
+from hemera.exceptions import HemeraError
+from hemera.handlers import AutomationHandler
+from hemera.homeautomation import (
+    get_homeautomation_executor,
+    get_homeautomation_session,
+)
+from hemera.http_request_handler import convert_http_request_headers
+from hemera.metrics import (
+    FILTER_STAGE,
+    METRICS,
+    PARSE_STAGE,
+    PREFILTER_STAGE,
+    measure_requests,
+)
+from hemera.outbox import get_outbox
+from hemera.prefilter import prefilter_request
+from hemera.router import EventRoute, get_event_router
+from hemera.routing import get_routing_index
+from hemera.signature import verify_request_signature
+from hemera.sinks import get_sink_executor, get_sink_registry
+from hemera.templates import get_message_templates
+from hemera.types import GithubHttpRequest
+from hemera.workqueue import get_work_queue
+
+LOGGER = getLogger(__name__)
+
+get_event_router()
+
+try:
+    get_message_templates(get_config())
+    get_routing_index(get_config())
+except HemeraError as e:
+    LOGGER.error("Invalid Hemera configuration at startup: %s", e)
+
+
+def _is_duplicate_delivery(req: func.HttpRequest, config: HemeraConfig) -> bool:
+    """Check whether the GitHub delivery was already processed.
+
+    Args:
+        req (func.HttpRequest): The incoming HTTP request.
+        config (HemeraConfig): The Hemera configuration.
+
+    Returns:
+        bool: True when the delivery ID was seen before.
+    """
+    delivery_cache = get_delivery_cache(config)
+    delivery_id = req.headers.get("x-github-delivery")
+
+    if delivery_cache is None or not delivery_id:
+        return False
+
+    if delivery_cache.add(delivery_id):
+        return False
+
+    LOGGER.info("Delivery %s already processed.", delivery_id)
+    return True
+
+
+def _forget_delivery(delivery_id: Optional[str], config: HemeraConfig) -> None:
+    """Forget a GitHub delivery that was not processed, so a redelivery is
+    handled again.
+
+    Args:
+        delivery_id (Optional[str]): The GitHub delivery ID.
+        config (HemeraConfig): The Hemera configuration.
+    """
+    delivery_cache = get_delivery_cache(config)
+
+    if delivery_cache is not None and delivery_id:
+        try:
+            delivery_cache.discard(delivery_id)
+        except HemeraError as e:
+            LOGGER.error("Error forgetting delivery %s: %s", delivery_id, e)
+
+
+def _accept_request(
+    req: func.HttpRequest, config: HemeraConfig
+) -> Tuple[GithubHttpRequest, EventRoute]:
+    """Convert the incoming HTTP request and check it may trigger automation.
+
+    Requests that can be rejected from their headers or raw body are never
+    decoded, the others are decoded by the extractor registered for their
+    GitHub event.
+
+    Args:
+        req (func.HttpRequest): The incoming HTTP request.
+        config (HemeraConfig): The Hemera configuration.
+
+    Raises:
+        GithubEventNotSupportedError: When the GitHub event or action is not supported.
+        UnauthorizedUserError: When the user is not whitelisted.
+
+    Returns:
+        Tuple[GithubHttpRequest, EventRoute]: The accepted HTTP request and its route.
+    """
+    router = get_event_router()
+
+    with METRICS.time("hemera_stage_seconds", PREFILTER_STAGE):
+        prefilter_request(
+            req=req,
+            pr_author_filter=config.pr_author_filter,
+            supported_events=router.events,
+            logger=LOGGER,
+        )
+
+    with METRICS.time("hemera_stage_seconds", PARSE_STAGE):
+        hemera_http_request = router.extract(
+            header=convert_http_request_headers(req=req), body=req.get_body()
+        )
+
+    with METRICS.time("hemera_stage_seconds", FILTER_STAGE):
+        route = router.route(hemera_http_request)
+        route.accept(hemera_http_request, config)
+
+    return hemera_http_request, route
+
+
+def _create_automation_handler(
+    config: HemeraConfig,
+    hemera_http_request: GithubHttpRequest,
+    route: EventRoute,
+    deadline: Optional[Deadline] = None,
+) -> AutomationHandler:
+    """Create an AutomationHandler from the Hemera configuration.
+
+    The configured message template of the GitHub event is used when there is
+    one, the renderer of the route otherwise. The message is rendered once and
+    sent to every channel and webhook the routing rules match.
+
+    Args:
+        config (HemeraConfig): The Hemera configuration.
+        hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+        route (EventRoute): The route of the GitHub event.
+        deadline (Optional[Deadline], optional): The deadline of the request. Defaults to None.
+
+    Returns:
+        AutomationHandler: The automation handler.
+    """
+    template = get_message_templates(config).get(hemera_http_request.githubevent)
+    destination = get_routing_index(config).route(hemera_http_request)
+
+    return AutomationHandler(
+        slack_api_token=config.slack_api_token,
+        slack_channel=destination.slack_channels,
+        homeautomation_webhook=destination.homeautomation_webhooks,
+        message_renderer=template or route.render,
+        blocks_renderer=template.render_blocks if template else None,
+        homeautomation_timeout=config.homeautomation_timeout,
+        homeautomation_retries=config.homeautomation_retries,
+        homeautomation_session=get_homeautomation_session(
+            pool_size=config.homeautomation_pool_size
+        ),
+        homeautomation_executor=get_homeautomation_executor(
+            max_workers=config.homeautomation_pool_size
+        ),
+        deadline=deadline,
+        sink_registry=get_sink_registry(max_concurrency=config.sink_max_concurrency),
+        sink_executor=get_sink_executor(max_workers=config.sink_workers),
+        outbox=get_outbox(config, _send_outbox_entry),
+        logger=LOGGER,
+    )
+
+
+def _handle_queued_request(
+    hemera_http_request: GithubHttpRequest, delivery_ids: Sequence[str] = ()
+) -> None:
+    """Handle a request taken from the background work queue or combined by
+    the coalescer.
+
+    Args:
+        hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+        delivery_ids (Sequence[str], optional): The delivery IDs of every event combined into the
+            request, forgotten when it fails. Defaults to the delivery ID of the request.
+    """
+    config = get_config()
+
+    try:
+        route = get_event_router().route(hemera_http_request)
+        automation_handler = _create_automation_handler(
+            config=config, hemera_http_request=hemera_http_request, route=route
+        )
+        automation_handler.handle_request(hemera_http_request=hemera_http_request)
+    except Exception as e:
+        for delivery_id in delivery_ids or (
+            hemera_http_request.req.header.get("x-github-delivery"),
+        ):
+            _forget_delivery(delivery_id=delivery_id, config=config)
+        if not isinstance(e, HemeraError):
+            raise
+        LOGGER.error("Error: %s", e)
+
+
+def _send_outbox_entry(
+    hemera_http_request: GithubHttpRequest, sink: str, target: str = ""
+) -> None:
+    """Send a request to a target of a sink again, for the outbox.
+
+    Args:
+        hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+        sink (str): The name of the sink.
+        target (str, optional): The target of the sink, defaults to every target.
+    """
+    config = get_config()
+    route = get_event_router().route(hemera_http_request)
+    automation_handler = _create_automation_handler(
+        config=config, hemera_http_request=hemera_http_request, route=route
+    )
+    automation_handler.handle_sink(
+        hemera_http_request=hemera_http_request, sink=sink, target=target
+    )
+
+
+@contextmanager
+def _forget_delivery_on_error(
+    req: func.HttpRequest, config: HemeraConfig
+) -> Iterator[None]:
+    """Forget the registered GitHub delivery when the block raises an error,
+    so a redelivery is handled again.
+
+    Args:
+        req (func.HttpRequest): The incoming HTTP request.
+        config (HemeraConfig): The Hemera configuration.
+    """
+    try:
+        yield
+    except Exception:
+        _forget_delivery(
+            delivery_id=req.headers.get("x-github-delivery"), config=config
+        )
+        raise
+
+
+def _start_delivery(
+    req: func.HttpRequest, config: HemeraConfig
+) -> Union[func.HttpResponse, Tuple[AutomationHandler, GithubHttpRequest]]:
+    """Run the steps of a delivery before it is sent to the sinks.
+
+    The signature is verified, duplicate deliveries are answered right away,
+    and accepted requests are coalesced or queued when configured.
+
+    Args:
+        req (func.HttpRequest): The incoming HTTP request.
+        config (HemeraConfig): The Hemera configuration.
+
+    Raises:
+        HemeraError: When the delivery is rejected, after it is forgotten.
+
+    Returns:
+        Union[func.HttpResponse, Tuple[AutomationHandler, GithubHttpRequest]]: The response when the
+            delivery is done, otherwise the automation handler and the request to send.
+    """
+    deadline = create_deadline(config.request_deadline)
+
+    verify_request_signature(req=req, secret=config.github_webhook_secret)
+
+    if _is_duplicate_delivery(req=req, config=config):
+        return func.HttpResponse("Delivery already processed.", status_code=200)
+
+    with _forget_delivery_on_error(req=req, config=config):
+        hemera_http_request, route = _accept_request(req=req, config=config)
+
+        coalescer = get_coalescer(config, _handle_queued_request)
+        if coalescer is not None and coalescer.submit(hemera_http_request):
+            LOGGER.info("Python HTTP trigger function is coalescing the request.")
+            return func.HttpResponse("Automation accepted.", status_code=202)
+
+        work_queue = get_work_queue(config, _handle_queued_request)
+        if work_queue is not None:
+            work_queue.put(hemera_http_request)
+            LOGGER.info("Python HTTP trigger function queued the request.")
+            return func.HttpResponse("Automation accepted.", status_code=202)
+
+        automation_handler = _create_automation_handler(
+            config=config,
+            hemera_http_request=hemera_http_request,
+            route=route,
+            deadline=deadline,
+        )
+    return automation_handler, hemera_http_request
+
+
+def _finish_delivery(automation_handler: AutomationHandler) -> func.HttpResponse:
+    """Answer a delivery that was sent to the sinks.
+
+    Args:
+        automation_handler (AutomationHandler): The automation handler that sent the delivery.
+
+    Returns:
+        func.HttpResponse: The outgoing HTTP response.
+    """
+    if automation_handler.deferred:
+        return func.HttpResponse("Automation accepted.", status_code=202)
+
+    LOGGER.info("Python HTTP trigger function executed successfully.")
+    return func.HttpResponse("Automation executed successfully.", status_code=200)
+
+
+def _error_response(error: HemeraError) -> func.HttpResponse:
+    """Answer a delivery that failed.
+
+    Args:
+        error (HemeraError): The error of the delivery.
+
+    Returns:
+        func.HttpResponse: The outgoing HTTP response.
+    """
+    LOGGER.error("Error: %s", error)
+    return func.HttpResponse(f"Error: {error}", status_code=400)
+
+
+@measure_requests
+def main(req: func.HttpRequest) -> func.HttpResponse:
+    """Azure Function entry point.
+
+    Args:
+        req (func.HttpRequest): The incoming HTTP request.
+
+    Raises:
+        Exception: When an unexpected error occurs, after the delivery is forgotten.
+
+    Returns:
+        func.HttpResponse: The outgoing HTTP response.
+    """
+    LOGGER.info("Python HTTP trigger function processed a request.")
+
+    try:
+        config = get_config()
+        started = _start_delivery(req=req, config=config)
+        if isinstance(started, func.HttpResponse):
+            return started
+
+        automation_handler, hemera_http_request = started
+        with _forget_delivery_on_error(req=req, config=config):
+            automation_handler.handle_request(hemera_http_request=hemera_http_request)
+        return _finish_delivery(automation_handler)
+    except HemeraError as e:
+        return _error_response(e)
+
+
+@measure_requests
+async def main_async(req: func.HttpRequest) -> func.HttpResponse:
+    """Asynchronous Azure Function entry point.
+
+    Behaves like main, but awaits the Slack and Home Automation calls
+    concurrently so one worker can overlap many deliveries.
+
+    Args:
+        req (func.HttpRequest): The incoming HTTP request.
+
+    Raises:
+        Exception: When an unexpected error occurs, after the delivery is forgotten.
+
+    Returns:
+        func.HttpResponse: The outgoing HTTP response.
+    """
+    LOGGER.info("Python HTTP trigger function processed a request.")
+
+    try:
+        config = get_config()
+        started = _start_delivery(req=req, config=config)
+        if isinstance(started, func.HttpResponse):
+            return started
+
+        automation_handler, hemera_http_request = started
+        with _forget_delivery_on_error(req=req, config=config):
+            await automation_handler.handle_request_async(
+                hemera_http_request=hemera_http_request
+            )
+        return _finish_delivery(automation_handler)
+    except HemeraError as e:
+        return _error_response(e)
+
+
+# Failed deliveries stored by a previous run are sent again right away.
+try:
+    get_outbox(get_config(), _send_outbox_entry)
+except HemeraError as e:
+    LOGGER.error("Invalid Hemera configuration at startup: %s", e)
@@ -0,0 +1,418 @@
+from abc import ABC, abstractmethod
+from json import dumps, loads
+from logging import Logger, getLogger
+from os import getpid
+from queue import Full, Queue
+from sqlite3 import connect as sqlite_connect
+from threading import Condition, Event, Lock, Thread, get_ident
+from time import time
+from typing import Callable, Dict, List, Optional
+from uuid import uuid4
+
+from hemera.dataclasses import HemeraConfig, HttpRequest
+from hemera.exceptions import WorkQueueFullError
+from hemera.router import get_event_router
+from hemera.types import GithubHttpRequest
+
+LOGGER = getLogger(__name__)
+
+WORK_QUEUE_LEASE = 300.0
+
+WorkHandler = Callable[[GithubHttpRequest], None]
+
+
+def dump_work_item(hemera_http_request: GithubHttpRequest) -> str:
+    """Serialize a GithubHttpRequest so it can be stored in a durable queue.
+
+    Args:
+        hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+
+    Returns:
+        str: The serialized work item.
+    """
+    return dumps(
+        {
+            "header": dict(hemera_http_request.req.header),
+            "body": hemera_http_request.req.body,
+        }
+    )
+
+
+def load_work_item(work_item: str) -> GithubHttpRequest:
+    """Deserialize a work item stored by dump_work_item.
+
+    Args:
+        work_item (str): The serialized work item.
+
+    Returns:
+        GithubHttpRequest: The HTTP request of the GitHub event.
+    """
+    data = loads(work_item)
+    request_class = (
+        get_event_router()
+        .plugin(data["header"].get("x-github-event", ""))
+        .request_class
+    )
+    return request_class(req=HttpRequest(header=data["header"], body=data["body"]))
+
+
+class WorkQueue(ABC):
+    """Base class for queues that handle requests on background worker
+    threads."""
+
+    def __init__(
+        self,
+        handler: WorkHandler,
+        workers: int,
+        logger: Logger = LOGGER,
+    ):
+        """Initialize an instance of the WorkQueue class.
+
+        Args:
+            handler (WorkHandler): The function that handles a queued request.
+            workers (int): The number of worker threads.
+            logger (Logger, optional): The logger. Defaults to LOGGER.
+        """
+        self.handler = handler
+        self.logger = logger
+        self._stopped = Event()
+        self._threads: List[Thread] = [
+            Thread(target=self._work, name=f"hemera-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self) -> "WorkQueue":
+        """Start the worker threads.
+
+        Returns:
+            WorkQueue: This work queue.
+        """
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    @abstractmethod
+    def put(self, hemera_http_request: GithubHttpRequest) -> None:
+        """Queue a request without waiting for it to be handled.
+
+        Args:
+            hemera_http_request (GithubHttpRequest): The HTTP request of the GitHub event.
+
+        Raises:
+            WorkQueueFullError: When the queue cannot accept more requests.
+        """
+
+    @abstractmethod
+    def _get(self) -> Optional[GithubHttpRequest]:
+        """Wait for the next queued request.
+
+        Returns:
+            Optional[GithubHttpRequest]: The request, or None when there is nothing to do.
+        """
+
+    def _done(self) -> None:
+        """Mark the last request returned by _get on this thread as handled."""
+
+    def _work(self) -> None:
+        """Handle queued requests until the queue is closed.
+
+        A request that cannot be taken from the queue, for example because it
+        can no longer be deserialized, is logged and marked as handled.
+        """
+        while True:
+            try:
+                hemera_http_request = self._get()
+                if hemera_http_request is None:
+                    if self._stopped.is_set():
+                        self._worker_stopped()
+                        return
+                    continue
+                self.handler(hemera_http_request)
+            except Exception as e:
+                self.logger.error("Error handling queued request, %s", e)
+            finally:
+                self._done()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker threads once they are idle.
+
+        The in-memory queue first hands the requests it holds to the handler,
+        the SQLite queue keeps them for the next worker.
+
+        Args:
+            timeout (Optional[float], optional): The number of seconds to wait for each worker. Defaults to None.
+        """
+        self._stopped.set()
+        self._wake_all()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout)
+
+    def _wake_all(self) -> None:
+        """Wake up every worker waiting for a request."""
+
+    def _worker_stopped(self) -> None:
+        """Called by a worker thread once it stops."""
+
+
+class InMemoryWorkQueue(WorkQueue):
+    """A bounded work queue in the memory of this process."""
+
+    def __init__(
+        self,
+        handler: WorkHandler,
+        workers: int,
+        size: int,
+        logger: Logger = LOGGER,
+    ):
+        """Initialize an instance of the InMemoryWorkQueue class.
+
+        Args:
+            handler (WorkHandler): The function that handles a queued request.
+            workers (int): The number of worker threads.
+            size (int): The maximum number of queued requests.
+            logger (Logger, optional): The logger. Defaults to LOGGER.
+        """
+        super().__init__(handler=handler, workers=workers, logger=logger)
+        self._queue: "Queue[Optional[GithubHttpRequest]]" = Queue(maxsize=size)
+
+    def put(self, hemera_http_request: GithubHttpRequest) -> None:
+        try:
+            self._queue.put_nowait(hemera_http_request)
+        except Full as e:
+            raise WorkQueueFullError from e
+
+    def _get(self) -> Optional[GithubHttpRequest]:
+        return self._queue.get()
+
+    def _done(self) -> None:
+        self._queue.task_done()
+
+    def _wake_all(self) -> None:
+        for _ in self._threads:
+            self._queue.put(None)
+
+    def join(self) -> None:
+        """Wait until every queued request is handled."""
+        self._queue.join()
+
+
+class SqliteWorkQueue(WorkQueue):
+    """A bounded work queue in a local SQLite database, surviving worker
+    restarts.
+
+    A worker leases the request it claims. The lease expires when the
+    worker does not finish the request in time, for example because its
+    process stopped, so another worker can claim it again. Worker processes
+    may share the database.
+    """
+
+    def __init__(
+        self,
+        handler: WorkHandler,
+        workers: int,
+        size: int,
+        path: str,
+        poll_interval: float = 1.0,
+        lease: float = WORK_QUEUE_LEASE,
+        clock: Callable[[], float] = time,
+        logger: Logger = LOGGER,
+    ):
+        """Initialize an instance of the SqliteWorkQueue class.
+
+        Args:
+            handler (WorkHandler): The function that handles a queued request.
+            workers (int): The number of worker threads.
+            size (int): The maximum number of queued requests.
+            path (str): The path of the SQLite database.
+            poll_interval (float, optional): Seconds an idle worker waits between checks. Defaults to 1.0.
+            lease (float, optional): Seconds a claimed request is reserved for its worker.
+                Defaults to WORK_QUEUE_LEASE.
+            clock (Callable[[], float], optional): The clock. Defaults to time.
+            logger (Logger, optional): The logger. Defaults to LOGGER.
+        """
+        super().__init__(handler=handler, workers=workers, logger=logger)
+        self.size = size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.clock = clock
+        self._owner = f"{getpid()}-{uuid4().hex}"
+        self._lock = Lock()
+        self._available = Condition(self._lock)
+        self._claimed: Dict[int, int] = {}
+        self._running = len(self._threads)
+        self._connection = sqlite_connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS work_items "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, work_item TEXT NOT NULL, "
+            "claimed_by TEXT, claimed_until REAL)"
+        )
+
+    def put(self, hemera_http_request: GithubHttpRequest) -> None:
+        work_item = dump_work_item(hemera_http_request)
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                (queued,) = connection.execute(
+                    "SELECT COUNT(*) FROM work_items"
+                ).fetchone()
+                if queued >= self.size:
+                    raise WorkQueueFullError
+                connection.execute(
+                    "INSERT INTO work_items (work_item) VALUES (?)", (work_item,)
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            self._available.notify()
+
+    def _claim(self) -> Optional[GithubHttpRequest]:
+        """Claim the oldest request that is not leased, the lock must be held.
+
+        Another process may claim the same request at the same time, so the
+        claim only succeeds when the request is still not leased.
+
+        Returns:
+            Optional[GithubHttpRequest]: The request, or None when the queue is empty.
+        """
+        while True:
+            now = self.clock()
+            row = self._connection.execute(
+                "SELECT id, work_item FROM work_items "
+                "WHERE claimed_until IS NULL OR claimed_until <= ? "
+                "ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            work_item_id, work_item = row
+            claimed = self._connection.execute(
+                "UPDATE work_items SET claimed_by = ?, claimed_until = ? "
+                "WHERE id = ? AND (claimed_until IS NULL OR claimed_until <= ?)",
+                (self._owner, now + self.lease, work_item_id, now),
+            ).rowcount
+            if claimed:
+                self._claimed[get_ident()] = work_item_id
+                return load_work_item(work_item)
+
+    def _get(self) -> Optional[GithubHttpRequest]:
+        with self._lock:
+            if self._stopped.is_set():
+                return None
+            hemera_http_request = self._claim()
+            if hemera_http_request is None and not self._stopped.is_set():
+                self._available.wait(self.poll_interval)
+                hemera_http_request = self._claim()
+            return hemera_http_request
+
+    def _done(self) -> None:
+        with self._lock:
+            work_item_id = self._claimed.pop(get_ident(), None)
+            if work_item_id is not None:
+                self._connection.execute(
+                    "DELETE FROM work_items WHERE id = ? AND claimed_by = ?",
+                    (work_item_id, self._owner),
+                )
+
+    def _wake_all(self) -> None:
+        with self._lock:
+            self._available.notify_all()
+
+    def _worker_stopped(self) -> None:
+        with self._lock:
+            self._running -= 1
+            if self._running == 0:
+                self._connection.close()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker threads once they are idle, and close the
+        connection to the database.
+
+        Workers that are still busy when the timeout expires close the
+        connection once the last of them stops.
+
+        Args:
+            timeout (Optional[float], optional): The number of seconds to wait for each worker. Defaults to None.
+        """
+        super().close(timeout)
+        with self._lock:
+            if not any(thread.is_alive() for thread in self._threads):
+                self._connection.close()
+
+
+def _create_work_queue(
+    config: HemeraConfig,
+    handler: WorkHandler,
+) -> Optional[WorkQueue]:
+    """Create and start the work queue for a configuration.
+
+    Args:
+        config (HemeraConfig): The Hemera configuration.
+        handler (WorkHandler): The function that handles a queued request.
+
+    Returns:
+        Optional[WorkQueue]: The started work queue, or None when requests are handled inline.
+    """
+    if config.work_queue_backend == "memory":
+        return InMemoryWorkQueue(
+            handler=handler,
+            workers=config.work_queue_workers,
+            size=config.work_queue_size,
+        ).start()
+    if config.work_queue_backend == "sqlite":
+        return SqliteWorkQueue(
+            handler=handler,
+            workers=config.work_queue_workers,
+            size=config.work_queue_size,
+            path=config.work_queue_sqlite_path,
+        ).start()
+    return None
+
+
+_WORK_QUEUES: Dict[HemeraConfig, Optional[WorkQueue]] = {}
+_WORK_QUEUES_LOCK = Lock()
+
+
+def get_work_queue(
+    config: HemeraConfig,
+    handler: WorkHandler,
+) -> Optional[WorkQueue]:
+    """Return the process-wide work queue for a configuration.
+
+    The work queue of a previous configuration is closed without waiting for
+    its workers. The handler is only used to start the workers of a new
+    work queue.
+
+    Args:
+        config (HemeraConfig): The Hemera configuration.
+        handler (WorkHandler): The function that handles a queued request.
+
+    Returns:
+        Optional[WorkQueue]: The started work queue, or None when requests are handled inline.
+    """
+    with _WORK_QUEUES_LOCK:
+        if config not in _WORK_QUEUES:
+            for stale in _WORK_QUEUES.values():
+                if stale is not None:
+                    stale.close(timeout=0)
+            _WORK_QUEUES.clear()
+            _WORK_QUEUES[config] = _create_work_queue(config, handler)
+        return _WORK_QUEUES[config]
+
+
+def close_work_queue(timeout: Optional[float] = None) -> None:
+    """Close and forget the process-wide work queue.
+
+    Args:
+        timeout (Optional[float], optional): The number of seconds to wait for each worker. Defaults to None.
+    """
+    with _WORK_QUEUES_LOCK:
+        for work_queue in _WORK_QUEUES.values():
+            if work_queue is not None:
+                work_queue.close(timeout)
+        _WORK_QUEUES.clear()
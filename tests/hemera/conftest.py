@@ -4,7 +4,10 @@ from os import environ as os_environ
 import azure.functions as func
 import pytest
 
+from hemera.circuitbreaker import clear_circuit_breakers
+from hemera.config import invalidate_config
 from hemera.dataclasses import HttpRequest
+from hemera.slack import SLACK_RATE_LIMITER
 from hemera.types import HemeraHttpRequest
 from tests.hemera.resources.http_request_data import BODY, HEADER
 
@@ -38,6 +41,7 @@ def set_env_vars():
     os_environ["SLACK_CHANNEL"] = "fake_channel"
     os_environ["HOMEAUTOMATION_WEBHOOK"] = "http://fakeurl.com"
     os_environ["PR_AUTHOR_FILTER"] = "username"
+    invalidate_config()
 
     yield
 
@@ -45,6 +49,19 @@ def set_env_vars():
     os_environ.pop("SLACK_CHANNEL", None)
     os_environ.pop("HOMEAUTOMATION_WEBHOOK", None)
     os_environ.pop("PR_AUTHOR_FILTER", None)
+    invalidate_config()
+
+
+@pytest.fixture(autouse=True)
+def reset_slack_rate_limiter():
+    """Start every test with idle Slack channels."""
+    SLACK_RATE_LIMITER.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Start every test with closed circuit breakers."""
+    clear_circuit_breakers()
 
 
 @pytest.fixture
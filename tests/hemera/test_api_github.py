@@ -1,16 +1,22 @@
+import asyncio
 import json
 from os import environ as os_environ
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import azure.functions as func
 import requests_mock
 
 from github import main as github_api
+from github_async import main as github_api_async
+from hemera.coalesce import get_coalescer
+from hemera.config import get_config, invalidate_config
+from hemera.webhook import _handle_queued_request
 
 
 def test_github_api_environment_variables_not_set(test_request: func.HttpRequest):
     """Test github_api when environment variables are not set."""
     os_environ.pop("SLACK_API_TOKEN", None)
+    invalidate_config()
 
     test = github_api(req=test_request)
     assert test.get_body().decode() == "Error: Environment variable not set."
@@ -63,9 +69,148 @@ def test_github_api_message_sent_to_slack_successfully(
         assert test.status_code == 200
 
 
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_github_api_push_event(api_call: MagicMock):
+    """Test github_api routes a push event to its own message renderer."""
+    with requests_mock.Mocker() as m:
+        m.post("http://fakeurl.com", text="OK")
+
+        test = github_api(
+            req=func.HttpRequest(
+                method="POST",
+                url="/",
+                headers={"x-github-event": "push"},
+                body=json.dumps(
+                    {
+                        "ref": "refs/heads/master",
+                        "compare": "http://fakeurl.com/compare",
+                        "head_commit": {"message": "Commit title"},
+                        "repository": {"full_name": "username/repository_name"},
+                        "sender": {"login": "username"},
+                    }
+                ).encode("utf-8"),
+            )
+        )
+
+        assert api_call.call_args.kwargs["json"]["text"].startswith(
+            "username pushed to refs/heads/master\n"
+        )
+        assert test.status_code == 200
+
+
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_github_api_message_template(
+    api_call: MagicMock, test_request: func.HttpRequest, tmp_path
+):
+    """Test github_api renders the configured message template."""
+    path = tmp_path / "templates.json"
+    path.write_text(
+        json.dumps(
+            {
+                "pull_request": {
+                    "text": "{pullrequesttitle}",
+                    "blocks": [
+                        {
+                            "type": "section",
+                            "text": {"type": "mrkdwn", "text": "*{pullrequesttitle}*"},
+                        }
+                    ],
+                }
+            }
+        )
+    )
+    os_environ["SLACK_MESSAGE_TEMPLATES"] = str(path)
+    invalidate_config()
+
+    with requests_mock.Mocker() as m:
+        m.post("http://fakeurl.com", text="OK")
+
+        test = github_api(req=test_request)
+
+        assert m.last_request.json() == {"message": "PR title"}
+
+    os_environ.pop("SLACK_MESSAGE_TEMPLATES", None)
+
+    assert test.status_code == 200
+    api_call.assert_called_once_with(
+        "chat.postMessage",
+        json={
+            "channel": "fake_channel",
+            "text": "PR title",
+            "blocks": [
+                {"type": "section", "text": {"type": "mrkdwn", "text": "*PR title*"}}
+            ],
+        },
+    )
+
+
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_github_api_routing_rules(
+    api_call: MagicMock, test_request: func.HttpRequest, tmp_path
+):
+    """Test github_api sends one rendered message to every routed target."""
+    path = tmp_path / "rules.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"repository": "username/*", "slack_channels": ["#one", "#two"]},
+                {
+                    "repository": "username/repository_name",
+                    "branch": "master",
+                    "homeautomation_webhooks": "http://lamp.com",
+                },
+            ]
+        )
+    )
+    os_environ["ROUTING_RULES"] = str(path)
+    invalidate_config()
+
+    with requests_mock.Mocker() as m:
+        m.post("http://lamp.com", text="OK")
+
+        test = github_api(req=test_request)
+
+        assert m.call_count == 1
+
+    os_environ.pop("ROUTING_RULES", None)
+
+    assert test.status_code == 200
+    assert [c.kwargs["json"]["channel"] for c in api_call.call_args_list] == [
+        "#one",
+        "#two",
+    ]
+
+
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_github_api_coalesce(api_call: MagicMock, test_request: func.HttpRequest):
+    """Test github_api sends one notification for a burst of pull request
+    events."""
+    os_environ["PR_COALESCE_WINDOW"] = "60"
+    invalidate_config()
+
+    with requests_mock.Mocker() as m:
+        m.post("http://fakeurl.com", text="OK")
+
+        first = github_api(req=test_request)
+        second = github_api(req=test_request)
+        api_call.assert_not_called()
+
+        coalescer = get_coalescer(get_config(), _handle_queued_request)
+        assert coalescer is not None
+        coalescer.flush()
+
+        assert m.call_count == 1
+
+    os_environ.pop("PR_COALESCE_WINDOW", None)
+
+    assert (first.status_code, second.status_code) == (202, 202)
+    api_call.assert_called_once()
+
+
 def test_github_api_username_not_allowed(test_request: func.HttpRequest):
     """Test github_api when the username is not allowed."""
     os_environ["PR_AUTHOR_FILTER"] = "fake_username"
+    invalidate_config()
 
     test = github_api(req=test_request)
     assert test.get_body().decode() == "Error: Unauthorized user."
@@ -86,3 +231,38 @@ def test_github_event_not_supported_error(incorrect_github_event_header: dict):
     )
     assert test.get_body().decode() == "Error: GitHub event not supported."
     assert test.status_code == 400
+
+
+@patch("hemera.handlers.send_request_to_homeautomation_webhook_async")
+@patch("slack_sdk.web.async_client.AsyncWebClient.api_call")
+def test_github_api_async_message_sent_successfully(
+    api_call: AsyncMock,
+    send_request_to_homeautomation_webhook_async: AsyncMock,
+    test_request: func.HttpRequest,
+):
+    """Test github_api_async when the message is sent successfully."""
+    test = asyncio.run(github_api_async(req=test_request))
+
+    api_call.assert_awaited_once()
+    send_request_to_homeautomation_webhook_async.assert_awaited_once()
+    assert test.get_body().decode() == "Automation executed successfully."
+    assert test.status_code == 200
+
+
+def test_github_api_async_username_not_allowed(test_request: func.HttpRequest):
+    """Test github_api_async when the username is not allowed."""
+    os_environ["PR_AUTHOR_FILTER"] = "fake_username"
+    invalidate_config()
+
+    test = asyncio.run(github_api_async(req=test_request))
+    assert test.get_body().decode() == "Error: Unauthorized user."
+    assert test.status_code == 400
+
+
+def test_function_apps_share_one_module():
+    """Test both function apps run the entry points of one hemera module,
+    so they share its outbox, work queue and coalescer."""
+    import hemera.webhook
+
+    assert github_api is hemera.webhook.main
+    assert github_api_async is hemera.webhook.main_async
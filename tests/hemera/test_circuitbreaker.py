@@ -0,0 +1,120 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from hemera.circuitbreaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    get_circuit_breaker,
+    get_circuit_breakers,
+)
+from hemera.dataclasses import CircuitBreakerStats
+from hemera.exceptions import HemeraError
+
+
+def _fail():
+    raise ValueError
+
+
+def test_circuit_breaker():
+    """Test CircuitBreaker opens on failures, rejects calls and closes after a
+    successful probe."""
+    now = [0.0]
+    breaker = CircuitBreaker(
+        "test", failure_rate=0.5, minimum_calls=4, open_seconds=10, clock=lambda: now[0]
+    )
+
+    assert breaker.call(lambda: "ok") == "ok"
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            breaker.call(_fail)
+    assert breaker.state == OPEN
+
+    function = MagicMock()
+    with pytest.raises(HemeraError, match="Circuit breaker test is open."):
+        breaker.call(function)
+    assert breaker.call(function, fallback=lambda: "fallback") == "fallback"
+    function.assert_not_called()
+
+    now[0] = 10.0
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+    assert breaker.state == OPEN
+
+    now[0] = 20.0
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+    assert breaker.stats() == CircuitBreakerStats(
+        name="test", state=CLOSED, calls=6, failures=4, rejected=2, opened=2
+    )
+
+
+def test_circuit_breaker_is_failure():
+    """Test CircuitBreaker ignores errors that are not failures of the
+    downstream."""
+    breaker = CircuitBreaker("test", minimum_calls=1)
+
+    with pytest.raises(ValueError):
+        breaker.call(_fail, is_failure=lambda e: False)
+
+    assert breaker.state == CLOSED
+
+
+def test_circuit_breaker_half_open_probes():
+    """Test CircuitBreaker lets a bounded number of probes through at once."""
+    now = [0.0]
+    breaker = CircuitBreaker("test", minimum_calls=1, clock=lambda: now[0])
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+
+    now[0] = 100.0
+
+    def probe():
+        with pytest.raises(HemeraError, match="is open."):
+            breaker.call(MagicMock())
+
+    breaker.call(probe)
+    assert breaker.state == CLOSED
+
+
+def test_circuit_breaker_call_async():
+    """Test CircuitBreaker rejects coroutine calls while open."""
+    breaker = CircuitBreaker("test", minimum_calls=1)
+    function = AsyncMock(side_effect=ValueError)
+
+    with pytest.raises(ValueError):
+        asyncio.run(breaker.call_async(function))
+    with pytest.raises(HemeraError, match="is open."):
+        asyncio.run(breaker.call_async(function))
+
+    assert function.await_count == 1
+
+
+def test_circuit_breaker_cancelled_probe():
+    """Test a cancelled half-open probe lets the next probe through."""
+    now = [0.0]
+    breaker = CircuitBreaker("test", minimum_calls=1, clock=lambda: now[0])
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+
+    now[0] = 100.0
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(breaker.call_async(AsyncMock(side_effect=asyncio.CancelledError)))
+    with pytest.raises(KeyboardInterrupt):
+        breaker.call(MagicMock(side_effect=KeyboardInterrupt))
+
+    assert breaker.state == HALF_OPEN
+    asyncio.run(breaker.call_async(AsyncMock()))
+    assert breaker.state == CLOSED
+
+
+def test_get_circuit_breaker():
+    """Test get_circuit_breaker returns one breaker per downstream."""
+    breaker = get_circuit_breaker("test")
+
+    assert get_circuit_breaker("test") is breaker
+    assert get_circuit_breakers() == (breaker,)
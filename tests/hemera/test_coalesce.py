@@ -0,0 +1,110 @@
+from dataclasses import replace
+from os import environ as os_environ
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+from hemera.coalesce import Coalescer, get_coalescer, merge_bodies
+from hemera.config import get_config, invalidate_config
+from hemera.dataclasses import HttpRequest
+from hemera.dedup import get_delivery_cache
+from hemera.exceptions import HemeraError
+from hemera.types import HemeraHttpRequest, PushHttpRequest
+from hemera.webhook import _handle_queued_request
+from tests.hemera.resources.http_request_data import HEADER
+
+
+def _pull_request(
+    number: int, action: str, title: str, delivery_id: str = "delivery"
+) -> HemeraHttpRequest:
+    return HemeraHttpRequest(
+        req=HttpRequest(
+            header={**HEADER, "x-github-delivery": delivery_id},
+            body={
+                "action": action,
+                "repository": {"full_name": "username/repository_name"},
+                "pull_request": {
+                    "number": number,
+                    "title": title,
+                    "user": {"login": "username"},
+                },
+            },
+        )
+    )
+
+
+def test_merge_bodies():
+    """Test merge_bodies lets the newer values win."""
+    assert merge_bodies(
+        {"action": "opened", "pull_request": {"title": "old", "number": 1}},
+        {"action": "edited", "pull_request": {"title": "new"}},
+    ) == {"action": "edited", "pull_request": {"title": "new", "number": 1}}
+
+
+def test_coalescer():
+    """Test Coalescer combines the events of a pull request."""
+    handler = MagicMock()
+    coalescer = Coalescer(handler=handler, window=60)
+
+    assert coalescer.submit(_pull_request(1, "opened", "PR title", "d1"))
+    assert coalescer.submit(_pull_request(1, "labeled", "PR title", "d2"))
+    assert coalescer.submit(_pull_request(1, "edited", "New PR title", "d3"))
+    assert coalescer.submit(_pull_request(2, "opened", "Other PR", "d4"))
+    assert not coalescer.submit(PushHttpRequest())
+
+    handler.assert_not_called()
+    coalescer.flush()
+
+    assert handler.call_count == 2
+    (combined, combined_ids), (other, other_ids) = (
+        c.args for c in handler.call_args_list
+    )
+    assert combined_ids == ("d1", "d2", "d3")
+    assert other_ids == ("d4",)
+    assert isinstance(combined, HemeraHttpRequest)
+    assert (combined.action, combined.pullrequesttitle) == ("edited", "New PR title")
+    assert combined.username == "username"
+    assert other.pullrequestnumber == 2
+
+
+def test_coalescer_window():
+    """Test Coalescer handles the combined event when the window closes."""
+    handled = Event()
+    handler = MagicMock(side_effect=lambda *_: handled.set())
+    coalescer = Coalescer(handler=handler, window=0.01)
+
+    coalescer.submit(_pull_request(1, "opened", "PR title"))
+    coalescer.submit(_pull_request(1, "synchronize", "PR title"))
+
+    assert handled.wait(5)
+    handler.assert_called_once()
+    assert handler.call_args.args[0].action == "synchronize"
+
+
+def test_get_coalescer():
+    """Test events are not coalesced by default."""
+    assert get_coalescer(get_config(), MagicMock()) is None
+
+    config = replace(get_config(), pr_coalesce_window=60)
+    coalescer = get_coalescer(config, MagicMock())
+    assert coalescer is not None
+    assert get_coalescer(config, MagicMock()) is coalescer
+    assert get_coalescer(get_config(), MagicMock()) is None
+
+
+@patch("hemera.webhook._create_automation_handler", side_effect=HemeraError("Failed."))
+def test_handle_coalesced_request_forgets_every_delivery(_: MagicMock):
+    """Test every delivery combined into a failed event is forgotten, so
+    GitHub's redeliveries are handled again."""
+    os_environ["DELIVERY_DEDUP_BACKEND"] = "memory"
+    invalidate_config()
+    delivery_cache = get_delivery_cache(get_config())
+    assert delivery_cache is not None
+    for delivery_id in ("d1", "d2"):
+        delivery_cache.add(delivery_id)
+
+    _handle_queued_request(_pull_request(1, "edited", "PR title", "d2"), ("d1", "d2"))
+
+    assert delivery_cache.add("d1")
+    assert delivery_cache.add("d2")
+
+    os_environ.pop("DELIVERY_DEDUP_BACKEND", None)
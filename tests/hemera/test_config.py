@@ -0,0 +1,72 @@
+from os import environ as os_environ
+
+import pytest
+
+from hemera.config import get_config, invalidate_config, load_config, reload_config
+from hemera.dataclasses import HemeraConfig
+from hemera.exceptions import HemeraError
+
+
+def test_load_config():
+    """Test load_config."""
+    assert load_config() == HemeraConfig(
+        slack_api_token="fake_token",
+        slack_channel="fake_channel",
+        homeautomation_webhook="http://fakeurl.com",
+        pr_author_filter="username",
+    )
+
+
+def test_load_config_environment_variables_not_set():
+    """Test load_config when environment variables are not set."""
+    os_environ.pop("SLACK_CHANNEL", None)
+
+    with pytest.raises(HemeraError, match="Environment variable not set."):
+        _ = load_config()
+
+
+def test_get_config_is_cached():
+    """Test get_config returns the same instance until invalidated."""
+    config = get_config()
+    os_environ["SLACK_CHANNEL"] = "other_channel"
+
+    assert get_config() is config
+
+    invalidate_config()
+    assert get_config().slack_channel == "other_channel"
+
+
+def test_reload_config():
+    """Test reload_config."""
+    config = get_config()
+    os_environ["PR_AUTHOR_FILTER"] = "other_username"
+
+    assert reload_config() is not config
+    assert get_config().pr_author_filter == "other_username"
+
+
+def test_config_is_immutable():
+    """Test HemeraConfig cannot be modified."""
+    with pytest.raises(AttributeError):
+        get_config().slack_channel = "other_channel"  # type: ignore
+
+
+def test_load_config_invalid_environment_variable():
+    """Test load_config when an environment variable has an invalid value."""
+    os_environ["DELIVERY_DEDUP_BACKEND"] = "redis"
+
+    with pytest.raises(
+        HemeraError, match="Environment variable DELIVERY_DEDUP_BACKEND is invalid."
+    ):
+        _ = load_config()
+
+    os_environ["DELIVERY_DEDUP_BACKEND"] = "memory"
+    os_environ["DELIVERY_DEDUP_TTL"] = "one hour"
+
+    with pytest.raises(
+        HemeraError, match="Environment variable DELIVERY_DEDUP_TTL is invalid."
+    ):
+        _ = load_config()
+
+    os_environ.pop("DELIVERY_DEDUP_BACKEND", None)
+    os_environ.pop("DELIVERY_DEDUP_TTL", None)
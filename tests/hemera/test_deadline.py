@@ -0,0 +1,30 @@
+import pytest
+
+from hemera.deadline import Deadline, create_deadline
+from hemera.exceptions import HemeraError
+
+
+def test_deadline():
+    """Test Deadline derives timeouts from the remaining budget."""
+    now = [100.0]
+    deadline = Deadline(budget=9, clock=lambda: now[0])
+
+    assert deadline.remaining() == 9
+    assert deadline.timeout(5) == 5
+    assert deadline.timeout() == 9
+
+    now[0] = 106.0
+    assert deadline.timeout(5) == 3
+    assert not deadline.expired
+
+    now[0] = 110.0
+    assert deadline.remaining() == 0
+    assert deadline.expired
+    with pytest.raises(HemeraError, match="Deadline exceeded."):
+        deadline.timeout(5)
+
+
+def test_create_deadline():
+    """Test create_deadline without a budget."""
+    assert create_deadline(0) is None
+    assert create_deadline(9).budget == 9
@@ -0,0 +1,158 @@
+from os import environ as os_environ
+from os.path import join as path_join
+from unittest.mock import MagicMock, patch
+
+import azure.functions as func
+import pytest
+
+from github import main as github_api
+from hemera.config import get_config, invalidate_config
+from hemera.dedup import InMemoryDeliveryCache, SqliteDeliveryCache, get_delivery_cache
+from hemera.exceptions import DeliveryCacheError
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def delivery_cache(request, tmp_path):
+    """Delivery cache for every backend, with a fake clock."""
+    clock = FakeClock()
+    if request.param == "memory":
+        cache = InMemoryDeliveryCache(ttl=10, max_entries=2, clock=clock)
+    else:
+        cache = SqliteDeliveryCache(
+            path=path_join(tmp_path, "deliveries.sqlite3"),
+            ttl=10,
+            max_entries=2,
+            clock=clock,
+        )
+    return cache, clock
+
+
+def test_delivery_cache_add(delivery_cache):
+    """Test a delivery ID is only new once within the TTL."""
+    cache, clock = delivery_cache
+
+    assert cache.add("delivery-1")
+    assert not cache.add("delivery-1")
+
+    clock.now = 10.0
+    assert cache.add("delivery-1")
+
+
+def test_delivery_cache_max_entries(delivery_cache):
+    """Test the oldest delivery IDs are evicted first."""
+    cache, clock = delivery_cache
+
+    for delivery_id in ("delivery-1", "delivery-2", "delivery-3"):
+        clock.now += 1
+        assert cache.add(delivery_id)
+
+    assert not cache.add("delivery-3")
+    assert cache.add("delivery-1")
+
+
+def test_delivery_cache_discard(delivery_cache):
+    """Test a discarded delivery ID is processed again."""
+    cache, _ = delivery_cache
+
+    assert cache.add("delivery-1")
+    cache.discard("delivery-1")
+    assert cache.add("delivery-1")
+
+
+def test_sqlite_delivery_cache_error(tmp_path):
+    """Test SqliteDeliveryCache treats a delivery it cannot record as not
+    seen, and raises other SQLite errors as DeliveryCacheError."""
+    logger = MagicMock()
+    cache = SqliteDeliveryCache(
+        path=path_join(tmp_path, "deliveries.sqlite3"),
+        ttl=10,
+        max_entries=2,
+        logger=logger,
+    )
+    cache._connection.execute("DROP TABLE deliveries")
+
+    assert cache.add("delivery-1")
+    assert cache.add("delivery-1")
+    assert logger.error.call_count == 2
+    with pytest.raises(DeliveryCacheError):
+        cache.discard("delivery-1")
+
+
+def test_get_delivery_cache():
+    """Test get_delivery_cache is disabled by default and reused per
+    configuration."""
+    assert get_delivery_cache(get_config()) is None
+
+    os_environ["DELIVERY_DEDUP_BACKEND"] = "memory"
+    invalidate_config()
+
+    delivery_cache = get_delivery_cache(get_config())
+    assert isinstance(delivery_cache, InMemoryDeliveryCache)
+    assert get_delivery_cache(get_config()) is delivery_cache
+
+    os_environ.pop("DELIVERY_DEDUP_BACKEND", None)
+
+
+@patch("hemera.homeautomation.send_request_to_homeautomation_webhook")
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_github_api_duplicate_delivery(
+    api_call: MagicMock,
+    send_request_to_homeautomation_webhook: MagicMock,
+    test_request: func.HttpRequest,
+):
+    """Test github_api only handles a redelivery once."""
+    os_environ["DELIVERY_DEDUP_BACKEND"] = "memory"
+    invalidate_config()
+
+    first = github_api(req=test_request)
+    second = github_api(req=test_request)
+
+    assert first.status_code == 200
+    assert second.get_body().decode() == "Delivery already processed."
+    assert second.status_code == 200
+    api_call.assert_called_once()
+    send_request_to_homeautomation_webhook.assert_called_once()
+
+    os_environ.pop("DELIVERY_DEDUP_BACKEND", None)
+
+
+def test_github_api_failed_delivery_is_forgotten(test_request: func.HttpRequest):
+    """Test github_api handles a redelivery again after a failure."""
+    os_environ["DELIVERY_DEDUP_BACKEND"] = "memory"
+    os_environ["PR_AUTHOR_FILTER"] = "fake_username"
+    invalidate_config()
+
+    assert github_api(req=test_request).get_body().decode() == (
+        "Error: Unauthorized user."
+    )
+    assert github_api(req=test_request).get_body().decode() == (
+        "Error: Unauthorized user."
+    )
+
+    os_environ.pop("DELIVERY_DEDUP_BACKEND", None)
+
+
+@patch("hemera.webhook._accept_request", side_effect=RuntimeError("boom"))
+def test_github_api_unexpected_error_is_forgotten(
+    _accept_request: MagicMock, test_request: func.HttpRequest
+):
+    """Test github_api forgets a delivery failing with an unexpected error."""
+    os_environ["DELIVERY_DEDUP_BACKEND"] = "memory"
+    invalidate_config()
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            github_api(req=test_request)
+    assert _accept_request.call_count == 2
+
+    os_environ.pop("DELIVERY_DEDUP_BACKEND", None)
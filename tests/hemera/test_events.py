@@ -0,0 +1,41 @@
+import json
+
+from hemera.events import ProjectionDecoder, create_projection_extractor
+from hemera.slack import create_slack_message
+from hemera.types import HemeraHttpRequest
+from tests.hemera.resources.http_request_data import BODY, HEADER
+
+RAW_BODY = json.dumps(BODY).encode("utf-8")
+
+
+def test_projection_decoder_decode():
+    """Test ProjectionDecoder drops the keys that are not on a field path."""
+    body = ProjectionDecoder(HemeraHttpRequest.FIELDS).decode(RAW_BODY)
+
+    assert set(body) == {"action", "number", "pull_request", "repository"}
+    assert body["repository"]["full_name"] == "username/repository_name"
+    assert "owner" not in body["repository"]
+    assert "avatar_url" not in body["pull_request"]["user"]
+
+
+def test_projection_extractor(hemera_http_request):
+    """Test a projected request renders the same message as the full
+    payload, and keeps the headers it was given."""
+    projected = create_projection_extractor(HemeraHttpRequest)(HEADER, RAW_BODY)
+
+    assert projected.req.header is HEADER
+    assert projected.githubevent == "pull_request"
+    assert projected.pullrequestnumber == 17
+    assert create_slack_message(hemera_http_request=projected) == (
+        create_slack_message(hemera_http_request=hemera_http_request)
+    )
+
+
+def test_projection_extractor_missing_fields():
+    """Test a projected request when fields are missing."""
+    projected = create_projection_extractor(HemeraHttpRequest)(
+        HEADER, b'{"number": 17}'
+    )
+
+    assert projected.pullrequestnumber == 17
+    assert projected.req.body == {"number": 17}
@@ -1,7 +1,10 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from hemera.deadline import Deadline
 from hemera.exceptions import HemeraError
 from hemera.handlers import AutomationHandler
 from hemera.types import HemeraHttpRequest
@@ -27,3 +30,182 @@ def test_automation_handler_exceptions(api_call=MagicMock()):
         handler._send_request_to_homeautomation_webhook()
 
     api_call.assert_not_called()
+
+
+@patch("hemera.handlers.send_request_to_homeautomation_webhook_async")
+@patch("hemera.handlers.send_slack_message_async")
+def test_automation_handler_handle_request_async(
+    send_slack_message_async: AsyncMock,
+    send_request_to_homeautomation_webhook_async: AsyncMock,
+    hemera_http_request: HemeraHttpRequest,
+):
+    """Test AutomationHandler sends to both sinks concurrently."""
+    handler = AutomationHandler(
+        slack_api_token="fake_token",
+        slack_channel="fake_channel",
+        homeautomation_webhook="http://fakeurl.com",
+    )
+
+    asyncio.run(handler.handle_request_async(hemera_http_request=hemera_http_request))
+
+    send_slack_message_async.assert_awaited_once_with(
+        slack_api_token="fake_token",
+        channel="fake_channel",
+        message=handler.message,
+        blocks=None,
+        deadline=None,
+    )
+    send_request_to_homeautomation_webhook_async.assert_awaited_once_with(
+        homeautomation_webhook="http://fakeurl.com",
+        message=handler.message,
+        timeout=5.0,
+        deadline=None,
+        retries=2,
+    )
+
+
+@patch("hemera.handlers.send_request_to_homeautomation_webhook_async")
+@patch("hemera.handlers.send_slack_message_async", side_effect=HemeraError)
+def test_automation_handler_handle_request_async_error(
+    send_slack_message_async: AsyncMock,
+    send_request_to_homeautomation_webhook_async: AsyncMock,
+    hemera_http_request: HemeraHttpRequest,
+):
+    """Test AutomationHandler awaits every sink before raising."""
+    handler = AutomationHandler(
+        slack_api_token="fake_token",
+        slack_channel="fake_channel",
+        homeautomation_webhook="http://fakeurl.com",
+    )
+
+    with pytest.raises(HemeraError, match="Error in AutomationHandler class."):
+        asyncio.run(
+            handler.handle_request_async(hemera_http_request=hemera_http_request)
+        )
+
+    send_request_to_homeautomation_webhook_async.assert_awaited_once()
+
+
+@patch("hemera.homeautomation.send_request_to_homeautomation_webhook")
+@patch("hemera.handlers.send_slack_message")
+def test_automation_handler_fan_out(
+    send_slack_message: MagicMock,
+    send_request_to_homeautomation_webhook: MagicMock,
+    hemera_http_request: HemeraHttpRequest,
+):
+    """Test AutomationHandler renders once and sends to every target."""
+    message_renderer = MagicMock(return_value="message")
+    send_slack_message.side_effect = [HemeraError, None]
+    handler = AutomationHandler(
+        slack_api_token="fake_token",
+        slack_channel=("#one", "#two"),
+        homeautomation_webhook=("http://one", "http://two"),
+        message_renderer=message_renderer,
+    )
+
+    send_request_to_homeautomation_webhook.side_effect = [None, HemeraError]
+
+    with pytest.raises(HemeraError, match="Error in AutomationHandler class."):
+        handler.handle_request(hemera_http_request=hemera_http_request)
+
+    message_renderer.assert_called_once_with(hemera_http_request)
+    assert [c.kwargs["channel"] for c in send_slack_message.call_args_list] == [
+        "#one",
+        "#two",
+    ]
+    assert sorted(
+        c.kwargs["homeautomation_webhook"]
+        for c in send_request_to_homeautomation_webhook.call_args_list
+    ) == ["http://one", "http://two"]
+    assert [
+        result.homeautomation_webhook for result in handler.homeautomation_results
+    ] == ["http://one", "http://two"]
+    assert handler.report is not None
+    assert handler.report.failed == ("slack", "homeautomation")
+    assert sum(not result.ok for result in handler.homeautomation_results) == 1
+
+
+@patch("hemera.homeautomation.send_request_to_homeautomation_webhook")
+@patch("hemera.handlers.send_slack_message")
+def test_automation_handler_defers_failed_targets(
+    send_slack_message: MagicMock,
+    send_request_to_homeautomation_webhook: MagicMock,
+    hemera_http_request: HemeraHttpRequest,
+):
+    """Test AutomationHandler stores only the failed targets in the outbox,
+    and sends again to a single target."""
+    outbox = MagicMock()
+    send_slack_message.side_effect = [None, HemeraError]
+    send_request_to_homeautomation_webhook.side_effect = [HemeraError, None]
+    handler = AutomationHandler(
+        slack_api_token="fake_token",
+        slack_channel=("#one", "#two"),
+        homeautomation_webhook=("http://one", "http://two"),
+        homeautomation_executor=ThreadPoolExecutor(max_workers=1),
+        outbox=outbox,
+    )
+
+    handler.handle_request(hemera_http_request=hemera_http_request)
+
+    outbox.add.assert_called_once_with(
+        hemera_http_request, [("slack", "#two"), ("homeautomation", "http://one")]
+    )
+    assert handler.deferred == ("slack", "homeautomation")
+
+    send_slack_message.reset_mock(side_effect=True)
+    handler.handle_sink(hemera_http_request, "slack", "#two")
+
+    send_slack_message.assert_called_once()
+    assert send_slack_message.call_args.kwargs["channel"] == "#two"
+
+
+@patch("hemera.handlers.send_request_to_homeautomation_webhook_async")
+@patch("hemera.handlers.send_slack_message_async")
+def test_automation_handler_defers_failed_targets_async(
+    send_slack_message_async: AsyncMock,
+    send_request_to_homeautomation_webhook_async: AsyncMock,
+    hemera_http_request: HemeraHttpRequest,
+):
+    """Test AutomationHandler stores only the failed targets in the outbox
+    without blocking."""
+    outbox = MagicMock()
+    send_slack_message_async.side_effect = [HemeraError, None]
+    handler = AutomationHandler(
+        slack_api_token="fake_token",
+        slack_channel=("#one", "#two"),
+        homeautomation_webhook="http://fakeurl.com",
+        outbox=outbox,
+    )
+
+    asyncio.run(handler.handle_request_async(hemera_http_request=hemera_http_request))
+
+    outbox.add.assert_called_once_with(hemera_http_request, [("slack", "#one")])
+
+
+@patch("hemera.homeautomation.get_homeautomation_session")
+@patch("hemera.slack.SLACK_CLIENTS")
+def test_automation_handler_deadline_exceeded(
+    slack_clients: MagicMock,
+    get_homeautomation_session: MagicMock,
+    hemera_http_request: HemeraHttpRequest,
+):
+    """Test AutomationHandler skips the sinks once the deadline passed."""
+    handler = AutomationHandler(
+        slack_api_token="fake_token",
+        slack_channel="fake_channel",
+        homeautomation_webhook=("http://one", "http://two"),
+        deadline=Deadline(0),
+    )
+    handler._create_slack_message(hemera_http_request=hemera_http_request)
+
+    with pytest.raises(HemeraError, match="Error in AutomationHandler class."):
+        handler._send_slack_message()
+    with pytest.raises(HemeraError, match="Error in AutomationHandler class."):
+        handler._send_request_to_homeautomation_webhook()
+
+    slack_clients.get.return_value.chat_postMessage.assert_not_called()
+    get_homeautomation_session.return_value.post.assert_not_called()
+    assert [str(result.error) for result in handler.homeautomation_results] == [
+        "Deadline exceeded.",
+        "Deadline exceeded.",
+    ]
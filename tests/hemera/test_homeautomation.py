@@ -1,7 +1,31 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
+import requests_mock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from requests import HTTPError, Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from urllib3.exceptions import MaxRetryError, NewConnectionError
 
+from hemera.circuitbreaker import CLOSED
+from hemera.deadline import Deadline
 from hemera.exceptions import HemeraError
-from hemera.homeautomation import send_request_to_homeautomation_webhook
+from hemera.homeautomation import (
+    close_homeautomation_client_session,
+    get_homeautomation_circuit_breaker,
+    get_homeautomation_client_session,
+    get_homeautomation_session,
+    send_request_to_homeautomation_webhook,
+    send_request_to_homeautomation_webhook_async,
+    send_request_to_homeautomation_webhooks,
+    split_homeautomation_webhooks,
+)
 
 
 def test_send_request_to_homeautomation_webhook_error() -> None:
@@ -12,3 +36,281 @@ def test_send_request_to_homeautomation_webhook_error() -> None:
         homeautomation_webhook="http://fakeurl.com",
         message="Test message.",
     )
+
+
+def test_send_request_to_homeautomation_webhook_async_error() -> None:
+    """Test send_request_to_homeautomation_webhook_async error."""
+    with pytest.raises(HemeraError, match="Error running Home Automation webhook."):
+        asyncio.run(
+            send_request_to_homeautomation_webhook_async(
+                homeautomation_webhook="http://fakeurl.com",
+                message="Test message.",
+            )
+        )
+
+
+@patch("hemera.homeautomation.async_sleep", new_callable=AsyncMock)
+def test_send_request_to_homeautomation_webhook_async_retry_status(
+    async_sleep: AsyncMock,
+) -> None:
+    """Test send_request_to_homeautomation_webhook_async retries the retry
+    statuses over the session of the running event loop."""
+    statuses = [429, 503, 200]
+    sessions = []
+
+    async def webhook(request: web.Request) -> web.Response:
+        assert await request.json() == {"message": "Test message."}
+        return web.Response(status=statuses.pop(0), headers={"Retry-After": "1"})
+
+    async def send() -> None:
+        app = web.Application()
+        app.router.add_post("/webhook", webhook)
+        async with TestServer(app) as server:
+            for _ in range(2):
+                sessions.append(get_homeautomation_client_session())
+                statuses[:] = [429, 503, 200]
+                await send_request_to_homeautomation_webhook_async(
+                    homeautomation_webhook=str(server.make_url("/webhook")),
+                    message="Test message.",
+                )
+        await close_homeautomation_client_session()
+
+    asyncio.run(send())
+
+    assert sessions[0] is sessions[1]
+    assert sessions[0].closed
+    assert [c.args for c in async_sleep.await_args_list] == [(1.0,)] * 4
+
+
+@patch("hemera.homeautomation.async_sleep", new_callable=AsyncMock)
+def test_send_request_to_homeautomation_webhook_async_retry_connect_error(
+    async_sleep: AsyncMock,
+) -> None:
+    """Test send_request_to_homeautomation_webhook_async retries connection
+    errors with a jittered exponential backoff, up to the retries."""
+
+    async def send() -> None:
+        try:
+            await send_request_to_homeautomation_webhook_async(
+                homeautomation_webhook="http://127.0.0.1:1/webhook",
+                message="Test message.",
+                retries=2,
+            )
+        finally:
+            await close_homeautomation_client_session()
+
+    with pytest.raises(HemeraError):
+        asyncio.run(send())
+
+    delays = [c.args[0] for c in async_sleep.await_args_list]
+    assert len(delays) == 2
+    assert 0.1 <= delays[0] <= 0.2
+    assert 0.2 <= delays[1] <= 0.4
+
+
+def test_send_request_to_homeautomation_webhook() -> None:
+    """Test send_request_to_homeautomation_webhook sends a JSON body."""
+    with requests_mock.Mocker() as m:
+        m.post("http://fakeurl.com", text="OK")
+
+        send_request_to_homeautomation_webhook(
+            homeautomation_webhook="http://fakeurl.com",
+            message="Test message.",
+        )
+
+        assert m.last_request.headers["Content-Type"] == "application/json"
+        assert m.last_request.json() == {"message": "Test message."}
+
+
+def test_send_request_to_homeautomation_webhook_session() -> None:
+    """Test send_request_to_homeautomation_webhook uses the given session and
+    timeout."""
+    session = MagicMock(spec=Session)
+
+    send_request_to_homeautomation_webhook(
+        homeautomation_webhook="http://fakeurl.com",
+        message="Test message.",
+        timeout=1.5,
+        session=session,
+    )
+
+    session.post.assert_called_once()
+    assert session.post.call_args.kwargs["timeout"] == 1.5
+
+
+def test_get_homeautomation_session() -> None:
+    """Test get_homeautomation_session returns one pooled session that does
+    not retry by itself."""
+    session = get_homeautomation_session(pool_size=4, pool_hosts=2)
+
+    assert get_homeautomation_session(pool_size=4, pool_hosts=2) is session
+    adapter = cast(HTTPAdapter, session.get_adapter("https://fakeurl.com"))
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 4
+    assert adapter.poolmanager.pools._maxsize == 2
+    assert adapter.max_retries.total == 0
+
+
+@patch("hemera.homeautomation.sleep")
+def test_send_request_to_homeautomation_webhook_retry_status(
+    sleep: MagicMock,
+) -> None:
+    """Test send_request_to_homeautomation_webhook retries the retry statuses
+    after their Retry-After, but not other errors."""
+    with requests_mock.Mocker() as m:
+        m.post(
+            "http://fakeurl.com",
+            [
+                {"status_code": 429, "headers": {"Retry-After": "1"}},
+                {"status_code": 503},
+                {"status_code": 500},
+            ],
+        )
+
+        with pytest.raises(HemeraError):
+            send_request_to_homeautomation_webhook(
+                homeautomation_webhook="http://fakeurl.com",
+                message="Test message.",
+                retries=5,
+            )
+
+        assert m.call_count == 3
+    assert sleep.call_args_list[0].args == (1.0,)
+    assert 0.2 <= sleep.call_args_list[1].args[0] <= 0.4
+
+
+@patch("hemera.homeautomation.sleep")
+def test_send_request_to_homeautomation_webhook_retry_connect_error(
+    sleep: MagicMock,
+) -> None:
+    """Test send_request_to_homeautomation_webhook retries connection errors
+    with a jittered exponential backoff, up to the retries."""
+    error = RequestsConnectionError(
+        MaxRetryError(MagicMock(), "/", NewConnectionError(MagicMock(), "Refused."))
+    )
+    with requests_mock.Mocker() as m:
+        m.post("http://fakeurl.com", exc=error)
+
+        with pytest.raises(HemeraError):
+            send_request_to_homeautomation_webhook(
+                homeautomation_webhook="http://fakeurl.com",
+                message="Test message.",
+                retries=2,
+            )
+
+        assert m.call_count == 3
+    delays = [c.args[0] for c in sleep.call_args_list]
+    assert 0.1 <= delays[0] <= 0.2
+    assert 0.2 <= delays[1] <= 0.4
+
+
+@patch("hemera.homeautomation.sleep")
+def test_send_request_to_homeautomation_webhook_retry_after_timeout(
+    sleep: MagicMock,
+) -> None:
+    """Test send_request_to_homeautomation_webhook does not wait for a
+    Retry-After longer than the timeout."""
+    with requests_mock.Mocker() as m:
+        m.post("http://fakeurl.com", status_code=429, headers={"Retry-After": "60"})
+
+        with pytest.raises(HemeraError):
+            send_request_to_homeautomation_webhook(
+                homeautomation_webhook="http://fakeurl.com",
+                message="Test message.",
+                timeout=5.0,
+            )
+
+        assert m.call_count == 1
+    sleep.assert_not_called()
+
+
+@patch("hemera.homeautomation.sleep")
+def test_send_request_to_homeautomation_webhook_retry_deadline(
+    sleep: MagicMock,
+) -> None:
+    """Test send_request_to_homeautomation_webhook does not retry past the
+    deadline and bounds every attempt by the remaining budget."""
+    now = [0.0]
+    deadline = Deadline(budget=2.0, clock=lambda: now[0])
+    session = MagicMock(spec=Session)
+    session.post.return_value.status_code = 503
+    session.post.return_value.headers = {"Retry-After": "5"}
+    session.post.return_value.raise_for_status.side_effect = HTTPError
+    now[0] = 0.5
+
+    with pytest.raises(HemeraError):
+        send_request_to_homeautomation_webhook(
+            homeautomation_webhook="http://fakeurl.com",
+            message="Test message.",
+            session=session,
+            deadline=deadline,
+            retries=5,
+        )
+
+    session.post.assert_called_once()
+    assert session.post.call_args.kwargs["timeout"] == 1.5
+    sleep.assert_not_called()
+
+
+def test_split_homeautomation_webhooks() -> None:
+    """Test split_homeautomation_webhooks splits a comma-separated list."""
+    assert split_homeautomation_webhooks("http://one") == ("http://one",)
+    assert split_homeautomation_webhooks(" http://one, http://two ,") == (
+        "http://one",
+        "http://two",
+    )
+
+
+def test_send_request_to_homeautomation_webhooks() -> None:
+    """Test send_request_to_homeautomation_webhooks sends to every webhook
+    concurrently and returns a result per webhook."""
+    barrier = Barrier(3, timeout=5)
+
+    def send(homeautomation_webhook, **kwargs):
+        # Only returns when all three webhooks are sent to at the same time.
+        barrier.wait()
+        if homeautomation_webhook == "http://two":
+            raise HemeraError
+
+    with patch(
+        "hemera.homeautomation.send_request_to_homeautomation_webhook",
+        side_effect=send,
+    ), ThreadPoolExecutor(max_workers=3) as executor:
+        results = send_request_to_homeautomation_webhooks(
+            homeautomation_webhooks=("http://one", "http://two", "http://three"),
+            message="Test message.",
+            executor=executor,
+        )
+
+    assert [result.homeautomation_webhook for result in results] == [
+        "http://one",
+        "http://two",
+        "http://three",
+    ]
+    assert [result.ok for result in results] == [True, False, True]
+    assert all(result.latency >= 0 for result in results)
+
+
+def test_send_request_to_homeautomation_webhook_circuit_breaker() -> None:
+    """Test send_request_to_homeautomation_webhook fails fast while Home
+    Assistant is down, per host."""
+    session = MagicMock(spec=Session)
+    session.post.side_effect = ConnectionError
+
+    for _ in range(5):
+        with pytest.raises(HemeraError, match="Error running Home Automation webhook."):
+            send_request_to_homeautomation_webhook(
+                homeautomation_webhook="http://fakeurl.com/api/webhook/one",
+                message="Test message.",
+                session=session,
+            )
+    with pytest.raises(
+        HemeraError, match="Circuit breaker homeautomation:fakeurl.com is open."
+    ):
+        send_request_to_homeautomation_webhook(
+            homeautomation_webhook="http://fakeurl.com/api/webhook/two",
+            message="Test message.",
+            session=session,
+        )
+
+    assert session.post.call_count == 5
+    assert get_homeautomation_circuit_breaker("http://other.com").state == CLOSED
@@ -1,9 +1,15 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
 from toml import load
 
 from hemera.dataclasses import PythonVersion
 from hemera.exceptions import HemeraError
-from hemera.metadata import get_software_versions
+from hemera.metadata import (
+    _get_distribution_version,
+    get_hemera_version,
+    get_software_versions,
+)
 
 
 def test_get_software_versions():
@@ -17,3 +23,15 @@ def test_get_software_versions():
 
     with pytest.raises(HemeraError, match="Software versions not found."):
         _ = get_software_versions("nonexistent")
+
+
+@patch("hemera.metadata.version", return_value="1.2.3")
+def test_get_software_versions_is_resolved_once(version: MagicMock):
+    """Test the distribution version is only looked up once per process."""
+    _get_distribution_version.cache_clear()
+
+    assert get_software_versions("hemera") == PythonVersion(package={"hemera": "1.2.3"})
+    assert get_hemera_version() == "1.2.3"
+
+    version.assert_called_once_with("hemera")
+    _get_distribution_version.cache_clear()
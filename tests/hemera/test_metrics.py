@@ -0,0 +1,126 @@
+import asyncio
+from threading import Thread
+from unittest.mock import MagicMock, patch
+
+import azure.functions as func
+import pytest
+
+from github import main as github_api
+from hemera.circuitbreaker import get_circuit_breaker
+from hemera.exceptions import HemeraError
+from hemera.handlers import AutomationHandler
+from hemera.metrics import METRICS, Metrics, measure_requests
+from hemera.types import HemeraHttpRequest
+from metrics import main as metrics_api
+
+
+def test_metrics():
+    """Test Metrics sums the shards of every thread."""
+    metrics = Metrics(buckets=(0.1, 1.0)).describe(
+        "test_seconds", "histogram", "Test latency."
+    )
+
+    def record():
+        metrics.inc("test_total", (("sink", "slack"),))
+        metrics.observe("test_seconds", 0.05)
+        metrics.observe("test_seconds", 2.0)
+
+    threads = [Thread(target=record) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with metrics.time("test_seconds"):
+        pass
+
+    assert metrics.render() == (
+        "# TYPE test_total counter\n"
+        'test_total{sink="slack"} 3\n'
+        "# HELP test_seconds Test latency.\n"
+        "# TYPE test_seconds histogram\n"
+        'test_seconds_bucket{le="0.1"} 4\n'
+        'test_seconds_bucket{le="1"} 4\n'
+        'test_seconds_bucket{le="+Inf"} 7\n'
+        f"test_seconds_sum {metrics.collect()[1][('test_seconds', ())][-1]!r}\n"
+        "test_seconds_count 7\n"
+    )
+
+    metrics.clear()
+    assert metrics.render() == ""
+
+
+def test_measure_requests():
+    """Test measure_requests counts responses of functions and coroutine
+    functions, also when they fail."""
+    with patch("hemera.metrics.METRICS", Metrics()) as metrics:
+        measure_requests(lambda req: func.HttpResponse("", status_code=202))(None)
+
+        async def fail(req):
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            asyncio.run(measure_requests(fail)(None))
+
+        counters, histograms = metrics.collect()
+
+    assert counters == {
+        ("hemera_requests_total", (("status", "202"),)): 1.0,
+        ("hemera_requests_total", (("status", "500"),)): 1.0,
+    }
+    assert sum(histograms[("hemera_request_seconds", ())][:-1]) == 2
+
+
+@patch("hemera.homeautomation.send_request_to_homeautomation_webhook")
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_metrics_api(
+    api_call: MagicMock,
+    send_request_to_homeautomation_webhook: MagicMock,
+    test_request: func.HttpRequest,
+):
+    """Test metrics_api serves the metrics of handled deliveries."""
+    METRICS.clear()
+    get_circuit_breaker("slack")
+
+    assert github_api(req=test_request).status_code == 200
+    test = metrics_api(req=MagicMock())
+
+    assert test.status_code == 200
+    assert test.mimetype == "text/plain"
+    body = test.get_body().decode()
+    assert 'hemera_requests_total{status="200"} 1\n' in body
+    for stage in ("prefilter", "parse", "filter", "render", "send"):
+        assert f'hemera_stage_seconds_count{{stage="{stage}"}} 1\n' in body
+    for sink in ("slack", "homeautomation"):
+        assert f'hemera_sink_seconds_count{{sink="{sink}"}} 1\n' in body
+    assert 'hemera_circuit_breaker_state{downstream="slack"} 0\n' in body
+    assert "hemera_slack_rate_limited_total 0\n" in body
+
+
+@patch("hemera.homeautomation.send_request_to_homeautomation_webhook")
+@patch("hemera.handlers.send_slack_message", side_effect=[HemeraError, None])
+def test_metrics_handle_sink(
+    send_slack_message: MagicMock,
+    send_request_to_homeautomation_webhook: MagicMock,
+    hemera_http_request: HemeraHttpRequest,
+):
+    """Test the sinks sent again by the outbox are measured."""
+    handler = AutomationHandler(
+        slack_api_token="fake_token",
+        slack_channel="fake_channel",
+        homeautomation_webhook="http://fakeurl.com",
+    )
+
+    with patch("hemera.handlers.METRICS", Metrics()) as metrics:
+        with pytest.raises(HemeraError):
+            handler.handle_sink(hemera_http_request, "slack")
+        handler.handle_sink(hemera_http_request, "slack")
+        handler.handle_sink(hemera_http_request, "homeautomation")
+
+        counters, histograms = metrics.collect()
+
+    assert counters == {("hemera_sink_errors_total", (("sink", "slack"),)): 1.0}
+    assert sum(histograms[("hemera_sink_seconds", (("sink", "slack"),))][:-1]) == 2
+    assert (
+        sum(histograms[("hemera_sink_seconds", (("sink", "homeautomation"),))][:-1])
+        == 1
+    )
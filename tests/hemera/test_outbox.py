@@ -0,0 +1,190 @@
+from dataclasses import replace
+from os import environ as os_environ
+from os.path import join as path_join
+from sqlite3 import ProgrammingError
+from time import time
+from unittest.mock import MagicMock, patch
+
+import azure.functions as func
+import pytest
+
+from github import main as github_api
+from hemera.config import get_config, invalidate_config
+from hemera.exceptions import HemeraError
+from hemera.outbox import OUTBOX_RETENTION, SqliteOutbox, close_outbox, get_outbox
+from hemera.types import HemeraHttpRequest
+from hemera.webhook import _send_outbox_entry
+
+
+def test_sqlite_outbox(hemera_http_request: HemeraHttpRequest, tmp_path):
+    """Test SqliteOutbox sends failed sinks again with exponential backoff,
+    once per delivery."""
+    now = [1000.0]
+    handler = MagicMock(side_effect=[ValueError, None, None, None])
+    outbox = SqliteOutbox(
+        path=path_join(tmp_path, "outbox.sqlite3"),
+        clock=lambda: now[0],
+    )
+
+    outbox.add(hemera_http_request, [("slack", "#one"), ("homeautomation", "")])
+    outbox.add(hemera_http_request, [("slack", "#one")])
+    assert outbox.pending() == 2
+    assert outbox.drain(handler) == 0
+
+    now[0] += 1
+    assert outbox.drain(handler) == 1
+    assert [c.args[1:] for c in handler.call_args_list] == [
+        ("slack", "#one"),
+        ("homeautomation", ""),
+    ]
+    assert handler.call_args.args[0].username == "username"
+
+    now[0] += 1
+    assert outbox.drain(handler) == 0
+    now[0] += 1
+    assert outbox.drain(handler) == 1
+    assert outbox.pending() == 0
+
+    outbox.add(hemera_http_request, [("slack", "#one")])
+    now[0] += 10
+    assert outbox.drain(handler) == 0
+    assert handler.call_count == 3
+
+    outbox.add(hemera_http_request, [("slack", "#two")])
+    now[0] += 1
+    assert outbox.drain(handler) == 1
+    assert handler.call_args.args[1:] == ("slack", "#two")
+
+
+def test_sqlite_outbox_gives_up(hemera_http_request: HemeraHttpRequest, tmp_path):
+    """Test SqliteOutbox stops sending an entry after its last attempt."""
+    now = [1000.0]
+    handler = MagicMock(side_effect=ValueError)
+    outbox = SqliteOutbox(
+        path=path_join(tmp_path, "outbox.sqlite3"),
+        max_attempts=2,
+        clock=lambda: now[0],
+    )
+
+    outbox.add(hemera_http_request, [("slack", "")])
+    for _ in range(5):
+        now[0] += 100
+        outbox.drain(handler)
+
+    assert handler.call_count == 2
+    assert outbox.pending() == 1
+
+    now[0] += OUTBOX_RETENTION + 100
+    outbox.drain(handler)
+    assert outbox.pending() == 0
+
+
+def test_sqlite_outbox_claim(hemera_http_request: HemeraHttpRequest, tmp_path):
+    """Test two SqliteOutbox sharing a database send an entry once, until
+    the lease of its drainer expires."""
+    now = [1000.0]
+    path = path_join(tmp_path, "outbox.sqlite3")
+    first = SqliteOutbox(path=path, lease=60, clock=lambda: now[0])
+    second = SqliteOutbox(path=path, lease=60, clock=lambda: now[0])
+    first_handler = MagicMock()
+    second_handler = MagicMock()
+
+    first.add(hemera_http_request, [("slack", "#one")])
+    now[0] += 1
+    [(entry_id, *_)] = second._due(now[0])
+
+    assert first._claim(entry_id)
+    assert not second._claim(entry_id)
+    assert second.drain(second_handler) == 0
+    second_handler.assert_not_called()
+
+    now[0] += 60
+    assert second.drain(second_handler) == 1
+    assert first.drain(first_handler) == 0
+    first_handler.assert_not_called()
+
+
+def test_get_outbox(tmp_path):
+    """Test get_outbox is disabled by default, and closes the outbox of a
+    previous configuration."""
+    assert get_outbox(get_config(), MagicMock()) is None
+
+    handler = MagicMock()
+    config = replace(
+        get_config(),
+        outbox_backend="sqlite",
+        outbox_sqlite_path=path_join(tmp_path, "outbox.sqlite3"),
+    )
+    try:
+        outbox = get_outbox(config, handler)
+        assert outbox is not None
+        assert get_outbox(config, MagicMock()) is outbox
+
+        get_outbox(get_config(), handler)
+        assert outbox._thread is not None
+        outbox._thread.join(timeout=5)
+        assert not outbox._thread.is_alive()
+        with pytest.raises(ProgrammingError):
+            outbox.pending()
+    finally:
+        close_outbox(timeout=5)
+
+
+@patch("hemera.homeautomation.send_request_to_homeautomation_webhook")
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_github_api_outbox(
+    api_call: MagicMock,
+    send_request_to_homeautomation_webhook: MagicMock,
+    test_request: func.HttpRequest,
+    tmp_path,
+):
+    """Test github_api accepts a delivery with a failed sink and sends the
+    sink again from the outbox."""
+    os_environ["OUTBOX_BACKEND"] = "sqlite"
+    os_environ["OUTBOX_SQLITE_PATH"] = path_join(tmp_path, "outbox.sqlite3")
+    invalidate_config()
+    api_call.side_effect = [ValueError, None]
+
+    try:
+        test = github_api(req=test_request)
+
+        assert test.get_body().decode() == "Automation accepted."
+        assert test.status_code == 202
+        send_request_to_homeautomation_webhook.assert_called_once()
+
+        close_outbox(timeout=5)
+        outbox = SqliteOutbox(
+            path=os_environ["OUTBOX_SQLITE_PATH"], clock=lambda: time() + 1
+        )
+        try:
+            assert outbox.drain(_send_outbox_entry) == 1
+        finally:
+            outbox.close()
+
+        assert api_call.call_count == 2
+        send_request_to_homeautomation_webhook.assert_called_once()
+    finally:
+        close_outbox(timeout=5)
+        os_environ.pop("OUTBOX_BACKEND", None)
+        os_environ.pop("OUTBOX_SQLITE_PATH", None)
+
+
+@patch("hemera.homeautomation.send_request_to_homeautomation_webhook")
+@patch("slack_sdk.web.client.WebClient.api_call", side_effect=ValueError)
+def test_github_api_without_outbox(
+    api_call: MagicMock,
+    send_request_to_homeautomation_webhook: MagicMock,
+    test_request: func.HttpRequest,
+):
+    """Test github_api fails a delivery with a failed sink without an
+    outbox."""
+    test = github_api(req=test_request)
+
+    assert test.status_code == 400
+    send_request_to_homeautomation_webhook.assert_called_once()
+
+
+def test_handle_sink_unknown(hemera_http_request: HemeraHttpRequest):
+    """Test the outbox cannot send to an unknown sink."""
+    with pytest.raises(HemeraError, match="Sink teams is not registered."):
+        _send_outbox_entry(hemera_http_request, "teams")
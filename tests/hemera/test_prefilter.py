@@ -0,0 +1,104 @@
+import json
+from unittest.mock import patch
+
+import azure.functions as func
+import pytest
+
+from hemera.exceptions import HemeraError
+from hemera.prefilter import prefilter_request, scan_pull_request_author
+from tests.hemera.resources.http_request_data import BODY, HEADER
+
+
+def test_scan_pull_request_author():
+    """Test scan_pull_request_author."""
+    assert scan_pull_request_author(json.dumps(BODY).encode("utf-8")) == "username"
+    assert (
+        scan_pull_request_author(
+            b'{"pull_request": {"user": {"login": "user\\"name"}}}'
+        )
+        == 'user"name'
+    )
+
+
+def test_scan_pull_request_author_not_found():
+    """Test scan_pull_request_author when the author cannot be found with
+    certainty."""
+    assert scan_pull_request_author(b"{}") is None
+    assert (
+        scan_pull_request_author(
+            b'{"pull_request": {"title": "{", "user": {"login": "username"}}}'
+        )
+        is None
+    )
+    assert (
+        scan_pull_request_author(
+            b'{"pull_request": {"head": {"user": {"login": "username"}}}}'
+        )
+        is None
+    )
+
+
+def test_prefilter_request(test_request: func.HttpRequest):
+    """Test prefilter_request lets an allowed pull request through."""
+    prefilter_request(req=test_request, pr_author_filter="username")
+
+
+def test_prefilter_request_rejects_without_decoding(test_request: func.HttpRequest):
+    """Test prefilter_request rejects before the body is decoded."""
+    with patch.object(func.HttpRequest, "get_json") as get_json:
+        with pytest.raises(HemeraError, match="Unauthorized user."):
+            prefilter_request(req=test_request, pr_author_filter="fake_username")
+
+    get_json.assert_not_called()
+
+
+def test_prefilter_request_event_not_supported(incorrect_github_event_header: dict):
+    """Test prefilter_request when the event is not supported."""
+    with pytest.raises(HemeraError, match="GitHub event not supported."):
+        prefilter_request(
+            req=func.HttpRequest(
+                method="POST",
+                url="/",
+                headers=incorrect_github_event_header,
+                body=b"",
+            ),
+            pr_author_filter="username",
+        )
+
+
+def test_prefilter_request_event_missing():
+    """Test prefilter_request when the event header is missing."""
+    with pytest.raises(HemeraError, match="Value not found in HemeraHttpRequest."):
+        prefilter_request(
+            req=func.HttpRequest(method="POST", url="/", body=b""),
+            pr_author_filter="username",
+        )
+
+
+def test_prefilter_request_undecided(test_request: func.HttpRequest):
+    """Test prefilter_request lets requests it cannot decide on through."""
+    prefilter_request(
+        req=func.HttpRequest(
+            method="POST",
+            url="/",
+            headers=HEADER,
+            body=json.dumps({"pull_request": {}}).encode("utf-8"),
+        ),
+        pr_author_filter="username",
+    )
+
+
+def test_prefilter_request_supported_events():
+    """Test prefilter_request only scans the author of pull request events."""
+    header = HEADER.copy()
+    header["x-github-event"] = "push"
+    req = func.HttpRequest(method="POST", url="/", headers=header, body=b"{}")
+
+    with pytest.raises(HemeraError, match="GitHub event not supported."):
+        prefilter_request(req=req, pr_author_filter="username")
+
+    prefilter_request(
+        req=req,
+        pr_author_filter="fake_username",
+        supported_events=("pull_request", "push"),
+    )
@@ -0,0 +1,89 @@
+import json
+from io import StringIO
+from os.path import join as path_join
+from unittest.mock import MagicMock, patch
+
+from hemera.cli import main as hemera_cli
+from hemera.replay import replay, replay_delivery
+from tests.hemera.resources.http_request_data import BODY, HEADER
+
+DELIVERY = json.dumps({"header": HEADER, "body": BODY})
+OTHER_EVENT = json.dumps({"header": {"x-github-event": "star"}, "body": {}})
+
+
+def test_replay_delivery_dry_run():
+    """Test replay_delivery times every stage of an accepted delivery."""
+    outcome, timings = replay_delivery(
+        DELIVERY, pr_author_filter="username", dry_run=True
+    )
+
+    assert outcome == "accepted"
+    assert set(timings) == {"decode", "filter", "render", "sink"}
+
+
+def test_replay_delivery_header_case():
+    """Test replay_delivery reads header names in any case."""
+    delivery = json.dumps(
+        {
+            "header": {key.title(): value for key, value in HEADER.items()},
+            "body": BODY,
+        }
+    )
+
+    assert replay_delivery(delivery, pr_author_filter="username", dry_run=True)[0] == (
+        "accepted"
+    )
+
+
+def test_replay_delivery_filtered():
+    """Test replay_delivery stops after the filter."""
+    assert replay_delivery(DELIVERY, pr_author_filter="other", dry_run=True)[0] == (
+        "filtered"
+    )
+    assert replay_delivery(OTHER_EVENT, pr_author_filter=None, dry_run=True)[0] == (
+        "filtered"
+    )
+
+
+def test_replay_delivery_failed():
+    """Test replay_delivery reports deliveries that cannot be replayed."""
+    assert replay_delivery("{}", pr_author_filter=None, dry_run=True)[0] == "failed"
+
+
+@patch("hemera.replay.AutomationHandler")
+def test_replay_delivery_send(automation_handler: MagicMock):
+    """Test replay_delivery sends accepted deliveries when not a dry run."""
+    replay_delivery(DELIVERY, pr_author_filter=None, dry_run=False)
+
+    automation_handler.return_value.handle_request.assert_called_once()
+
+
+def test_replay():
+    """Test replay counts the outcome of every delivery."""
+    report = replay(
+        StringIO("\n".join([DELIVERY, OTHER_EVENT, "", DELIVERY])),
+        pr_author_filter="username",
+        chunksize=2,
+    )
+
+    assert report.events == 3
+    assert report.outcomes == {"accepted": 2, "filtered": 1}
+    assert report.events_per_second > 0
+    assert "Throughput" in report.format()
+
+
+def test_replay_process_pool():
+    """Test replay spreads deliveries over a process pool."""
+    report = replay(StringIO("\n".join([DELIVERY] * 10)), workers=2, chunksize=2)
+
+    assert report.outcomes == {"accepted": 10}
+
+
+def test_cli_replay(tmp_path, capsys):
+    """Test the hemera replay command."""
+    path = path_join(tmp_path, "deliveries.jsonl")
+    with open(path, "w") as file:
+        file.write(DELIVERY + "\n" + "{}\n")
+
+    assert hemera_cli(["replay", path, "--author", "username"]) == 1
+    assert "Events: 2 (1 accepted, 0 filtered, 1 failed)" in capsys.readouterr().out
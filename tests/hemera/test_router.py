@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from hemera.config import get_config
+from hemera.exceptions import HemeraError
+from hemera.router import EventRouter, create_event_router, get_event_router
+from hemera.slack import create_issues_slack_message, create_slack_message
+from hemera.types import HemeraHttpRequest, IssuesHttpRequest, PushHttpRequest
+from tests.hemera.resources.http_request_data import BODY, HEADER
+
+PUSH_BODY = {
+    "ref": "refs/heads/master",
+    "compare": "http://fakeurl.com/compare",
+    "head_commit": {"message": "Commit title\n\nCommit body", "id": "abc"},
+    "repository": {"full_name": "username/repository_name", "id": 1},
+    "sender": {"login": "username", "id": 2},
+    "pusher": {"name": "username"},
+}
+
+ISSUES_BODY = {
+    "action": "opened",
+    "issue": {
+        "html_url": "http://fakeurl.com/issues/3",
+        "number": 3,
+        "title": "Issue title",
+        "user": {"login": "username"},
+        "body": "Issue body",
+    },
+    "repository": {"full_name": "username/repository_name"},
+    "sender": {"login": "username"},
+}
+
+
+def _header(githubevent: str) -> dict:
+    header = HEADER.copy()
+    header["x-github-event"] = githubevent
+    return header
+
+
+def _encode(body: dict) -> bytes:
+    return json.dumps(body).encode("utf-8")
+
+
+def test_get_event_router():
+    """Test get_event_router builds the router once."""
+    assert get_event_router() is get_event_router()
+    assert set(get_event_router().events) == {
+        "pull_request",
+        "push",
+        "issues",
+        "release",
+        "workflow_run",
+    }
+
+
+def test_event_router_pull_request():
+    """Test the pull_request route matches the existing pipeline."""
+    router = create_event_router()
+    hemera_http_request = router.extract(
+        header=_header("pull_request"), body=_encode(BODY)
+    )
+    route = router.route(hemera_http_request)
+
+    assert isinstance(hemera_http_request, HemeraHttpRequest)
+    assert route.render is create_slack_message
+    route.accept(hemera_http_request, get_config())
+
+
+def test_event_router_push():
+    """Test the push route decodes only the push fields."""
+    router = create_event_router()
+    push_http_request = router.extract(header=_header("push"), body=_encode(PUSH_BODY))
+
+    assert isinstance(push_http_request, PushHttpRequest)
+    assert "id" not in push_http_request.req.body["head_commit"]
+    assert router.route(push_http_request).render(push_http_request) == (
+        "username pushed to refs/heads/master\n"
+        "<http://fakeurl.com/compare|Commit title>\n"
+        "Repository: username/repository_name\n"
+        "Created by Hemera v0.0.0"
+    )
+
+
+def test_event_router_issues():
+    """Test the issues route and its actions."""
+    router = create_event_router()
+    issues_http_request = router.extract(
+        header=_header("issues"), body=_encode(ISSUES_BODY)
+    )
+    route = router.route(issues_http_request)
+
+    assert isinstance(issues_http_request, IssuesHttpRequest)
+    assert route.render is create_issues_slack_message
+    assert route.render(issues_http_request) == (
+        "username opened an issue\n"
+        "<http://fakeurl.com/issues/3|3: Issue title>\n"
+        "Repository: username/repository_name\n"
+        "Created by Hemera v0.0.0"
+    )
+
+    labeled = router.extract(
+        header=_header("issues"), body=_encode(dict(ISSUES_BODY, action="labeled"))
+    )
+    with pytest.raises(HemeraError, match="GitHub event not supported."):
+        router.route(labeled)
+
+
+def test_event_router_filter_author():
+    """Test the default filter rejects other authors."""
+    router = create_event_router()
+    issues_http_request = router.extract(
+        header=_header("issues"),
+        body=_encode(
+            dict(ISSUES_BODY, issue=dict(ISSUES_BODY["issue"], user={"login": "other"}))
+        ),
+    )
+
+    with pytest.raises(HemeraError, match="Unauthorized user."):
+        router.route(issues_http_request).accept(issues_http_request, get_config())
+
+
+def test_event_router_not_supported():
+    """Test unregistered events are rejected before decoding."""
+    with pytest.raises(HemeraError, match="GitHub event not supported."):
+        create_event_router().extract(header=_header("star"), body=b"not json")
+
+
+def test_event_router_register():
+    """Test registering a custom event with a custom filter."""
+    accepted = []
+    router = EventRouter().register(
+        "push",
+        request_class=PushHttpRequest,
+        render=lambda push_http_request: push_http_request.ref,
+        accept=lambda push_http_request, config: accepted.append(push_http_request),
+    )
+    push_http_request = router.extract(header=_header("push"), body=_encode(PUSH_BODY))
+    route = router.route(push_http_request)
+    route.accept(push_http_request, get_config())
+
+    assert list(router.events) == ["push"]
+    assert accepted == [push_http_request]
+    assert route.render(push_http_request) == "refs/heads/master"
@@ -0,0 +1,144 @@
+import json
+from dataclasses import replace
+
+import pytest
+
+from hemera.config import get_config
+from hemera.dataclasses import HttpRequest
+from hemera.exceptions import HemeraError
+from hemera.routing import (
+    Destination,
+    RoutingIndex,
+    RoutingRule,
+    get_routing_index,
+    load_routing_rules,
+)
+from hemera.types import HemeraHttpRequest, PushHttpRequest
+
+DEFAULT = Destination(
+    slack_channels=("#default",), homeautomation_webhooks=("http://default",)
+)
+
+
+def _destination(channel: str, webhook: str = "http://fakeurl.com") -> Destination:
+    return Destination(slack_channels=(channel,), homeautomation_webhooks=(webhook,))
+
+
+def test_routing_index():
+    """Test RoutingIndex combines exact and glob rules in rule order."""
+    index = RoutingIndex(
+        rules=[
+            RoutingRule("org/*", None, _destination("#org")),
+            RoutingRule("org/api", "main", _destination("#api-main")),
+            RoutingRule("org/api", None, _destination("#api")),
+            RoutingRule("*", "release/*", _destination("#releases", "http://lamp")),
+        ],
+        default=DEFAULT,
+    )
+
+    assert index.resolve("org/api", "main") == Destination(
+        slack_channels=("#org", "#api-main", "#api"),
+        homeautomation_webhooks=("http://fakeurl.com",),
+    )
+    assert index.resolve("org/api", None).slack_channels == ("#org", "#api")
+    assert index.resolve("other/web", "release/1.0") == Destination(
+        slack_channels=("#releases",), homeautomation_webhooks=("http://lamp",)
+    )
+    assert index.resolve("other/web", "main") is DEFAULT
+    assert index.resolve("other/web", None) is DEFAULT
+
+
+def test_routing_index_default_per_sink():
+    """Test RoutingIndex falls back to the default targets of a sink the
+    matching rules name none for."""
+    index = RoutingIndex(
+        rules=[
+            RoutingRule("org/*", None, Destination(("#org",), ())),
+            RoutingRule("org/api", None, Destination((), ("http://lamp",))),
+        ],
+        default=DEFAULT,
+    )
+
+    assert index.resolve("org/web", None) == Destination(
+        slack_channels=("#org",), homeautomation_webhooks=("http://default",)
+    )
+    assert index.resolve("org/api", None) == Destination(
+        slack_channels=("#org",), homeautomation_webhooks=("http://lamp",)
+    )
+
+
+def test_routing_index_route(hemera_http_request: HemeraHttpRequest):
+    """Test RoutingIndex routes on the repository and target branch."""
+    index = RoutingIndex(
+        rules=[RoutingRule("username/*", "master", _destination("#team"))],
+        default=DEFAULT,
+    )
+
+    assert index.route(hemera_http_request).slack_channels == ("#team",)
+    assert index.route(HemeraHttpRequest()) is DEFAULT
+
+
+def test_push_http_request_branch():
+    """Test the branch of a push event."""
+    push_http_request = PushHttpRequest(
+        req=HttpRequest(header={}, body={"ref": "refs/heads/main"})
+    )
+    assert push_http_request.branch == "main"
+
+    push_http_request.req = HttpRequest(header={}, body={"ref": "refs/tags/v1.0"})
+    assert push_http_request.branch is None
+
+
+def test_load_routing_rules(tmp_path):
+    """Test loading routing rules from a JSON file."""
+    path = tmp_path / "rules.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"repository": "org/*", "slack_channels": "#org"},
+                {
+                    "repository": "org/api",
+                    "branch": "main",
+                    "slack_channels": ["#api"],
+                    "homeautomation_webhooks": ["http://lamp"],
+                },
+            ]
+        )
+    )
+
+    assert load_routing_rules(str(path)) == [
+        RoutingRule("org/*", None, Destination(("#org",), ())),
+        RoutingRule("org/api", "main", Destination(("#api",), ("http://lamp",))),
+    ]
+
+
+def test_load_routing_rules_invalid(tmp_path):
+    """Test loading invalid routing rules."""
+    path = tmp_path / "rules.json"
+
+    for content in (
+        "not json",
+        '[{"slack_channels": "#org"}]',
+        '[{"repository": "a", "slack_channels": [1]}]',
+    ):
+        path.write_text(content)
+        with pytest.raises(HemeraError, match="are invalid."):
+            load_routing_rules(str(path))
+
+
+def test_get_routing_index():
+    """Test every event goes to the configured channel without rules."""
+    assert get_routing_index(get_config()).default == Destination(
+        slack_channels=("fake_channel",),
+        homeautomation_webhooks=("http://fakeurl.com",),
+    )
+
+
+def test_get_routing_index_webhooks():
+    """Test a comma-separated HOMEAUTOMATION_WEBHOOK sends to every webhook."""
+    config = replace(get_config(), homeautomation_webhook="http://one,http://two")
+
+    assert get_routing_index(config).default.homeautomation_webhooks == (
+        "http://one",
+        "http://two",
+    )
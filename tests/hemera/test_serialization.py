@@ -0,0 +1,26 @@
+import json
+
+from hemera.serialization import (
+    JSON_BACKEND,
+    _stdlib_dumps,
+    _stdlib_loads,
+    dumps,
+    loads,
+)
+from tests.hemera.resources.http_request_data import BODY
+
+
+def test_serialization_backend():
+    """Test the selected backend round-trips a webhook body."""
+    assert JSON_BACKEND in ("orjson", "json")
+    assert isinstance(dumps(BODY), bytes)
+    assert loads(dumps(BODY)) == BODY
+    assert loads(json.dumps(BODY)) == BODY
+
+
+def test_serialization_stdlib():
+    """Test the standard library fallback encodes compact UTF-8 JSON."""
+    assert _stdlib_dumps({"message": "Hëmera"}) == '{"message":"Hëmera"}'.encode(
+        "utf-8"
+    )
+    assert _stdlib_loads(json.dumps(BODY).encode("utf-8")) == BODY
@@ -0,0 +1,75 @@
+import hmac
+from hashlib import sha256
+from os import environ as os_environ
+from unittest.mock import patch
+
+import azure.functions as func
+import pytest
+
+from github import main as github_api
+from hemera.config import invalidate_config
+from hemera.exceptions import HemeraError
+from hemera.signature import verify_request_signature, verify_signature
+
+SECRET = b"It's a Secret to Everybody"
+BODY = b"Hello, World!"
+SIGNATURE = "sha256=757107ea0eb2509fc211221cce984b8a37570b6d7586c22c46f4379c8b043e17"
+
+
+def test_verify_signature():
+    """Test verify_signature with the example from the GitHub documentation."""
+    verify_signature(body=BODY, signature=SIGNATURE, secret=SECRET)
+
+
+@pytest.mark.parametrize(
+    "signature",
+    [None, "", "sha256=", SIGNATURE.replace("sha256", "sha1"), SIGNATURE[:-1] + "0"],
+)
+def test_verify_signature_invalid(signature):
+    """Test verify_signature with missing or invalid signatures."""
+    with pytest.raises(HemeraError, match="Invalid webhook signature."):
+        verify_signature(body=BODY, signature=signature, secret=SECRET)
+
+
+def test_verify_request_signature_without_secret(test_request: func.HttpRequest):
+    """Test verify_request_signature is skipped when no secret is configured."""
+    verify_request_signature(req=test_request, secret=b"")
+
+
+def test_github_api_invalid_signature(test_request: func.HttpRequest):
+    """Test github_api rejects deliveries before decoding them when the
+    signature is invalid."""
+    os_environ["GITHUB_WEBHOOK_SECRET"] = SECRET.decode()
+    invalidate_config()
+
+    with patch.object(func.HttpRequest, "get_json") as get_json:
+        test = github_api(req=test_request)
+
+    get_json.assert_not_called()
+    assert test.get_body().decode() == "Error: Invalid webhook signature."
+    assert test.status_code == 400
+
+    os_environ.pop("GITHUB_WEBHOOK_SECRET", None)
+
+
+def test_github_api_valid_signature(test_request: func.HttpRequest):
+    """Test github_api accepts deliveries with a valid signature."""
+    os_environ["GITHUB_WEBHOOK_SECRET"] = SECRET.decode()
+    os_environ["PR_AUTHOR_FILTER"] = "fake_username"
+    invalidate_config()
+
+    signed_request = func.HttpRequest(
+        method="POST",
+        url="/",
+        headers={
+            **test_request.headers,
+            "x-hub-signature-256": "sha256="
+            + hmac.new(SECRET, test_request.get_body(), sha256).hexdigest(),
+        },
+        body=test_request.get_body(),
+    )
+
+    test = github_api(req=signed_request)
+    assert test.get_body().decode() == "Error: Unauthorized user."
+
+    os_environ.pop("GITHUB_WEBHOOK_SECRET", None)
@@ -0,0 +1,161 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Event, Timer
+from unittest.mock import AsyncMock, MagicMock
+
+from hemera.deadline import Deadline
+from hemera.sinks import (
+    SINK_REGISTRY,
+    SinkRegistry,
+    get_sink_executor,
+    get_sink_registry,
+    register_builtin_sinks,
+)
+
+
+def test_sink_registry_dispatch():
+    """Test SinkRegistry runs every sink concurrently and reports each
+    outcome."""
+    barrier = Barrier(3, timeout=5)
+
+    def send(delivery):
+        # Only returns when all three sinks run at the same time.
+        barrier.wait()
+
+    def fail(delivery):
+        barrier.wait()
+        raise ValueError(delivery)
+
+    registry = (
+        SinkRegistry()
+        .register("one", send)
+        .register("two", fail)
+        .register("three", send)
+    )
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        report = registry.dispatch("delivery", executor=executor)
+
+    assert registry.sinks == ("one", "two", "three")
+    assert [outcome.sink for outcome in report.outcomes] == ["one", "two", "three"]
+    assert not report.ok
+    assert report.failed == ("two",)
+    assert str(report.outcomes[1].error) == "delivery"
+
+
+def test_sink_registry_bulkhead():
+    """Test a saturated sink fails after its bounded wait without delaying
+    the others."""
+    started = Event()
+    release = Event()
+
+    def block(delivery):
+        started.set()
+        release.wait(timeout=5)
+
+    other = MagicMock()
+    registry = SinkRegistry(bulkhead_timeout=0.05).register(
+        "slow", block, max_concurrency=1
+    )
+    registry.register("other", other)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(registry.dispatch, "first", executor)
+        started.wait(timeout=5)
+
+        report = registry.dispatch("second", executor=executor)
+
+        assert report.failed == ("slow",)
+        assert str(report.outcomes[0].error) == "Sink slow is saturated."
+        other.assert_any_call("second")
+
+        release.set()
+        assert first.result().ok
+
+    assert registry.dispatch("third").ok
+
+
+def test_sink_registry_bulkhead_wait():
+    """Test a delivery waits for a full bulkhead, but not past the
+    deadline."""
+    registry = SinkRegistry().register("sink", MagicMock(), max_concurrency=1)
+    bulkhead = registry._sinks["sink"].bulkhead
+    bulkhead.acquire()
+    Timer(0.05, bulkhead.release).start()
+
+    assert registry.dispatch("first").ok
+
+    bulkhead.acquire()
+    report = registry.dispatch("second", deadline=Deadline(budget=0.05))
+
+    assert report.failed == ("sink",)
+    bulkhead.release()
+
+
+def test_sink_registry_register_again():
+    """Test a sink registered again keeps its bulkhead unless its
+    concurrency changed."""
+    registry = SinkRegistry().register("sink", MagicMock(), max_concurrency=2)
+    bulkhead = registry._sinks["sink"].bulkhead
+
+    registry.register("sink", MagicMock(), max_concurrency=2)
+    assert registry._sinks["sink"].bulkhead is bulkhead
+
+    registry.register("sink", MagicMock(), max_concurrency=3)
+    assert registry._sinks["sink"].bulkhead is not bulkhead
+
+
+def test_sink_registry_dispatch_async():
+    """Test SinkRegistry awaits the coroutine function of a sink and runs
+    other sinks on the executor."""
+    send_async = AsyncMock()
+    send = MagicMock(side_effect=ValueError("delivery"))
+    registry = (
+        SinkRegistry()
+        .register("async", MagicMock(), send_async=send_async)
+        .register("sync", send)
+    )
+
+    report = asyncio.run(registry.dispatch_async("delivery"))
+
+    assert [outcome.sink for outcome in report.outcomes] == ["async", "sync"]
+    assert report.failed == ("sync",)
+    send_async.assert_awaited_once_with("delivery")
+    send.assert_called_once_with("delivery")
+
+
+def test_register_builtin_sinks():
+    """Test the built-in sinks call the AutomationHandler."""
+    registry = register_builtin_sinks(registry=SinkRegistry())
+    handler = MagicMock()
+    handler._send_slack_message_async = AsyncMock()
+    handler._send_request_to_homeautomation_webhook_async = AsyncMock()
+
+    report = registry.dispatch(handler)
+    async_report = asyncio.run(registry.dispatch_async(handler))
+
+    assert registry.sinks == ("slack", "homeautomation")
+    assert report.ok
+    assert async_report.ok
+    handler._send_slack_message.assert_called_once_with()
+    handler._send_request_to_homeautomation_webhook.assert_called_once_with()
+    handler._send_slack_message_async.assert_awaited_once_with()
+    handler._send_request_to_homeautomation_webhook_async.assert_awaited_once_with()
+
+
+def test_shared_sink_registry_and_executor():
+    """Test the built-in sinks are registered on the one process-wide
+    registry, and the sinks share one executor."""
+    assert register_builtin_sinks(max_concurrency=2) is SINK_REGISTRY
+    assert SINK_REGISTRY._sinks["slack"].max_concurrency == 2
+    register_builtin_sinks()
+
+    slack = get_sink_registry(max_concurrency=3)._sinks["slack"]
+    assert slack.max_concurrency == 3
+    assert get_sink_registry(max_concurrency=3)._sinks["slack"] is slack
+    assert get_sink_registry() is SINK_REGISTRY
+    assert SINK_REGISTRY._sinks["slack"].max_concurrency == 4
+
+    executor = get_sink_executor(max_workers=3)
+    assert get_sink_executor() is executor
+    assert get_sink_executor(max_workers=3) is executor
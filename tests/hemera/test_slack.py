@@ -1,9 +1,27 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError as SlackSdkApiError
+from slack_sdk.web.slack_response import SlackResponse
 
+from hemera.dataclasses import SlackRateLimiterStats
+from hemera.deadline import Deadline
 from hemera.exceptions import HemeraError
-from hemera.slack import create_slack_message, send_slack_message
+from hemera.slack import (
+    SLACK_CLIENTS,
+    SLACK_RATE_LIMITED_RETRIES,
+    SLACK_TIMEOUT,
+    SlackClientPool,
+    SlackRateLimiter,
+    _is_slack_outage,
+    close_slack_session,
+    create_slack_message,
+    get_slack_session,
+    send_slack_message,
+    send_slack_message_async,
+)
 from hemera.types import HemeraHttpRequest
 
 
@@ -56,3 +74,202 @@ def test_create_slack_message_error():
         create_slack_message,
         hemera_http_request=HemeraHttpRequest(),
     )
+
+
+@patch("slack_sdk.web.async_client.AsyncWebClient.api_call")
+def test_send_slack_message_async(
+    api_call: AsyncMock,
+    channel: str = "#channel_name",
+    message: str = "some message",
+):
+    """Test send_slack_message_async."""
+    asyncio.run(
+        send_slack_message_async(
+            slack_api_token="",
+            channel=channel,
+            message=message,
+        )
+    )
+
+    api_call.assert_awaited_once_with(
+        "chat.postMessage", json={"channel": channel, "text": message}
+    )
+
+
+def test_send_slack_message_async_reuses_session():
+    """Test send_slack_message_async sends every message over the session of
+    the running event loop."""
+    sessions = []
+
+    async def api_call(client, *args, **kwargs):
+        sessions.append(client.session)
+
+    async def send_twice():
+        for _ in range(2):
+            await send_slack_message_async(
+                slack_api_token="", channel="#channel_name", message="message"
+            )
+        assert sessions == [get_slack_session()] * 2
+        await close_slack_session()
+        assert sessions[0].closed
+
+    with patch(
+        "slack_sdk.web.async_client.AsyncWebClient.api_call", autospec=True
+    ) as patched:
+        patched.side_effect = api_call
+        asyncio.run(send_twice())
+
+
+def test_send_slack_message_async_error():
+    """Test send_slack_message_async error."""
+    with pytest.raises(HemeraError, match="Error sending message to Slack."):
+        asyncio.run(
+            send_slack_message_async(slack_api_token={}, channel="", message="")
+        )
+
+
+def test_slack_client_pool():
+    """Test SlackClientPool reuses clients per token and evicts idle ones."""
+    now = [0.0]
+    pool = SlackClientPool(
+        client_factory=lambda token: object(), idle_timeout=10, clock=lambda: now[0]
+    )
+
+    first = pool.get("token")
+    assert pool.get("token") is first
+    assert pool.get("other_token") is not first
+
+    now[0] = 9.0
+    assert pool.get("token") is first
+
+    now[0] = 18.0
+    assert pool.get("token") is first
+    assert len(pool._clients) == 1
+
+    now[0] = 30.0
+    assert pool.get("token") is not first
+
+    pool.clear()
+    assert not pool._clients
+
+
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_send_slack_message_reuses_client(api_call: MagicMock):
+    """Test send_slack_message reuses the client of a token."""
+    SLACK_CLIENTS.clear()
+
+    send_slack_message(slack_api_token="token", channel="#channel", message="1")
+    client = SLACK_CLIENTS.get("token")
+    send_slack_message(slack_api_token="token", channel="#other", message="2")
+
+    assert SLACK_CLIENTS.get("token") is client
+    assert api_call.call_count == 2
+
+
+def test_slack_rate_limiter():
+    """Test SlackRateLimiter paces every channel on its own."""
+    now = [0.0]
+    waits = []
+
+    def sleep(seconds: float):
+        waits.append(seconds)
+
+    limiter = SlackRateLimiter(rate=1.0, burst=2, clock=lambda: now[0], sleep=sleep)
+
+    for _ in range(4):
+        limiter.acquire("#channel")
+    limiter.acquire("#other")
+
+    assert waits == [1.0, 2.0]
+    assert limiter.stats() == SlackRateLimiterStats(
+        queue_depth=0, throttled_seconds=3.0, rate_limited=0
+    )
+
+    now[0] = 10.0
+    limiter.block("#channel", retry_after=5)
+    limiter.acquire("#channel")
+    limiter.acquire("#channel")
+    limiter.acquire("#other")
+
+    assert waits == [1.0, 2.0, 5.0, 6.0]
+    assert limiter.stats().rate_limited == 1
+
+
+def test_slack_rate_limiter_timeout():
+    """Test SlackRateLimiter gives the slot back when it is not reached in
+    time."""
+    waits = []
+    limiter = SlackRateLimiter(rate=1.0, burst=1, clock=lambda: 0.0, sleep=waits.append)
+
+    limiter.acquire("#channel", timeout=0.5)
+    with pytest.raises(HemeraError, match="Deadline exceeded."):
+        limiter.acquire("#channel", timeout=0.5)
+    limiter.acquire("#channel", timeout=1.5)
+
+    assert waits == [1.0]
+    assert limiter.stats() == SlackRateLimiterStats(
+        queue_depth=0, throttled_seconds=1.0, rate_limited=0
+    )
+
+
+def _rate_limited_error() -> SlackSdkApiError:
+    return SlackSdkApiError(
+        "ratelimited",
+        SlackResponse(
+            client=None,
+            http_verb="POST",
+            api_url="https://slack.com/api/chat.postMessage",
+            req_args={},
+            data={"ok": False, "error": "ratelimited"},
+            headers={"retry-after": "3"},
+            status_code=429,
+        ),
+    )
+
+
+@patch("hemera.slack.SLACK_RATE_LIMITER")
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_send_slack_message_rate_limited(api_call: MagicMock, limiter: MagicMock):
+    """Test send_slack_message waits for Retry-After instead of failing."""
+    api_call.side_effect = [_rate_limited_error(), MagicMock()]
+
+    send_slack_message(slack_api_token="token", channel="#channel", message="1")
+
+    assert api_call.call_count == 2
+    limiter.block.assert_called_once_with("#channel", 3.0)
+    assert limiter.acquire.call_count == 2
+
+
+@patch("hemera.slack.SLACK_RATE_LIMITER")
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_send_slack_message_rate_limited_error(api_call: MagicMock, limiter: MagicMock):
+    """Test send_slack_message gives up after the rate limited retries."""
+    api_call.side_effect = _rate_limited_error()
+
+    with pytest.raises(HemeraError, match="Error sending message to Slack."):
+        send_slack_message(slack_api_token="token", channel="#channel", message="1")
+
+    assert api_call.call_count == SLACK_RATE_LIMITED_RETRIES + 1
+
+
+@patch.object(WebClient, "chat_postMessage", autospec=True)
+def test_send_slack_message_deadline(chat_postMessage: MagicMock):
+    """Test send_slack_message times out at the deadline without changing
+    the pooled client."""
+    send_slack_message(
+        slack_api_token="fake_token",
+        channel="fake_channel",
+        message="Test message.",
+        deadline=Deadline(2),
+    )
+
+    client = chat_postMessage.call_args.args[0]
+    assert 0 < client.timeout <= 2
+    assert SLACK_CLIENTS.get("fake_token").timeout == SLACK_TIMEOUT
+
+
+def test_is_slack_outage():
+    """Test only server errors and failed calls open the Slack circuit
+    breaker."""
+    assert not _is_slack_outage(_rate_limited_error())
+    assert _is_slack_outage(TimeoutError())
@@ -0,0 +1,136 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from hemera.config import get_config
+from hemera.exceptions import HemeraError
+from hemera.slack import create_slack_message
+from hemera.templates import (
+    MessageTemplate,
+    get_message_templates,
+    load_message_templates,
+)
+from hemera.types import HemeraHttpRequest
+
+PULL_REQUEST_TEMPLATE = (
+    "{username} {action} a {githubevent}\n"
+    "<{pullrequesturl}|{pullrequestnumber}: {pullrequesttitle}>\n"
+    "Target branch: {pullrequesttargetbranch}; "
+    "Source branch: {pullrequestsourcebranch}\n"
+    "Repository: {repository}\n"
+    "Created by Hemera v{metadata.core}"
+)
+
+BLOCKS_TEMPLATE: List[Dict[str, Any]] = [
+    {
+        "type": "section",
+        "text": {"type": "mrkdwn", "text": "*{pullrequesttitle}* by {username!s}"},
+    },
+    {
+        "type": "context",
+        "elements": [{"type": "mrkdwn", "text": "#{pullrequestnumber:>4}"}],
+    },
+]
+
+
+def test_message_template(hemera_http_request: HemeraHttpRequest):
+    """Test a compiled text template renders like create_slack_message."""
+    template = MessageTemplate(
+        githubevent="pull_request",
+        text=PULL_REQUEST_TEMPLATE,
+        request_class=HemeraHttpRequest,
+    )
+
+    assert template(hemera_http_request) == create_slack_message(
+        hemera_http_request=hemera_http_request
+    )
+    assert template.render_blocks(hemera_http_request) is None
+
+
+def test_message_template_blocks(hemera_http_request: HemeraHttpRequest):
+    """Test a Block Kit template is rendered once per request."""
+    template = MessageTemplate(
+        githubevent="pull_request",
+        text="{pullrequesttitle}",
+        blocks=BLOCKS_TEMPLATE,
+        request_class=HemeraHttpRequest,
+    )
+
+    blocks = template.render_blocks(hemera_http_request)
+
+    assert blocks == [
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": "*PR title* by username"},
+        },
+        {"type": "context", "elements": [{"type": "mrkdwn", "text": "#  17"}]},
+    ]
+    assert template.render_blocks(hemera_http_request) is blocks
+    assert hemera_http_request.renders[template][1] is blocks
+    assert template(hemera_http_request) == "PR title"
+
+
+def test_message_template_invalid():
+    """Test templates are validated when they are compiled."""
+    for text in (
+        "{unknown}",
+        "{username",
+        "{username[0]}",
+        "{username!x}",
+        "{__class__}",
+        "{_get_property_value}",
+        "{renders}",
+        "{metadata.__class__}",
+    ):
+        with pytest.raises(HemeraError, match="Message template push is invalid."):
+            MessageTemplate(githubevent="push", text=text)
+
+
+def test_message_template_value_not_found():
+    """Test rendering a request without the field."""
+    template = MessageTemplate(
+        githubevent="pull_request",
+        text="{pullrequesttitle}",
+        request_class=HemeraHttpRequest,
+    )
+
+    with pytest.raises(HemeraError, match="Value not found in HemeraHttpRequest."):
+        template(HemeraHttpRequest())
+
+
+def test_load_message_templates(tmp_path, hemera_http_request: HemeraHttpRequest):
+    """Test loading templates from a JSON file."""
+    path = tmp_path / "templates.json"
+    path.write_text(
+        json.dumps(
+            {
+                "pull_request": {"text": "{pullrequesttitle}", "blocks": []},
+                "push": "{username} pushed to {ref}",
+            }
+        )
+    )
+
+    templates = load_message_templates(str(path))
+
+    assert set(templates) == {"pull_request", "push"}
+    assert templates["pull_request"](hemera_http_request) == "PR title"
+    assert templates["pull_request"].render_blocks(hemera_http_request) == []
+
+
+def test_load_message_templates_invalid(tmp_path):
+    """Test loading templates of unsupported events or invalid files."""
+    path = tmp_path / "templates.json"
+
+    path.write_text(json.dumps({"star": "{username}"}))
+    with pytest.raises(HemeraError, match="Message template star is invalid."):
+        load_message_templates(str(path))
+
+    path.write_text("not json")
+    with pytest.raises(HemeraError, match="is invalid."):
+        load_message_templates(str(path))
+
+
+def test_get_message_templates():
+    """Test no templates are used when none are configured."""
+    assert get_message_templates(get_config()) == {}
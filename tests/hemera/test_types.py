@@ -1,7 +1,8 @@
 import pytest
 
+from hemera.dataclasses import HttpRequest
 from hemera.exceptions import HemeraError
-from hemera.types import HemeraHttpRequest, HemeraMetadata
+from hemera.types import HemeraHttpRequest, HemeraMetadata, _get_field
 
 
 def test_hemera_http_request_exceptions():
@@ -12,9 +13,70 @@ def test_hemera_http_request_exceptions():
         _ = http_request._get_property_value(source="header", keys=["invalid_key"])
 
 
+def test_hemera_http_request_property_value_field_is_cached():
+    """Test _get_property_value compiles a key path only once."""
+    http_request = HemeraHttpRequest(
+        req=HttpRequest(header={"x-github-event": "pull_request"}, body={})
+    )
+
+    assert (
+        http_request._get_property_value(source="header", keys=["x-github-event"])
+        == "pull_request"
+    )
+    assert _get_field("header", ("x-github-event",)) is _get_field(
+        "header", ("x-github-event",)
+    )
+
+
 def test_hemera_meta_data_exceptions():
     """Test HemeraMetadata exceptions."""
     hemera_meta_data = HemeraMetadata()
 
     with pytest.raises(HemeraError, match="Value not found in HemeraMetadata."):
         _ = hemera_meta_data.core
+
+
+def test_hemera_http_request_fields_are_memoized():
+    """Test HemeraHttpRequest reads a field from the request only once."""
+    http_request = HemeraHttpRequest(
+        req=HttpRequest(header={}, body={"pull_request": {"user": {"login": "a"}}})
+    )
+    assert http_request.username == "a"
+
+    http_request.req.body["pull_request"] = {}
+    assert http_request.username == "a"
+
+    http_request.req = HttpRequest(header={}, body={})
+    with pytest.raises(HemeraError, match="Value not found in HemeraHttpRequest."):
+        _ = http_request.username
+
+
+def test_hemera_http_request_field_alternatives():
+    """Test HemeraHttpRequest falls back to the next path of a field."""
+    http_request = HemeraHttpRequest(
+        req=HttpRequest(
+            header={},
+            body={
+                "number": 17,
+                "pull_request": {"base": {"repo": {"full_name": "user/repo"}}},
+                "repository": None,
+            },
+        )
+    )
+
+    assert http_request.pullrequestnumber == 17
+    assert http_request.repository == "user/repo"
+
+
+def test_hemera_http_request_slots():
+    """Test HemeraHttpRequest has no instance dictionary."""
+    http_request = HemeraHttpRequest()
+
+    with pytest.raises(AttributeError):
+        http_request.unknown = "value"  # type: ignore
+
+    assert set(HemeraHttpRequest.FIELDS) >= {"username", "githubevent"}
+    assert HemeraHttpRequest.FIELDS["pullrequestnumber"].paths == (
+        ("pull_request", "number"),
+        ("number",),
+    )
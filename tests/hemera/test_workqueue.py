@@ -0,0 +1,176 @@
+from os import environ as os_environ
+from os.path import join as path_join
+from sqlite3 import ProgrammingError
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+import azure.functions as func
+import pytest
+
+from github import main as github_api
+from hemera.config import get_config, invalidate_config
+from hemera.exceptions import HemeraError
+from hemera.types import HemeraHttpRequest
+from hemera.webhook import _handle_queued_request
+from hemera.workqueue import (
+    InMemoryWorkQueue,
+    SqliteWorkQueue,
+    close_work_queue,
+    dump_work_item,
+    get_work_queue,
+    load_work_item,
+)
+
+
+def test_dump_and_load_work_item(hemera_http_request: HemeraHttpRequest):
+    """Test a work item survives serialization."""
+    loaded = load_work_item(dump_work_item(hemera_http_request))
+
+    assert loaded.req.header == hemera_http_request.req.header
+    assert loaded.req.body == hemera_http_request.req.body
+
+
+def test_in_memory_work_queue(hemera_http_request: HemeraHttpRequest):
+    """Test InMemoryWorkQueue hands requests to the handler."""
+    handler = MagicMock()
+    work_queue = InMemoryWorkQueue(handler=handler, workers=2, size=10)
+    work_queue.start()
+
+    work_queue.put(hemera_http_request)
+    work_queue.put(hemera_http_request)
+    work_queue.join()
+    work_queue.close(timeout=1)
+
+    assert handler.call_count == 2
+
+
+def test_in_memory_work_queue_full(hemera_http_request: HemeraHttpRequest):
+    """Test InMemoryWorkQueue rejects requests when it is full."""
+    work_queue = InMemoryWorkQueue(handler=MagicMock(), workers=1, size=1)
+
+    work_queue.put(hemera_http_request)
+    with pytest.raises(HemeraError, match="Work queue is full."):
+        work_queue.put(hemera_http_request)
+
+
+def test_sqlite_work_queue_is_durable(hemera_http_request: HemeraHttpRequest, tmp_path):
+    """Test SqliteWorkQueue hands requests queued before a restart to the
+    handler."""
+    path = path_join(tmp_path, "work-queue.sqlite3")
+    SqliteWorkQueue(handler=MagicMock(), workers=1, size=1, path=path).put(
+        hemera_http_request
+    )
+
+    handled = Event()
+    handler = MagicMock(side_effect=lambda _: handled.set())
+    work_queue = SqliteWorkQueue(handler=handler, workers=1, size=1, path=path)
+
+    with pytest.raises(HemeraError, match="Work queue is full."):
+        work_queue.put(hemera_http_request)
+
+    work_queue.start()
+    assert handled.wait(timeout=5)
+    work_queue.close(timeout=5)
+
+    assert handler.call_args.args[0].username == "username"
+    with pytest.raises(ProgrammingError):
+        work_queue.put(hemera_http_request)
+    SqliteWorkQueue(handler=MagicMock(), workers=1, size=1, path=path).put(
+        hemera_http_request
+    )
+
+
+def test_sqlite_work_queue_lease(hemera_http_request: HemeraHttpRequest, tmp_path):
+    """Test a request claimed by one SqliteWorkQueue is only claimed by
+    another once its lease expired."""
+    path = path_join(tmp_path, "work-queue.sqlite3")
+    clock = MagicMock(return_value=0.0)
+    first = SqliteWorkQueue(
+        handler=MagicMock(), workers=1, size=1, path=path, lease=10, clock=clock
+    )
+    second = SqliteWorkQueue(
+        handler=MagicMock(), workers=1, size=1, path=path, lease=10, clock=clock
+    )
+    first.put(hemera_http_request)
+
+    assert first._claim() is not None
+    assert second._claim() is None
+
+    clock.return_value = 10.0
+    assert second._claim() is not None
+    first._done()
+    second._done()
+    assert second._claim() is None
+
+
+def test_sqlite_work_queue_unreadable_work_item(
+    hemera_http_request: HemeraHttpRequest, tmp_path
+):
+    """Test an unreadable work item is dropped without stopping the worker."""
+    path = path_join(tmp_path, "work-queue.sqlite3")
+    handled = Event()
+    handler = MagicMock(side_effect=lambda _: handled.set())
+    work_queue = SqliteWorkQueue(
+        handler=handler, workers=1, size=2, path=path, poll_interval=0.01
+    )
+    work_queue._connection.execute(
+        "INSERT INTO work_items (work_item) VALUES ('not json')"
+    )
+    work_queue.put(hemera_http_request)
+
+    work_queue.start()
+    assert handled.wait(timeout=5)
+    work_queue.close(timeout=5)
+
+    handler.assert_called_once()
+
+
+def test_get_work_queue():
+    """Test get_work_queue is disabled by default and closes the work queue
+    of a previous configuration."""
+    assert get_work_queue(get_config(), MagicMock()) is None
+
+    os_environ["WORK_QUEUE_BACKEND"] = "memory"
+    invalidate_config()
+    handler = MagicMock()
+    try:
+        work_queue = get_work_queue(get_config(), handler)
+        assert work_queue is not None
+        assert get_work_queue(get_config(), MagicMock()) is work_queue
+
+        os_environ["WORK_QUEUE_WORKERS"] = "1"
+        invalidate_config()
+        assert get_work_queue(get_config(), handler) is not work_queue
+        assert work_queue._stopped.is_set()
+    finally:
+        close_work_queue(timeout=1)
+        os_environ.pop("WORK_QUEUE_BACKEND", None)
+        os_environ.pop("WORK_QUEUE_WORKERS", None)
+
+
+@patch("hemera.homeautomation.send_request_to_homeautomation_webhook")
+@patch("slack_sdk.web.client.WebClient.api_call")
+def test_github_api_acknowledge_fast(
+    api_call: MagicMock,
+    send_request_to_homeautomation_webhook: MagicMock,
+    test_request: func.HttpRequest,
+):
+    """Test github_api queues the request and returns before handling it."""
+    os_environ["WORK_QUEUE_BACKEND"] = "memory"
+    invalidate_config()
+
+    try:
+        test = github_api(req=test_request)
+
+        assert test.get_body().decode() == "Automation accepted."
+        assert test.status_code == 202
+
+        work_queue = get_work_queue(get_config(), _handle_queued_request)
+        assert isinstance(work_queue, InMemoryWorkQueue)
+        work_queue.join()
+    finally:
+        close_work_queue(timeout=1)
+        os_environ.pop("WORK_QUEUE_BACKEND", None)
+
+    api_call.assert_called_once()
+    send_request_to_homeautomation_webhook.assert_called_once()